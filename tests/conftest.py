@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app imports its packages relative to web_app, e.g. `from models import *`
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'web_app'))
@@ -0,0 +1,94 @@
+"""
+A stand-in for the Kadi4Mat REST API, serving the records and data files of the repository from memory.
+
+The records and files can be changed between requests, and all requested paths are recorded, so tests can check
+what a client asked for.
+"""
+import copy
+import glob
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+class KadiServer:
+    """
+    Serves collection listings, record exports and file downloads on a free local port.
+
+    Attributes:
+        records (dict): The records by id, with the checksum and size of their files computed from the content.
+        files (dict): The content of the files by file id.
+        requests (list): The paths of all requests received.
+        page_size (int): The number of records per page of the collection listing, small to exercise paging.
+    """
+
+    def __init__(self, page_size: int = 4):
+        self.records, self.files, self.requests = {}, {}, []
+        self.page_size = page_size
+        for path in sorted(glob.glob(os.path.join(DATA_DIR, 'kadi4mat_json', '*', '*.json'))):
+            with open(path, encoding='utf-8') as file:
+                record = json.load(file)
+            if 'identifier' not in record:
+                continue
+            for entry in record.get('files', []):
+                with open(os.path.join(DATA_DIR, 'tables', entry['name']), 'rb') as file:
+                    self.set_file(entry, file.read())
+            self.records[record['id']] = copy.deepcopy(record)
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def set_file(self, entry: dict, content: bytes) -> None:
+        """Sets the content of a file and its checksum and size in the record."""
+        self.files[entry['id']] = content
+        entry['checksum'] = hashlib.md5(content).hexdigest()
+        entry['size'] = len(content)
+
+    def record(self, identifier: str) -> dict:
+        """Returns the record with an identifier."""
+        return next(record for record in self.records.values() if record['identifier'] == identifier)
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send(self, body: bytes, content_type: str = 'application/json', status: int = 200):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                parts = url.path.strip('/').split('/')
+                server.requests.append(url.path)
+                if parts[:2] == ['api', 'collections']:
+                    page = int(parse_qs(url.query)['page'][0])
+                    items = [{'id': record['id'], 'identifier': record['identifier'],
+                              'last_modified': record['last_modified']} for record in server.records.values()]
+                    size = server.page_size
+                    body = {'items': items[(page - 1) * size:page * size],
+                            '_pagination': {'total_pages': (len(items) + size - 1) // size}}
+                    return self.send(json.dumps(body).encode())
+                if parts[:2] == ['api', 'records'] and parts[3:] == ['export', 'json']:
+                    return self.send(json.dumps(server.records[int(parts[2])]).encode())
+                if parts[:2] == ['api', 'records'] and parts[3:4] == ['files'] and parts[5:] == ['download']:
+                    return self.send(server.files[parts[4]], 'application/octet-stream')
+                self.send(b'{}', status=404)
+
+        return Handler
@@ -0,0 +1,90 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from models import CorrosionModel, MODEL_DIRECTORIES, corrosion_models, load_corrosion_models_from_directory
+
+TIME = np.linspace(0.0, 50.0, 26)
+
+
+@pytest.fixture(scope='module')
+def loaded_models() -> Dict[str, CorrosionModel]:
+    return {model.kadi_identifier: model
+            for model in load_corrosion_models_from_directory(MODEL_DIRECTORIES, corrosion_models)}
+
+
+def parameter_sets(model: CorrosionModel) -> List[Dict[str, Any]]:
+    """Returns the defaults and, per parameter, variations of it: every choice, or values across its limits."""
+    schema = model.parameter_schema()
+    defaults = schema.defaults()
+    sets = [defaults]
+    for parameter in schema:
+        if parameter.is_choice:
+            values = parameter.choices
+        elif parameter.lower is not None and parameter.upper is not None:
+            values = np.linspace(parameter.lower, parameter.upper, 3).tolist()
+        else:
+            values = [parameter.default * 0.5, parameter.default * 1.5 + 1.0]
+        for value in values:
+            values_set = schema.resolve({**{k: v for k, v in defaults.items() if k != parameter.symbol},
+                                         parameter.symbol: value})
+            sets.append(values_set)
+    return sets
+
+
+def test_all_models_are_loaded(loaded_models):
+    assert len(loaded_models) == 10
+
+
+@pytest.mark.parametrize('identifier', sorted(corrosion_models.targets))
+def test_batch_matches_scalar_evaluation(loaded_models, identifier):
+    prototype = loaded_models[identifier]
+    sets = parameter_sets(prototype)
+
+    scalar = []
+    for values in sets:
+        model = prototype.copy()
+        model.set_parameters(values)
+        scalar.append(model.evaluate_material_loss(TIME)[0])
+
+    symbols = prototype.parameter_schema().symbols
+    columns = {symbol: np.array([values.get(symbol) for values in sets], dtype=object) for symbol in symbols}
+    batch = prototype.evaluate_material_loss_batch(columns, TIME)
+
+    assert batch.shape == (len(sets), TIME.size)
+    np.testing.assert_allclose(batch, np.array(scalar), rtol=1e-12, equal_nan=True)
+
+
+def test_batch_rejects_unknown_parameters(loaded_models):
+    with pytest.raises(ValueError, match='Unknown parameters'):
+        loaded_models['model_ma2010'].evaluate_material_loss_batch({'distanse': [1.0]}, TIME)
+
+
+def test_batch_rejects_invalid_choices(loaded_models):
+    with pytest.raises(ValueError, match='corrosion_site'):
+        loaded_models['model_benarie1986'].evaluate_material_loss_batch({'corrosion_site': [1, 99]}, TIME)
+
+
+def test_batch_accepts_extra_inputs(loaded_models):
+    material_loss = loaded_models['model_benarie1986'].evaluate_material_loss_batch({'A': [2.0], 'n': [0.5]}, TIME)
+    np.testing.assert_allclose(material_loss[0], 2.0 * TIME ** 0.5)
+
+
+def test_feliu_has_no_loss_before_exposure(loaded_models):
+    model = loaded_models['model_feliu1993']
+    manual_atmosphere = len(model.parameter_schema()['Atmosphere'].choices) - 1
+    with np.errstate(all='raise'):
+        material_loss = model.evaluate_material_loss_batch(
+            {'Atmosphere': [manual_atmosphere], 'Chloride pollution annual average': [5.0]}, TIME)
+    assert material_loss[0, 0] == 0.0
+
+
+def test_iso9223_uses_the_tabulated_exponent_of_each_time_point(loaded_models):
+    model = loaded_models['din-corrosion-protection-model-iso-9223-compliant']
+    # 200 g/(m²⋅a) is 25 μm/a; ISO 9224 table 3 lists 1.437 at 2 years and 1.776 at 3 years
+    material_loss = model.evaluate_material_loss_batch({'corrosion_speed': [200.0], 'exponent_type': ['tabulated']},
+                                                       np.array([1.0, 2.0, 2.5]))
+    exponent = np.array([1.0, 1.437, (1.437 + 1.776) / 2])
+    np.testing.assert_allclose(material_loss[0], exponent * 25.0 * np.array([1.0, 2.0, 2.5]) ** (exponent - 1))
+    np.testing.assert_allclose(material_loss[0], [25.0, 48.6347721, 70.0118178])
@@ -0,0 +1,86 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from measurements import BlobStore, load_measurements_from_directory, md5_checksum
+from models.table_store import APP_DIR
+
+MEASUREMENT_DIR = os.path.join(APP_DIR, '../data/kadi4mat_json/immersion_corrosion_measurements')
+
+
+@pytest.fixture
+def store(tmp_path):
+    os.makedirs(tmp_path / 'tables')
+    return BlobStore(root=str(tmp_path / 'blobs'), table_directory=str(tmp_path / 'tables'))
+
+
+def write_table(store, name, content):
+    path = os.path.join(store.table_directory, name)
+    with open(path, 'wb') as file:
+        file.write(content)
+    return path
+
+
+def record_file(name, checksum):
+    """The name and checksum of a file as stated by its record, all that resolving a file needs."""
+    return SimpleNamespace(name=name, checksum=checksum)
+
+
+def test_matching_file_is_added_to_the_store(store):
+    checksum = md5_checksum(write_table(store, 'table.csv', b'1,2\n'))
+    assert store.resolve(record_file('table.csv', checksum)) == (store.blob_path(checksum), checksum)
+    assert store.has(checksum)
+
+    # The blob is used even once the file in data/tables is gone or replaced
+    write_table(store, 'table.csv', b'3,4\n')
+    assert store.resolve(record_file('table.csv', checksum)) == (store.blob_path(checksum), checksum)
+
+
+def test_mismatching_file_is_used_only_without_the_records_blob(store, capsys):
+    path = write_table(store, 'table.csv', b'1,2\n')
+    checksum = md5_checksum(path)
+    file = record_file('table.csv', '0' * 32)
+    assert store.resolve(file) == (path, checksum)
+    assert store.resolve(file) == (path, checksum)
+    assert capsys.readouterr().out.count('does not match') == 1
+    assert not store.has(checksum)
+
+    # Once the content of the record is stored, the file in data/tables no longer shadows it
+    os.makedirs(os.path.dirname(store.blob_path(file.checksum)))
+    with open(store.blob_path(file.checksum), 'wb') as blob:
+        blob.write(b'3,4\n')
+    assert store.resolve(file) == (store.blob_path(file.checksum), file.checksum)
+
+
+def test_bundled_measurement_loads_its_series():
+    measurements = load_measurements_from_directory(MEASUREMENT_DIR)
+    ali = next(measurement for measurement in measurements if measurement.kadi_identifier == 'exp_data_ali2020')
+    assert ali.series
+    assert all(len(series) > 0 and series.x_axis_label == 'Time [years]' for series in ali.series)
+
+
+def test_file_without_checksum_is_used_unverified(store):
+    path = write_table(store, 'table.csv', b'1,2\n')
+    assert store.resolve(record_file('table.csv', '')) == (path, md5_checksum(path))
+
+
+def test_missing_file(store, capsys):
+    assert store.resolve(record_file('missing.csv', '0' * 32)) is None
+    assert 'was not found' in capsys.readouterr().out
+    assert BlobStore(root=store.root, table_directory=None).resolve(record_file('missing.csv', '0' * 32)) is None
+
+
+def test_files_of_the_same_content_are_parsed_once(store):
+    content = b'1,2\n'
+    checksum = md5_checksum(write_table(store, 'a.csv', content))
+    write_table(store, 'b.csv', content)
+    parsed = []
+
+    def parse(path):
+        parsed.append(path)
+        return path
+
+    assert store.load(record_file('a.csv', checksum), parse)[0] == checksum
+    assert store.load(record_file('b.csv', checksum), parse)[0] == checksum
+    assert len(parsed) == 1
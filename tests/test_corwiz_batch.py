@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from corwiz_batch import evaluate_scenarios, main
+
+
+def test_evaluate_scenarios_of_several_models():
+    scenarios = pd.DataFrame({'scenario': ['a', 'b'], 'model': ['model_ma2010', 'model_soares1999'],
+                              'horizon': [20, 20], 'steps': [11, 11], 'distance': [100, None]})
+    summary, curves = evaluate_scenarios(scenarios, workers=1)
+    assert list(summary['scenario']) == ['a', 'b']
+    assert len(curves) == 22
+
+
+def test_evaluate_scenarios_rejects_misspelled_parameters():
+    scenarios = pd.DataFrame({'scenario': ['a', 'b'], 'model': ['model_ma2010', 'model_soares1999'],
+                              'horizon': [20, 20], 'steps': [11, 11], 'distance': [100, None],
+                              'Temprature': [None, 12.0]})
+    with pytest.raises(ValueError, match='Temprature'):
+        evaluate_scenarios(scenarios, workers=1)
+
+
+@pytest.mark.parametrize('horizon, steps, message', [
+    (20, 0, 'number of steps'),
+    (20, 20000, 'number of steps'),
+    (-5, 11, 'horizon'),
+    (float('nan'), 11, 'horizon'),
+    (0, 11, 'horizon'),
+])
+def test_evaluate_scenarios_rejects_invalid_time_grids(horizon, steps, message):
+    scenarios = pd.DataFrame({'scenario': ['a', 'b'], 'model': ['model_ma2010', 'model_ma2010'],
+                              'horizon': [20, horizon], 'steps': [11, steps]})
+    with pytest.raises(ValueError, match=f"Scenario b: .*{message}"):
+        evaluate_scenarios(scenarios, workers=1)
+
+
+def test_main_reports_invalid_steps(tmp_path, capsys):
+    path = tmp_path / 'scenarios.csv'
+    pd.DataFrame({'scenario': ['a'], 'model': ['model_ma2010'], 'horizon': [20], 'steps': [0]}).to_csv(path, index=False)
+    assert main([str(path), '-o', str(tmp_path / 'summary.csv'), '-w', '1']) == 1
+    assert 'Scenario a: The number of steps' in capsys.readouterr().err
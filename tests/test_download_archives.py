@@ -0,0 +1,100 @@
+import io
+import os
+import tarfile
+import threading
+import zipfile
+
+import pytest
+
+import download_archives
+from download_archives import ARCHIVE_FORMATS, ArchiveStore, stream_archive, write_archive
+
+
+@pytest.fixture
+def members(tmp_path):
+    os.makedirs(tmp_path / 'data')
+    contents = {'a.csv': b'1,2\n' * 1000, 'b.json': b'{"b": 1}', 'empty.txt': b''}
+    for name, content in contents.items():
+        with open(tmp_path / 'data' / name, 'wb') as file:
+            file.write(content)
+    return [(str(tmp_path / 'data' / name), name) for name in contents]
+
+
+def read_members(members):
+    contents = {}
+    for path, name in members:
+        with open(path, 'rb') as file:
+            contents[name] = file.read()
+    return contents
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArchiveStore(cache_directory=str(tmp_path / 'archives'))
+
+
+def test_archives_are_reused_by_content(store, members, monkeypatch):
+    builds = []
+    write = download_archives.write_archive
+    monkeypatch.setattr(download_archives, 'write_archive', lambda *args: builds.append(args) or write(*args))
+
+    path = store.get_archive('all_files', members, 'zip')
+    assert store.get_archive('all_files', members, 'zip') == path
+    # The same contents under another name form another archive
+    assert store.get_archive('other', members, 'zip') != path
+    assert len(builds) == 2
+    assert not [name for name in os.listdir(store.cache_directory) if name.endswith('.tmp')]
+
+
+def test_changed_member_rebuilds_and_removes_outdated_archive(store, members):
+    path = store.get_archive('all_files', members, 'zip')
+    other_format = store.get_archive('all_files', members, 'tar.gz')
+    with open(members[0][0], 'ab') as file:
+        file.write(b'3,4\n')
+
+    rebuilt = store.get_archive('all_files', members, 'zip')
+    assert rebuilt != path
+    assert not os.path.exists(path)
+    assert os.path.exists(other_format)
+    with zipfile.ZipFile(rebuilt) as archive:
+        assert archive.read('a.csv').endswith(b'3,4\n')
+
+
+@pytest.mark.parametrize('archive_format', [name for name in ARCHIVE_FORMATS if name != '7z'])
+def test_streamed_archive_matches_written_archive(members, tmp_path, archive_format):
+    write_archive(members, str(tmp_path / 'archive'), archive_format)
+    with open(tmp_path / 'archive', 'rb') as file:
+        assert file.read() == b''.join(stream_archive(members, archive_format))
+
+    # Small chunks are compressed on several threads, and must still form one valid archive
+    streamed = b''.join(stream_archive(members, archive_format, chunk_size=1000, workers=2))
+    if archive_format == 'zip':
+        with zipfile.ZipFile(io.BytesIO(streamed)) as archive:
+            contents = {name: archive.read(name) for name in archive.namelist()}
+    elif archive_format == 'tar.gz':
+        with tarfile.open(fileobj=io.BytesIO(streamed), mode='r:gz') as archive:
+            contents = {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+    else:
+        pytest.skip(f"{archive_format} is not readable by tarfile")
+    assert contents == read_members(members)
+
+
+def test_different_archives_are_built_concurrently(store, members, monkeypatch):
+    started = threading.Event()
+    write = download_archives.write_archive
+
+    def write_after_other_build_started(members, target_path, archive_format):
+        if os.path.basename(target_path).startswith('first'):
+            # Waits for the build of the second archive, which a store-wide lock would block
+            assert started.wait(10)
+        else:
+            started.set()
+        write(members, target_path, archive_format)
+
+    monkeypatch.setattr(download_archives, 'write_archive', write_after_other_build_started)
+    first = threading.Thread(target=store.get_archive, args=('first', members, 'zip'))
+    first.start()
+    store.get_archive('second', members, 'zip')
+    first.join(15)
+    assert started.is_set() and not first.is_alive()
+    assert sorted(name.split('-')[0] for name in os.listdir(store.cache_directory)) == ['first', 'second']
@@ -0,0 +1,58 @@
+import json
+import threading
+
+from tornado.testing import AsyncHTTPTestCase
+
+from evaluation_api import EvaluationService, make_app
+
+MODEL = 'model_feliu1993'
+
+
+class EvaluationApiTest(AsyncHTTPTestCase):
+    def get_app(self):
+        self.service = EvaluationService(chunk_size=2, workers=2)
+        return make_app(self.service)
+
+    def post(self, path, request):
+        response = self.fetch(f"/api/models/{path}", method='POST', body=json.dumps(request))
+        if response.headers.get('Content-Type') == 'application/x-ndjson':
+            return response.code, [json.loads(line) for line in response.body.splitlines()]
+        return response.code, json.loads(response.body)
+
+    def test_single_evaluation_runs_on_the_thread_pool(self):
+        threads = []
+        evaluate = self.service.evaluate
+
+        def recording_evaluate(*args):
+            threads.append(threading.current_thread())
+            return evaluate(*args)
+
+        self.service.evaluate = recording_evaluate
+        code, body = self.post(f"{MODEL}/evaluate", {'horizon': 20, 'steps': 11, 'parameters': {'Temperature': 15}})
+        assert code == 200 and len(body['material_loss']) == 11
+        assert threads and threads[0] is not threading.main_thread()
+
+    def test_single_and_batch_evaluations_agree(self):
+        request = {'horizon': 20, 'steps': 11}
+        _, single = self.post(f"{MODEL}/evaluate", {**request, 'parameters': {'Temperature': 15}})
+        code, lines = self.post(f"{MODEL}/batch", {**request, 'curves': True,
+                                                   'scenarios': [{}, {'Temperature': 15}, {'Temperature': 25}]})
+        assert code == 200 and lines[0]['count'] == 3 and len(lines) == 4
+        assert [line['index'] for line in lines[1:]] == [0, 1, 2]
+        assert lines[2]['material_loss'] == single['material_loss']
+
+    def test_invalid_values_are_rejected_with_plain_messages(self):
+        for path, request in [
+            ('evaluate', {'horizon': 20, 'parameters': {'Temperature': 'nan'}}),
+            ('evaluate', {'horizon': 20, 'parameters': {'Atmosphere': 99}}),
+            ('batch', {'horizon': 20, 'columns': {'Temperature': [10, 'nan']}}),
+            ('batch', {'horizon': 20, 'columns': {'Atmosphere': [0, 99]}}),
+            ('batch', {'horizon': 20, 'scenarios': [{'Temprature': 10}]}),
+        ]:
+            code, body = self.post(f"{MODEL}/{path}", request)
+            assert code == 400, (path, request, body)
+            assert 'np.' not in body['error'], body['error']
+
+    def test_unknown_model(self):
+        code, body = self.post('nope/evaluate', {'horizon': 20})
+        assert code == 404 and body['error'] == 'Unknown model: nope'
@@ -0,0 +1,172 @@
+import copy
+import json
+import os
+
+import pytest
+
+from kadi_server import KadiServer
+from kadi_sync import KadiClient, MirrorSync
+from measurements import BlobStore, md5_checksum
+
+COLLECTION = 7
+MEASUREMENT = 'exp_data_ali2020'
+
+
+@pytest.fixture
+def server():
+    server = KadiServer()
+    yield server
+    server.close()
+
+
+def make_sync(server, directory, blob_store=None):
+    return MirrorSync(KadiClient(server.url, token='token', pool_size=4), json_directory=str(directory / 'json'),
+                      table_directory=str(directory / 'tables'), workers=4, blob_store=blob_store)
+
+
+def downloads(server):
+    return [path for path in server.requests if path.endswith('/download')]
+
+
+def change_file(server, name, content):
+    """Changes a file of the measurement record, which marks the record as modified."""
+    record = server.record(MEASUREMENT)
+    record['last_modified'] = f"2030-01-0{len(server.requests) % 9 + 1}T00:00:00+00:00"
+    entry = next(entry for entry in record['files'] if entry['name'] == name)
+    server.set_file(entry, content)
+    return entry
+
+
+def test_dry_run_reports_without_writing(server, tmp_path):
+    report = make_sync(server, tmp_path).run(COLLECTION, dry_run=True)
+    assert report.records_checked == len(server.records)
+    assert len(report.records_updated) == len(server.records)
+    assert sorted(report.files_downloaded) == ['ali2020_table_3.csv', 'ali2020_table_4.csv']
+    assert not downloads(server)
+    assert not os.path.exists(tmp_path / 'json') and not os.path.exists(tmp_path / 'tables')
+
+
+def test_cold_and_warm_sync(server, tmp_path):
+    sync = make_sync(server, tmp_path)
+    report = sync.run(COLLECTION)
+    assert not report.errors
+    assert len(report.records_updated) == len(server.records)
+    assert sorted(os.listdir(tmp_path / 'tables')) == ['ali2020_table_3.csv', 'ali2020_table_4.csv']
+    assert os.path.isfile(tmp_path / 'json' / 'immersion_corrosion_measurements' / f"{MEASUREMENT}.json")
+
+    # An unchanged collection is only listed, page by page
+    server.requests.clear()
+    report = sync.run(COLLECTION)
+    assert not report.records_updated and not report.files_downloaded and not report.errors
+    assert all('/collections/' in path for path in server.requests)
+
+
+def test_changed_record_downloads_changed_file_only(server, tmp_path):
+    sync = make_sync(server, tmp_path)
+    sync.run(COLLECTION)
+    content = server.files[change_file(server, 'ali2020_table_4.csv', b'1,2\n')['id']]
+
+    server.requests.clear()
+    report = sync.run(COLLECTION)
+    assert report.records_updated == [MEASUREMENT]
+    assert report.files_downloaded == ['ali2020_table_4.csv']
+    assert len(downloads(server)) == 1
+    with open(tmp_path / 'tables' / 'ali2020_table_4.csv', 'rb') as file:
+        assert file.read() == content
+
+
+def test_bad_checksum_keeps_local_copies(server, tmp_path):
+    sync = make_sync(server, tmp_path)
+    sync.run(COLLECTION)
+    record_path = tmp_path / 'json' / 'immersion_corrosion_measurements' / f"{MEASUREMENT}.json"
+    with open(record_path, encoding='utf-8') as file:
+        last_modified = json.load(file)['last_modified']
+    with open(tmp_path / 'tables' / 'ali2020_table_4.csv', 'rb') as file:
+        content = file.read()
+    change_file(server, 'ali2020_table_4.csv', b'1,2\n')['checksum'] = '0' * 32
+
+    report = sync.run(COLLECTION)
+    assert [name for name, _ in report.errors] == ['ali2020_table_4.csv']
+    assert not report.records_updated
+    with open(record_path, encoding='utf-8') as file:
+        assert json.load(file)['last_modified'] == last_modified
+    with open(tmp_path / 'tables' / 'ali2020_table_4.csv', 'rb') as file:
+        assert file.read() == content
+    assert not [name for name in os.listdir(tmp_path / 'tables') if name.endswith('.part')]
+
+
+def test_missing_file_is_downloaded_or_restored(server, tmp_path):
+    sync = make_sync(server, tmp_path)
+    sync.run(COLLECTION)
+    os.remove(tmp_path / 'tables' / 'ali2020_table_3.csv')
+    report = sync.run(COLLECTION)
+    assert report.files_downloaded == ['ali2020_table_3.csv'] and not report.records_updated
+
+    # With a blob store, a file whose content was downloaded before is restored without a request
+    mirror = tmp_path / 'stored'
+    sync = make_sync(server, mirror, BlobStore(root=str(tmp_path / 'blobs'), table_directory=None))
+    sync.run(COLLECTION)
+    os.remove(mirror / 'tables' / 'ali2020_table_3.csv')
+    server.requests.clear()
+    report = sync.run(COLLECTION)
+    assert report.files_restored == ['ali2020_table_3.csv'] and not report.files_downloaded
+    assert not downloads(server)
+    assert os.path.isfile(mirror / 'tables' / 'ali2020_table_3.csv')
+
+
+def test_files_shared_by_records_are_downloaded_once(server, tmp_path):
+    shared = copy.deepcopy(server.record(MEASUREMENT))
+    shared['id'], shared['identifier'] = max(server.records) + 1, f"{MEASUREMENT}_copy"
+    server.records[shared['id']] = shared
+
+    report = make_sync(server, tmp_path).run(COLLECTION)
+    assert not report.errors
+    assert sorted(report.files_downloaded) == ['ali2020_table_3.csv', 'ali2020_table_4.csv']
+    assert len(downloads(server)) == 2
+    assert {MEASUREMENT, f"{MEASUREMENT}_copy"} <= set(report.records_updated)
+
+
+def add_record_with_other_content(server, name):
+    """Adds a copy of the measurement record whose file of the given name has a different content."""
+    other = copy.deepcopy(server.record(MEASUREMENT))
+    other['id'], other['identifier'] = max(server.records) + 1, f"{MEASUREMENT}_other"
+    entry = next(entry for entry in other['files'] if entry['name'] == name)
+    entry['id'] = 'other-file'
+    server.set_file(entry, b'5,6\n')
+    server.records[other['id']] = other
+    return other, entry
+
+
+def test_files_of_the_same_name_and_different_content_are_stored_side_by_side(server, tmp_path):
+    other, entry = add_record_with_other_content(server, 'ali2020_table_4.csv')
+    store = BlobStore(root=str(tmp_path / 'blobs'), table_directory=None)
+    report = make_sync(server, tmp_path, store).run(COLLECTION)
+    assert not report.errors
+    assert {MEASUREMENT, other['identifier']} <= set(report.records_updated)
+    original = next(file for file in server.record(MEASUREMENT)['files'] if file['name'] == 'ali2020_table_4.csv')
+    assert store.has(original['checksum']) and store.has(entry['checksum'])
+
+
+def test_files_of_the_same_name_and_different_content_conflict_without_blob_store(server, tmp_path):
+    sync = make_sync(server, tmp_path)
+    sync.run(COLLECTION)
+    other, _ = add_record_with_other_content(server, 'ali2020_table_4.csv')
+    with open(tmp_path / 'tables' / 'ali2020_table_4.csv', 'rb') as file:
+        content = file.read()
+
+    report = sync.run(COLLECTION)
+    assert [name for name, _ in report.errors] == ['ali2020_table_4.csv']
+    assert other['identifier'] not in report.records_updated
+    with open(tmp_path / 'tables' / 'ali2020_table_4.csv', 'rb') as file:
+        assert file.read() == content
+
+
+def test_local_copy_is_stored_before_a_file_of_the_same_name_replaces_it(server, tmp_path):
+    make_sync(server, tmp_path).run(COLLECTION)
+    original = md5_checksum(str(tmp_path / 'tables' / 'ali2020_table_4.csv'))
+    _, entry = add_record_with_other_content(server, 'ali2020_table_4.csv')
+
+    store = BlobStore(root=str(tmp_path / 'blobs'), table_directory=None)
+    report = make_sync(server, tmp_path, store).run(COLLECTION)
+    assert not report.errors
+    assert store.has(original) and store.has(entry['checksum'])
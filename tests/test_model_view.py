@@ -0,0 +1,50 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import figure_cache
+
+
+def download_page():
+    import streamlit as st
+    from model_view import download_plot
+    from models import MODEL_DIRECTORIES, corrosion_models, load_corrosion_models_from_directory
+
+    if 'plot_data' not in st.session_state:
+        st.session_state.plot_data = load_corrosion_models_from_directory(MODEL_DIRECTORIES, corrosion_models)[:1]
+    st.session_state.setdefault('selected_model', st.session_state.plot_data[0])
+    st.session_state.setdefault('measurement_data', [])
+    st.session_state.setdefault('time_range', 10)
+    download_plot('plot_download')
+
+
+class CountingRenderer:
+    def __init__(self):
+        self.renders = 0
+
+    def render(self, figure, image_format):
+        self.renders += 1
+        return f'{image_format} {self.renders}'.encode()
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    renderer = CountingRenderer()
+    monkeypatch.setattr(figure_cache, 'get_renderer_pool', lambda: renderer)
+    figure_cache.figure_cache.clear()
+    yield renderer
+    figure_cache.figure_cache.clear()
+
+
+def test_exported_plot_stays_downloadable_after_eviction(renderer):
+    app = AppTest.from_function(download_page).run()
+    assert not app.get('download_button')
+
+    app.button(key='plot_download_export').click().run()
+    assert len(app.get('download_button')) == 1
+    assert renderer.renders == 1
+
+    figure_cache.figure_cache.clear()
+    app.run()
+    assert not app.exception
+    assert len(app.get('download_button')) == 1
+    assert renderer.renders == 1
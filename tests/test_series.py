@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from measurements.series import MeasurementSeries, largest_triangle_three_buckets
+
+
+@pytest.fixture(scope='module')
+def series():
+    time = np.linspace(0.0, 10.0, 100001)
+    loss = np.sqrt(time)
+    loss[12345] = 50.0  # a single outlier that a faithful downsampling must keep
+    return MeasurementSeries('weightloss_Nacl0', time, loss, 'Time [years]', 'Mass loss [mg]')
+
+
+def test_lttb_keeps_ends_and_peaks():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[[100, 500, 900]] = [5.0, -5.0, 3.0]
+    indices = largest_triangle_three_buckets(x, y, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert {100, 500, 900} <= set(indices.tolist())
+
+
+def test_lttb_returns_short_series_unchanged():
+    x = np.arange(10, dtype=float)
+    np.testing.assert_array_equal(largest_triangle_three_buckets(x, x, 10), np.arange(10))
+    np.testing.assert_array_equal(largest_triangle_three_buckets(x, x, 2), np.arange(10))
+
+
+def test_downsample_is_cached_and_read_only(series):
+    time, loss = series.downsample(1200)
+    assert len(time) == len(loss) == 1200
+    assert loss.max() == 50.0
+    assert not time.flags.writeable and not loss.flags.writeable
+    assert series.downsample(1200)[0] is time
+    assert series.downsample(len(series))[0] is series.time
+
+
+def test_downsample_within_zoomed_range(series):
+    time, loss = series.downsample(1200, (1.0, 2.0))
+    assert len(time) == 1200
+    assert time[0] == pytest.approx(1.0) and time[-1] == pytest.approx(2.0)
+    # Zooming in selects from the points within the range, so they lie closer together than in the full series
+    assert np.diff(time).max() < np.diff(series.downsample(1200)[0]).max()
+    time, loss = series.downsample(1200, (0.99995, 1.00105))
+    np.testing.assert_array_equal(time, series.time[10000:10011])
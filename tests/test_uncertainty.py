@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from models import MODEL_DIRECTORIES, MonteCarloSimulation, Normal, StreamingQuantiles, Uniform, corrosion_models, \
+    load_corrosion_models_from_directory
+
+
+@pytest.fixture(scope='module')
+def loaded_models():
+    return {model.kadi_identifier: model
+            for model in load_corrosion_models_from_directory(MODEL_DIRECTORIES, corrosion_models)}
+
+
+def test_streaming_quantiles_match_exact_quantiles():
+    rng = np.random.default_rng(1)
+    samples = np.column_stack([rng.normal(0.0, 1.0, 200000), rng.exponential(2.0, 200000)])
+    sketch = StreamingQuantiles(max_summaries=4)
+    for block in np.array_split(samples, 20):  # enough blocks to merge the summaries several times
+        sketch.update(block)
+
+    levels = [0.05, 0.5, 0.95]
+    assert sketch.count == len(samples)
+    np.testing.assert_allclose(sketch.mean, samples.mean(axis=0))
+    # The sketch bounds the rank error, i.e. the share of samples below an estimate deviates little from its level
+    estimates = sketch.quantiles(levels)
+    ranks = (samples[None, :, :] < estimates[:, None, :]).mean(axis=1)
+    np.testing.assert_allclose(ranks, np.repeat(np.array(levels)[:, None], 2, axis=1), atol=0.005)
+
+
+def test_streaming_quantiles_need_samples():
+    with pytest.raises(ValueError):
+        StreamingQuantiles().quantiles([0.5])
+
+
+def test_monte_carlo_bands_are_ordered(loaded_models):
+    time = np.linspace(0.0, 20.0, 5)
+    bands = MonteCarloSimulation(loaded_models['model_feliu1993'], seed=0).run(time, samples=20000)
+    assert list(bands.columns) == ['mean', 'P5', 'P50', 'P95']
+    assert np.all(bands['P5'] <= bands['P50']) and np.all(bands['P50'] <= bands['P95'])
+    assert np.all(bands['P95'].iloc[1:] > bands['P5'].iloc[1:])
+
+
+@pytest.mark.parametrize('identifier', ['model_benarie1986', 'model_klinesmith2007'])
+def test_models_without_uncertainty_need_distributions(loaded_models, identifier):
+    assert not loaded_models[identifier].has_uncertainty
+    with pytest.raises(ValueError, match='no documented parameter uncertainties'):
+        MonteCarloSimulation(loaded_models[identifier])
+
+
+def test_explicit_distributions(loaded_models):
+    simulation = MonteCarloSimulation(loaded_models['model_benarie1986'],
+                                      {'A': Normal(326.0, 30.0, lower=0.0), 'n': Uniform(0.6, 0.8)}, seed=0)
+    bands = simulation.run(np.array([0.0, 10.0]), samples=10000)
+    assert bands['P5'].iloc[1] < bands['P95'].iloc[1]
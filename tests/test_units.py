@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from measurements import Measurement
+from models import ISO9223Model, convert, grams_per_m2_to_um, hours_to_years, mg_to_um, um_to_grams_per_m2, um_to_mg, \
+    years_to_hours
+
+
+def test_time_conversions():
+    np.testing.assert_allclose(hours_to_years([0, 8760, 4380]), [0.0, 1.0, 0.5])
+    np.testing.assert_allclose(years_to_hours(hours_to_years([1.0, 100.0])), [1.0, 100.0])
+    np.testing.assert_allclose(convert([8760, 876], 'h'), hours_to_years([8760, 876]))
+
+
+def test_mass_and_thickness_conversions_of_steel():
+    # 7.85 g/m² of steel is a layer of 1 μm
+    np.testing.assert_allclose(grams_per_m2_to_um([7.85, 1500]), [1.0, 1500 / 7.85])
+    np.testing.assert_allclose(um_to_grams_per_m2(grams_per_m2_to_um([10.0, 200.0])), [10.0, 200.0])
+    # 7.85 mg from 10 cm² is 7.85 g/m², i.e. 1 μm
+    np.testing.assert_allclose(mg_to_um([7.85, 15.7], area=10.0), [1.0, 2.0])
+    np.testing.assert_allclose(um_to_mg(mg_to_um([3.0, 40.0], area=2.5), area=2.5), [3.0, 40.0])
+
+
+def test_iso_category_limits_map_to_the_tabulated_values():
+    # ISO 9223 table 2 lists the category limits of carbon steel in g/(m²⋅a) and rounded μm/a; the model keeps the
+    # tabulated values, e.g. 200 μm/a for 1500 g/(m²⋅a), where the density of steel gives 191 μm/a
+    grams = [10, 200, 400, 650, 1500, 5500]
+    micrometres = [1.3, 25, 50, 80, 200, 700]
+    np.testing.assert_allclose(ISO9223Model.GRAMS_TO_UM(grams), micrometres)
+    np.testing.assert_allclose(ISO9223Model.UM_TO_GRAMS(micrometres), grams)
+    np.testing.assert_allclose(ISO9223Model.GRAMS_TO_UM([100, 1000]), [1.3 + 90 * 23.7 / 190, 80 + 350 * 120 / 850])
+    assert grams_per_m2_to_um(1500) == pytest.approx(191.08, abs=0.01)
+
+
+def test_measurement_mass_loss_in_um_given_the_specimen_area():
+    file_data = {'units': ['h', 'mg'], 'time': np.array([0.0, 8760.0]),
+                 'weight_losses': {'weightloss_Nacl0': np.array([0.0, 15.7])}}
+    (in_mg,) = Measurement._build_file_series(file_data)
+    assert in_mg.y_axis_label == 'Mass loss [mg]'
+    np.testing.assert_allclose(in_mg.time, [0.0, 1.0])
+    (in_um,) = Measurement._build_file_series(file_data, specimen_area=10.0)
+    assert in_um.y_axis_label == 'Mass loss [μm]'
+    np.testing.assert_allclose(in_um.loss, [0.0, 2.0])
@@ -0,0 +1,157 @@
+import time
+import threading
+from typing import Dict, List, Optional, Tuple, Type
+
+from catalog_index import CatalogIndex, IndexEntry, INDEX_PATH
+from models import (CorrosionModel, corrosion_models, get_corrosion_process_type, bulk_load, LoadReport, MODEL_DIRECTORIES,
+                    MEASUREMENT_DIRECTORIES)
+from measurements import Measurement
+
+
+class Catalog:
+    """
+    A process-wide catalog of the corrosion models and measurements in data/kadi4mat_json.
+
+    Listing and filtering is answered from a `CatalogIndex` of the records, so building the catalog reads only
+    the records that were added or modified since the index was saved. Model prototypes are instantiated, and
+    their classes imported, only when a model is first requested; a prototype is kept until its record changes.
+    Whether the records changed is checked at most once per `check_interval` seconds, so a rerun of the app
+    costs a few stat calls at most.
+
+    The models of the catalog are prototypes shared by all sessions. Sessions take their own handles from
+    `session_model`, which share the record details and reference tables but not the parameters.
+    The measurements are read-only and shared directly.
+
+    Attributes:
+        version (int): Incremented with every change of the records, so sessions can tell when to renew their handles.
+        model_entries (List[IndexEntry]): The index entries of the models with a registered model class.
+        measurements (List[Measurement]): The measurements.
+        last_report (LoadReport): The report of the records read by the last update, with the failed records.
+    """
+
+    def __init__(self,
+                 model_directories: List[str] = MODEL_DIRECTORIES,
+                 measurement_directories: List[str] = MEASUREMENT_DIRECTORIES,
+                 model_classes: Optional[Dict[str, Type[CorrosionModel]]] = None,
+                 check_interval: float = 2.0,
+                 index_path: Optional[str] = INDEX_PATH):
+        self.model_classes = corrosion_models if model_classes is None else model_classes
+        self.check_interval = check_interval
+        self.index = CatalogIndex({'model': model_directories, 'measurement': measurement_directories}, index_path)
+        self.version = 0
+        self.model_entries: List[IndexEntry] = []
+        self.measurements: List[Measurement] = []
+        self._prototypes: Dict[str, Tuple[str, CorrosionModel]] = {}
+        self._measurements: Dict[str, Tuple[str, Measurement]] = {}
+        self.last_report = LoadReport()
+        self._checked_at = float('-inf')
+        self._lock = threading.RLock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Updates the catalog if its records changed since the last update.
+
+        Args:
+            force (bool): Check the records even if the last check was less than `check_interval` seconds ago.
+
+        Returns:
+            bool: Whether the catalog changed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self.version > 0 and now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+
+            if not self.index.update() and self.version > 0:
+                return False
+            self.last_report = self.index.last_report
+
+            self.model_entries = []
+            for entry in self.index.entries('model'):
+                if entry.identifier in self.model_classes:
+                    self.model_entries.append(entry)
+                else:
+                    self.last_report.add_error(entry.path, 'build',
+                                               f"No matching corrosion model class for identifier '{entry.identifier}'")
+
+            # Keep the prototypes and measurements whose records are unchanged
+            checksums = {entry.identifier: entry.checksum for entry in self.model_entries}
+            self._prototypes = {identifier: prototype for identifier, prototype in self._prototypes.items()
+                                if checksums.get(identifier) == prototype[0]}
+            measurement_entries = self.index.entries('measurement')
+            outdated = [entry.path for entry in measurement_entries
+                        if self._measurements.get(entry.path, (None,))[0] != entry.checksum]
+            loaded = {measurement.json_file_path: measurement
+                      for measurement in bulk_load(outdated, lambda path, record: Measurement(path), report=self.last_report)}
+
+            measurements = {}
+            for entry in measurement_entries:
+                if entry.path in loaded:
+                    measurements[entry.path] = (entry.checksum, loaded[entry.path])
+                elif entry.path in self._measurements and self._measurements[entry.path][0] == entry.checksum:
+                    measurements[entry.path] = self._measurements[entry.path]
+            self._measurements = measurements
+            self.measurements = [measurement for _, measurement in measurements.values()]
+
+            self.version += 1
+            return True
+
+    def model_entry(self, identifier: str) -> Optional[IndexEntry]:
+        """Returns the index entry of a model, if the catalog lists it."""
+        return next((entry for entry in self.model_entries if entry.identifier == identifier), None)
+
+    def model_entries_of_type(self, process_type: str) -> List[IndexEntry]:
+        """Returns the index entries of the models of a corrosion process type, e.g. 'atmospheric corrosion'."""
+        return [entry for entry in self.model_entries if entry.process_type == process_type]
+
+    def process_types(self) -> List[str]:
+        """Returns the sorted corrosion process types of the models."""
+        return sorted({entry.process_type for entry in self.model_entries if entry.process_type})
+
+    def model(self, identifier: str) -> CorrosionModel:
+        """
+        Returns the prototype of a model, instantiating it from its record on first request.
+
+        Raises:
+            KeyError: If the catalog does not list the model.
+            ValueError: If the record of the model cannot be loaded.
+        """
+        with self._lock:
+            entry = self.model_entry(identifier)
+            if entry is None:
+                raise KeyError(identifier)
+            if identifier not in self._prototypes:
+                self._prototypes[identifier] = (entry.checksum, self.model_classes[identifier](entry.path))
+            return self._prototypes[identifier][1]
+
+    @property
+    def models(self) -> List[CorrosionModel]:
+        """The prototypes of all models, instantiating those not requested before."""
+        return [self.model(entry.identifier) for entry in self.model_entries]
+
+    def session_model(self, identifier: str) -> CorrosionModel:
+        """Returns a copy of a model prototype with its own parameters, for use in a single session."""
+        return self.model(identifier).copy()
+
+    def session_models(self) -> List[CorrosionModel]:
+        """Returns copies of all model prototypes with their own parameters, for use in a single session."""
+        return [model.copy() for model in self.models]
+
+    def model_process_types(self, models: Optional[List[CorrosionModel]] = None) -> List[Tuple[CorrosionModel, str]]:
+        """Returns the models paired with their corrosion process types. Defaults to the model prototypes."""
+        return get_corrosion_process_type(self.models if models is None else models)
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """Returns the catalog of this process, building it on first use and updating it when the records changed."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+    _catalog.refresh()
+    return _catalog
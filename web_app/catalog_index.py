@@ -0,0 +1,197 @@
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import process_type_from_tags, read_json_records, JsonRecord, LoadReport
+
+# The index file, next to (not inside) the data directory
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'catalog_index.json')
+
+# Bump when the fields of the index change, so outdated index files are rebuilt
+INDEX_FORMAT = 1
+
+
+class IndexEntry:
+    """
+    The summary of a single Kadi4Mat record in the catalog index.
+
+    Attributes:
+        kind (str): The kind of record, 'model' or 'measurement'.
+        identifier (str): The Kadi4Mat identifier of the record.
+        title (str): The title of the record.
+        process_type (Optional[str]): The corrosion process type named by the tags, e.g. 'immersion corrosion'.
+        tags (List[str]): The tags of the record.
+        path (str): The path of the JSON file.
+        mtime_ns (int): The modification time of the JSON file in nanoseconds.
+        size (int): The size of the JSON file in bytes.
+        checksum (str): The SHA-256 digest of the JSON file.
+    """
+
+    FIELDS = ('kind', 'identifier', 'title', 'process_type', 'tags', 'path', 'mtime_ns', 'size', 'checksum')
+    __slots__ = FIELDS
+
+    def __init__(self, kind: str, identifier: str, title: str, process_type: Optional[str], tags: List[str],
+                 path: str, mtime_ns: int, size: int, checksum: str):
+        self.kind = kind
+        self.identifier = identifier
+        self.title = title
+        self.process_type = process_type
+        self.tags = tags
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.checksum = checksum
+
+    @classmethod
+    def from_record(cls, kind: str, record: JsonRecord, stat: os.stat_result) -> 'IndexEntry':
+        """
+        Summarises a decoded JSON record.
+
+        Raises:
+            ValueError: If the record is not a JSON object.
+        """
+        data = record.data
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+
+        tags = [str(tag) for tag in data.get('tags', [])]
+        return cls(kind, data.get('identifier', ''), data.get('title', ''), process_type_from_tags(tags), tags,
+                   record.path, stat.st_mtime_ns, stat.st_size, record.checksum)
+
+    def to_row(self) -> List[Any]:
+        return [getattr(self, field) for field in self.FIELDS]
+
+    def __repr__(self):
+        return f"IndexEntry(kind={self.kind}, identifier={self.identifier}, path={self.path})"
+
+
+class CatalogIndex:
+    """
+    A compact on-disk index of the Kadi4Mat records, for listing and filtering them without reading the records.
+
+    The index holds one `IndexEntry` per JSON file and is updated incrementally: `update` stats the record
+    files and re-reads only those whose modification time or size changed, then saves the index if anything
+    changed. Changed records are read in parallel by the bulk loader, and records that cannot be read are
+    left out of the index and listed in `last_report`. Listing the models of a process type, or the measurements,
+    is answered from the entries.
+
+    Attributes:
+        directories (Dict[str, List[str]]): The record directories by kind, e.g. {'model': [...]}.
+        index_path (Optional[str]): The index file, or None to keep the index in memory only.
+        last_report (LoadReport): The report of the records read by the last update.
+    """
+
+    def __init__(self, directories: Dict[str, List[str]], index_path: Optional[str] = INDEX_PATH):
+        self.directories = {kind: list(paths) for kind, paths in directories.items()}
+        self.index_path = index_path
+        self._entries: Dict[str, IndexEntry] = self._load() if index_path else {}
+        self.last_report = LoadReport()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, IndexEntry]:
+        """Loads the index file, or returns an empty index if it is missing, unreadable or outdated."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('format') != INDEX_FORMAT or data.get('fields') != list(IndexEntry.FIELDS):
+                return {}
+            entries = [IndexEntry(*row) for row in data['entries']]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+        return {entry.path: entry for entry in entries}
+
+    def _save(self) -> None:
+        """Writes the index file atomically."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temporary_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'format': INDEX_FORMAT, 'fields': list(IndexEntry.FIELDS),
+                       'entries': [entry.to_row() for entry in self._entries.values()]},
+                      file, separators=(',', ':'))
+        os.replace(temporary_path, self.index_path)
+
+    def _scan(self) -> List[Tuple[str, str, os.stat_result]]:
+        """Returns the kind, path and stat result of every JSON record in the directories."""
+        records = []
+        for kind, directories in self.directories.items():
+            for directory in directories:
+                if not os.path.isdir(directory):
+                    continue
+                with os.scandir(directory) as scan:
+                    for entry in scan:
+                        if entry.name.endswith('.json') and entry.is_file():
+                            records.append((kind, entry.path, entry.stat()))
+        return sorted(records, key=lambda record: record[1])
+
+    def update(self) -> bool:
+        """
+        Brings the index up to date with the record files, re-reading only added and modified records.
+
+        Returns:
+            bool: Whether any entry was added, changed or removed.
+        """
+        with self._lock:
+            scanned = self._scan()
+            outdated = {path: (kind, stat) for kind, path, stat in scanned
+                        if path not in self._entries or self._entries[path].kind != kind
+                        or (self._entries[path].mtime_ns, self._entries[path].size) != (stat.st_mtime_ns, stat.st_size)}
+
+            report = LoadReport()
+            new_entries: Dict[str, IndexEntry] = {}
+            for record in read_json_records(list(outdated), report=report):
+                kind, stat = outdated[record.path]
+                try:
+                    new_entries[record.path] = IndexEntry.from_record(kind, record, stat)
+                except ValueError as e:
+                    report.add_error(record.path, 'decode', str(e))
+                    report.loaded -= 1
+            self.last_report = report
+
+            entries: Dict[str, IndexEntry] = {}
+            changed = False
+            for kind, path, stat in scanned:
+                entry = self._entries.get(path)
+                if path in outdated:
+                    if path not in new_entries:
+                        continue
+                    # A touched but unchanged record keeps its entry, apart from the new modification time
+                    changed = changed or entry is None or entry.checksum != new_entries[path].checksum or entry.kind != kind
+                    entry = new_entries[path]
+                entries[path] = entry
+
+            changed = changed or entries.keys() != self._entries.keys()
+            saved = changed or any(entries[path] is not self._entries[path] for path in entries)
+            self._entries = entries
+            if saved and self.index_path:
+                self._save()
+            return changed
+
+    def entries(self, kind: Optional[str] = None, process_type: Optional[str] = None,
+                tag: Optional[str] = None) -> List[IndexEntry]:
+        """
+        Returns the entries, sorted by path, optionally filtered by kind, process type and tag.
+
+        Args:
+            kind (Optional[str]): Only entries of this kind, e.g. 'model'.
+            process_type (Optional[str]): Only entries of this corrosion process type, e.g. 'atmospheric corrosion'.
+            tag (Optional[str]): Only entries carrying this tag.
+
+        Returns:
+            List[IndexEntry]: The matching entries.
+        """
+        return [entry for entry in self._entries.values()
+                if (kind is None or entry.kind == kind)
+                and (process_type is None or entry.process_type == process_type)
+                and (tag is None or tag in entry.tags)]
+
+    def process_types(self, kind: str = 'model') -> List[str]:
+        """Returns the sorted corrosion process types of the entries of a kind."""
+        return sorted({entry.process_type for entry in self.entries(kind) if entry.process_type})
+
+    def find(self, identifier: str, kind: Optional[str] = None) -> Optional[IndexEntry]:
+        """Returns the first entry with the given identifier, if any."""
+        return next((entry for entry in self.entries(kind) if entry.identifier == identifier), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
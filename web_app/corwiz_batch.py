@@ -0,0 +1,215 @@
+"""
+Command-line batch runner that evaluates scenario files of corrosion models on all cores.
+
+A scenario file (CSV or Parquet) holds one scenario per row with the columns
+    model    - the Kadi4Mat identifier of the corrosion model, e.g. 'model_feliu1993'
+    horizon  - the time horizon in years
+    steps    - optional, the number of time points of the curve (defaults to 101)
+    scenario - optional, an identifier of the scenario (defaults to the row number)
+and one column per model parameter, named by the parameter symbol. Parameters that are left
+empty are set to their defaults.
+
+Usage:
+    python corwiz_batch.py scenarios.csv --output summary.parquet --curves curves.parquet
+"""
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models import CorrosionModel, corrosion_models, MODEL_DIRECTORIES, load_corrosion_models_from_directory
+
+SCENARIO_KEY = 'scenario'
+MODEL_KEY = 'model'
+HORIZON_KEY = 'horizon'
+STEPS_KEY = 'steps'
+DEFAULT_STEPS = 101
+MAX_STEPS = 10001
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def horizon_time_grid(horizon: float, steps: int = DEFAULT_STEPS) -> np.ndarray:
+    """
+    Returns `steps` equally spaced time points from 0 to a horizon in years.
+
+    Raises:
+        ValueError: If the horizon is not a positive finite number or the number of steps is not between 1 and
+            `MAX_STEPS`.
+    """
+    horizon, steps = float(horizon), int(steps)
+    if not np.isfinite(horizon) or horizon <= 0:
+        raise ValueError(f"The horizon must be a positive number of years, got {horizon}.")
+    if not 1 <= steps <= MAX_STEPS:
+        raise ValueError(f"The number of steps must be between 1 and {MAX_STEPS}, got {steps}.")
+    return np.linspace(0.0, horizon, steps)
+
+
+def read_scenarios(file_path: str) -> pd.DataFrame:
+    """Reads a scenario file in CSV or Parquet format."""
+    if file_path.endswith('.parquet'):
+        scenarios = pd.read_parquet(file_path)
+    else:
+        scenarios = pd.read_csv(file_path)
+
+    for key in (MODEL_KEY, HORIZON_KEY):
+        if key not in scenarios.columns:
+            raise ValueError(f"The scenario file {file_path} has no '{key}' column.")
+        if scenarios[key].isna().any():
+            raise ValueError(f"The scenario file {file_path} has empty values in the '{key}' column.")
+    if SCENARIO_KEY not in scenarios.columns:
+        scenarios[SCENARIO_KEY] = np.arange(len(scenarios))
+    if STEPS_KEY not in scenarios.columns:
+        scenarios[STEPS_KEY] = DEFAULT_STEPS
+    scenarios[STEPS_KEY] = scenarios[STEPS_KEY].fillna(DEFAULT_STEPS).astype(int)
+    return scenarios
+
+
+def write_table(table: pd.DataFrame, file_path: str) -> None:
+    """Writes a table in Parquet format, or in CSV format if the file name ends with '.csv'."""
+    if file_path.endswith('.csv'):
+        table.to_csv(file_path, index=False)
+    else:
+        table.to_parquet(file_path, index=False)
+
+
+@lru_cache(maxsize=None)
+def _load_model(model_identifier: str, json_file_path: str) -> CorrosionModel:
+    """Loads a corrosion model once per worker process."""
+    return corrosion_models[model_identifier](json_file_path)
+
+
+def _evaluate_chunk(task: Tuple[str, str, Dict[str, np.ndarray], np.ndarray]) -> np.ndarray:
+    """Evaluates a chunk of parameter sets of one model in a worker process."""
+    model_identifier, json_file_path, columns, time = task
+    return _load_model(model_identifier, json_file_path).evaluate_material_loss_batch(columns, time)
+
+
+def evaluate_scenarios(scenarios: pd.DataFrame, workers: Optional[int] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Evaluates all scenarios with a process pool.
+
+    Scenarios are grouped by model and time grid, validated against the model's parameter schema and
+    evaluated in chunks of vectorized batches. A column that holds values for the scenarios of a model must
+    be a parameter of that model; columns left empty for its scenarios are ignored.
+
+    Args:
+        scenarios (pd.DataFrame): The scenarios as returned by `read_scenarios`.
+        workers (Optional[int]): The number of worker processes. Defaults to the number of cores;
+                                 1 evaluates in the current process.
+        chunk_size (int): The maximum number of scenarios per batch. Defaults to 10000.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The summary with one row per scenario, and the curves
+                                           with one row per scenario and time point.
+
+    Raises:
+        ValueError: If a scenario refers to an unknown model, has an invalid horizon or number of steps, or holds
+            invalid parameters.
+    """
+    models = {model.kadi_identifier: model
+              for model in load_corrosion_models_from_directory(MODEL_DIRECTORIES, corrosion_models)}
+    unknown = set(scenarios[MODEL_KEY]) - set(models)
+    if unknown:
+        raise ValueError(f"Unknown model identifiers: {', '.join(sorted(map(str, unknown)))}")
+
+    # Split the scenarios into chunks of one model and one time grid
+    tasks, task_groups = [], []
+    groups = scenarios.groupby([MODEL_KEY, HORIZON_KEY, STEPS_KEY], sort=False, dropna=False)
+    for (model_identifier, horizon, steps), group in groups:
+        try:
+            time = horizon_time_grid(horizon, steps)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Scenario {group[SCENARIO_KEY].iloc[0]}: {str(e)}") from e
+        model = models[model_identifier]
+        parameters = group.drop(columns=[SCENARIO_KEY, MODEL_KEY, HORIZON_KEY, STEPS_KEY]).dropna(axis=1, how='all')
+        # Columns that hold values for these scenarios must be parameters of their model
+        columns = model.resolve_columns({str(name): parameters[name].to_numpy() for name in parameters})
+
+        for start in range(0, len(group), chunk_size):
+            chunk = {name: column[start:start + chunk_size] for name, column in columns.items()}
+            tasks.append((model_identifier, model.json_file_path, chunk, time))
+            task_groups.append((group.iloc[start:start + chunk_size], model, time))
+
+    if workers == 1:
+        results = map(_evaluate_chunk, tasks)
+        return _collect_results(task_groups, results)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _collect_results(task_groups, executor.map(_evaluate_chunk, tasks))
+
+
+def summarize_material_loss(material_loss: np.ndarray, time: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Returns the summary values of N material loss curves.
+
+    Args:
+        material_loss (np.ndarray): An N×T array of material loss, as returned by `evaluate_material_loss_batch`.
+        time (np.ndarray): The T time points in years.
+
+    Returns:
+        Dict[str, np.ndarray]: The loss at the horizon, the mean rate and the rate at the horizon of each curve.
+    """
+    loss_at_horizon = material_loss[:, -1]
+    if time.size > 1:
+        rate_at_horizon = (material_loss[:, -1] - material_loss[:, -2]) / (time[-1] - time[-2])
+    else:
+        rate_at_horizon = np.full(len(material_loss), np.nan)
+    mean_rate = loss_at_horizon / time[-1] if time[-1] > 0 else np.full(len(material_loss), np.nan)
+    return {'loss_at_horizon': loss_at_horizon, 'mean_rate': mean_rate, 'rate_at_horizon': rate_at_horizon}
+
+
+def _collect_results(task_groups: List[Tuple[pd.DataFrame, CorrosionModel, np.ndarray]],
+                     results) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Assembles the summaries and curves of all evaluated chunks."""
+    summaries, curves = [], []
+    for (group, model, time), material_loss in zip(task_groups, results):
+        summaries.append(pd.DataFrame({
+            SCENARIO_KEY: group[SCENARIO_KEY].to_numpy(),
+            MODEL_KEY: group[MODEL_KEY].to_numpy(),
+            HORIZON_KEY: group[HORIZON_KEY].to_numpy(),
+            **summarize_material_loss(material_loss, time),
+            'loss_label': model.LOSS_AXIS_LABEL,
+        }))
+        curves.append(pd.DataFrame({
+            SCENARIO_KEY: np.repeat(group[SCENARIO_KEY].to_numpy(), time.size),
+            'time': np.tile(time, len(group)),
+            'material_loss': material_loss.ravel(),
+        }))
+
+    if not summaries:
+        return pd.DataFrame(), pd.DataFrame()
+    return pd.concat(summaries, ignore_index=True), pd.concat(curves, ignore_index=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the batch evaluation from the command line."""
+    parser = argparse.ArgumentParser(prog='corwiz-batch', description='Evaluate scenario files of CorWiz corrosion models.')
+    parser.add_argument('scenarios', help='CSV or Parquet file with one scenario per row')
+    parser.add_argument('-o', '--output', default='summary.parquet', help='file for the summary values (default: summary.parquet)')
+    parser.add_argument('-c', '--curves', default=None, help='file for the material loss curves (not written by default)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='scenarios per vectorized batch')
+    args = parser.parse_args(argv)
+
+    try:
+        scenarios = read_scenarios(args.scenarios)
+        summary, curves = evaluate_scenarios(scenarios, workers=args.workers, chunk_size=args.chunk_size)
+        write_table(summary, args.output)
+        if args.curves:
+            write_table(curves, args.curves)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Evaluated {len(summary)} scenarios, summary written to {args.output}"
+          + (f", curves written to {args.curves}" if args.curves else ""))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,309 @@
+import gzip
+import hashlib
+import os
+import re
+import tarfile
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import py7zr
+
+try:
+    import pyzstd
+except ImportError:  # pyzstd comes with py7zr, but is optional for the tar.zst format
+    pyzstd = None
+
+# Directory of the prebuilt archives, outside the data directory so they are never archived themselves, and in
+# the static directory of the app, so Streamlit serves them from disk at ARCHIVE_URL
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'archives')
+ARCHIVE_URL = './app/static/archives'
+
+# Streamlit serves static files up to this size
+MAX_STATIC_FILE_SIZE = 200 * 1024 * 1024
+
+# The files of an archive as (path on disk, name in the archive)
+ArchiveMembers = List[Tuple[str, str]]
+
+# Size of the chunks in which archives are streamed and compressed
+CHUNK_SIZE = 1 << 20
+
+
+class ArchiveFormat:
+    """
+    An archive format offered for download.
+
+    Attributes:
+        name (str): The name of the format, e.g. 'zip'.
+        label (str): The label shown to users, e.g. 'ZIP'.
+        extension (str): The file extension including the dot, e.g. '.zip'.
+        mime (str): The MIME type of the archive files.
+    """
+
+    def __init__(self, name: str, label: str, extension: str, mime: str):
+        self.name = name
+        self.label = label
+        self.extension = extension
+        self.mime = mime
+
+
+ARCHIVE_FORMATS: Dict[str, ArchiveFormat] = {
+    '7z': ArchiveFormat('7z', '7-Zip', '.7z', 'application/x-7z-compressed'),
+    'zip': ArchiveFormat('zip', 'ZIP (uncompressed)', '.zip', 'application/zip'),
+    'tar.gz': ArchiveFormat('tar.gz', 'tar.gz', '.tar.gz', 'application/gzip'),
+}
+if pyzstd is not None:
+    ARCHIVE_FORMATS['tar.zst'] = ArchiveFormat('tar.zst', 'tar.zst (Zstandard)', '.tar.zst', 'application/zstd')
+
+# Compressors of the tar formats; each compresses a chunk into a self-contained gzip member or zstd frame
+_CHUNK_COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    'tar.gz': lambda chunk: gzip.compress(chunk, compresslevel=1, mtime=0),
+}
+if pyzstd is not None:
+    _CHUNK_COMPRESSORS['tar.zst'] = lambda chunk: pyzstd.compress(chunk, 3)
+
+
+class _ChunkSink:
+    """A write-only, unseekable stream collecting the bytes written by zipfile until they are taken."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _read_chunks(file_path: str, chunk_size: int) -> Iterator[bytes]:
+    """Yields the contents of a file in chunks."""
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            yield chunk
+
+
+def _tar_chunks(members: ArchiveMembers, chunk_size: int) -> Iterator[bytes]:
+    """Yields an uncompressed tar archive of the members in chunks of at most `chunk_size` bytes."""
+    for file_path, archive_name in members:
+        stat = os.stat(file_path)
+        info = tarfile.TarInfo(archive_name)
+        info.size, info.mtime, info.mode = stat.st_size, int(stat.st_mtime), 0o644
+        yield info.tobuf(format=tarfile.PAX_FORMAT)
+        yield from _read_chunks(file_path, chunk_size)
+        if stat.st_size % tarfile.BLOCKSIZE:
+            yield tarfile.NUL * (tarfile.BLOCKSIZE - stat.st_size % tarfile.BLOCKSIZE)
+    yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+
+def _stream_tar(members: ArchiveMembers, compress: Callable[[bytes], bytes], chunk_size: int,
+                workers: Optional[int]) -> Iterator[bytes]:
+    """
+    Yields a compressed tar archive. The chunks of the tar stream are compressed independently on a thread pool,
+    as gzip members or zstd frames, which decompress as one stream. At most two chunks per worker are in flight,
+    so memory stays bounded by the chunk size, however large the archive.
+    """
+    workers = workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _tar_chunks(members, chunk_size):
+            pending.append(executor.submit(compress, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _stream_zip(members: ArchiveMembers, chunk_size: int) -> Iterator[bytes]:
+    """Yields a ZIP archive of the uncompressed (stored) members, which is fast to build and to extract."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        for file_path, archive_name in members:
+            info = zipfile.ZipInfo.from_file(file_path, archive_name)
+            with archive.open(info, 'w', force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as destination:
+                for chunk in _read_chunks(file_path, chunk_size):
+                    destination.write(chunk)
+                    yield sink.take()
+    yield sink.take()
+
+
+def _write_7z(members: ArchiveMembers, target_path: str) -> None:
+    """Writes a 7-Zip archive of the members to a file."""
+    with py7zr.SevenZipFile(target_path, 'w') as archive:
+        for file_path, archive_name in members:
+            archive.write(file_path, archive_name)
+
+
+def stream_archive(members: ArchiveMembers, archive_format: str = '7z', chunk_size: int = CHUNK_SIZE,
+                   workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Streams an archive of the given files in chunks, without holding the archive in memory.
+
+    The 7-Zip format needs a seekable file, so it is written to a temporary file first. The ZIP format stores
+    the files uncompressed, and the tar formats compress chunks of the files on a thread pool with a fast codec.
+
+    Args:
+        members (ArchiveMembers): The files of the archive as (path on disk, name in the archive).
+        archive_format (str): A key of ARCHIVE_FORMATS. Defaults to '7z'.
+        chunk_size (int): The maximum size of the uncompressed chunks. Defaults to 1 MiB.
+        workers (Optional[int]): The number of compression threads of the tar formats. Defaults to the CPU count.
+
+    Yields:
+        bytes: The next chunk of the archive.
+
+    Raises:
+        ValueError: If the archive format is unknown.
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format '{archive_format}', expected one of {list(ARCHIVE_FORMATS)}.")
+
+    if archive_format == 'zip':
+        chunks = _stream_zip(members, chunk_size)
+    elif archive_format in _CHUNK_COMPRESSORS:
+        chunks = _stream_tar(members, _CHUNK_COMPRESSORS[archive_format], chunk_size, workers)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'archive.7z')
+            _write_7z(members, path)
+            yield from _read_chunks(path, chunk_size)
+        return
+    yield from (chunk for chunk in chunks if chunk)
+
+
+def write_archive(members: ArchiveMembers, target_path: str, archive_format: str = '7z') -> None:
+    """Writes an archive of the given files to a file, streaming it chunk by chunk."""
+    if archive_format == '7z':
+        _write_7z(members, target_path)
+        return
+    with open(target_path, 'wb') as target:
+        for chunk in stream_archive(members, archive_format):
+            target.write(chunk)
+
+
+class ArchiveStore:
+    """
+    Prebuilt archives of the download files, stored on disk and keyed by a hash of their contents.
+
+    An archive is built once and then served from disk until one of its source files changes, which changes the
+    content hash and therefore the archive file name. The digests of the source files are cached by modification
+    time and size, so checking whether an archive is current costs one stat call per source file.
+
+    Attributes:
+        cache_directory (str): The directory of the archive files.
+    """
+
+    def __init__(self, cache_directory: str = ARCHIVE_DIR):
+        self.cache_directory = cache_directory
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._archive_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def file_digest(self, file_path: str) -> str:
+        """Returns the SHA-256 digest of a file, hashing it again only if its modification time or size changed."""
+        stat = os.stat(file_path)
+        cached = self._digests.get(file_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        with self._lock:
+            self._digests[file_path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+        return digest.hexdigest()
+
+    def content_hash(self, members: ArchiveMembers) -> str:
+        """Returns a hash of the names and contents of the members of an archive."""
+        digest = hashlib.sha256()
+        for file_path, archive_name in sorted(members, key=lambda member: member[1]):
+            digest.update(f"{archive_name}\0{self.file_digest(file_path)}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_archive(self, name: str, members: ArchiveMembers, archive_format: str = '7z') -> str:
+        """
+        Returns the path of the archive of the given members, building it only if no archive of the
+        current contents exists. Outdated archives of the same name and format are removed.
+
+        Args:
+            name (str): The name of the archive, e.g. 'all_files' or the name of a single file.
+            members (ArchiveMembers): The files of the archive as (path on disk, name in the archive).
+            archive_format (str): A key of ARCHIVE_FORMATS. Defaults to '7z'.
+
+        Returns:
+            str: The path of the archive file.
+
+        Raises:
+            ValueError: If the archive format is unknown.
+        """
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format '{archive_format}', expected one of {list(ARCHIVE_FORMATS)}.")
+        extension = ARCHIVE_FORMATS[archive_format].extension
+        key = self.content_hash(members)[:16]
+        archive_path = os.path.join(self.cache_directory, f"{name}-{key}{extension}")
+        if os.path.exists(archive_path):
+            return archive_path
+
+        # Only builds of the same archive wait for each other; each build writes to a temporary file of its own
+        with self._lock:
+            archive_lock = self._archive_locks.setdefault(archive_path, threading.Lock())
+        with archive_lock:
+            if not os.path.exists(archive_path):
+                os.makedirs(self.cache_directory, exist_ok=True)
+                descriptor, temporary_path = tempfile.mkstemp(suffix='.tmp', prefix=f"{name}-", dir=self.cache_directory)
+                os.close(descriptor)
+                try:
+                    write_archive(members, temporary_path, archive_format)
+                    os.replace(temporary_path, archive_path)
+                finally:
+                    if os.path.exists(temporary_path):
+                        os.remove(temporary_path)
+                self._remove_outdated(name, extension, archive_path)
+        with self._lock:
+            self._archive_locks.pop(archive_path, None)
+        return archive_path
+
+    def _remove_outdated(self, name: str, extension: str, current_path: str) -> None:
+        """Removes the archives of a name and format other than the current one."""
+        pattern = re.compile(re.escape(name) + r'-[0-9a-f]{16}' + re.escape(extension))
+        for entry in os.listdir(self.cache_directory):
+            path = os.path.join(self.cache_directory, entry)
+            if pattern.fullmatch(entry) and os.path.abspath(path) != os.path.abspath(current_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:  # removed by a concurrent build
+                    pass
+
+
+def archive_url(archive_path: str) -> Optional[str]:
+    """Returns the URL at which the app serves an archive of the store, or None if it is too large to be served."""
+    if os.path.getsize(archive_path) > MAX_STATIC_FILE_SIZE:
+        return None
+    return f"{ARCHIVE_URL}/{os.path.basename(archive_path)}"
+
+
+def archive_name_for(file_path: str, directory_path: str) -> str:
+    """Returns a file-system safe archive name for a file, unique within the directory."""
+    return re.sub(r'[^\w.-]', '_', os.path.relpath(file_path, directory_path))
+
+
+_archive_store: Optional[ArchiveStore] = None
+_archive_store_lock = threading.Lock()
+
+
+def get_archive_store() -> ArchiveStore:
+    """Returns the archive store of this process, so digests are shared by all sessions."""
+    global _archive_store
+    with _archive_store_lock:
+        if _archive_store is None:
+            _archive_store = ArchiveStore()
+        return _archive_store
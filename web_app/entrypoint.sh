@@ -0,0 +1,17 @@
+#!/bin/bash
+# Runs the evaluation API and the Streamlit app of the container. As soon as either of them exits, the other is
+# stopped and the container exits with its status, so the restart policy of the container restarts both.
+# Termination signals are passed on to both services.
+
+pipenv run python evaluation_api.py --port=8502 --address=0.0.0.0 --processes=0 &
+api=$!
+pipenv run streamlit run Home.py --server.port=8501 --server.address=0.0.0.0 &
+app=$!
+
+trap 'kill -TERM "$api" "$app" 2>/dev/null' TERM INT
+
+wait -n "$api" "$app"
+status=$?
+kill -TERM "$api" "$app" 2>/dev/null
+wait
+exit "$status"
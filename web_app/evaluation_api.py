@@ -0,0 +1,409 @@
+"""
+HTTP service that evaluates the corrosion models for other systems, alongside the Streamlit app.
+
+Endpoints:
+    GET  /api/health                        - liveness check
+    GET  /api/models                        - the models of the catalog, optionally ?process_type=...
+    GET  /api/models/<identifier>           - a model with its parameter schema and default parameters
+    POST /api/models/<identifier>/evaluate  - the material loss curve of one scenario
+    POST /api/models/<identifier>/batch     - the summaries, and optionally curves, of many scenarios
+
+Evaluation requests are JSON objects with the time grid, either as "horizon" in years with optional "steps"
+(defaults to 101) or as a list of "time" points. A single scenario holds its "parameters" by symbol; missing
+parameters are set to their defaults. A batch holds its scenarios either row by row as a list of "scenarios" or
+column by column as "columns" of equally long lists, and "curves": true to include the material loss curves.
+
+Single scenarios are evaluated on a thread pool. Batches are validated as a whole, then evaluated vectorized in chunks on a thread pool and streamed as
+newline-delimited JSON: a first line with the model, the number of scenarios, the time grid and the axis labels,
+followed by one line per scenario with its index, loss at the horizon, mean rate and rate at the horizon.
+Invalid requests are answered with status 400 and unknown models with 404, with the reason in "error".
+
+Usage:
+    python evaluation_api.py --port 8502 --processes 0
+"""
+import sys
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import tornado.netutil
+import tornado.process
+import tornado.web
+from tornado.httpserver import HTTPServer
+from tornado.iostream import StreamClosedError
+
+from catalog import Catalog, get_catalog
+from corwiz_batch import DEFAULT_STEPS, MAX_STEPS, horizon_time_grid, summarize_material_loss
+from models import CorrosionModel, ParameterSchema, decode_json, as_parameter_columns
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is used without it
+    orjson = None
+
+DEFAULT_PORT = 8502
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _to_builtin(value: Any) -> Any:
+    """Converts the NumPy values and ranges found in parameter schemas for the JSON encoder."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, range)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """Encodes JSON, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_to_builtin)
+    return json.dumps(content, default=_to_builtin, separators=(',', ':')).encode('utf-8')
+
+
+def json_values(values: np.ndarray) -> List[Any]:
+    """Returns the values of an array as (nested) lists of floats, with None in place of NaN and infinity."""
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    if finite.all():
+        return values.tolist()
+    return np.where(finite, values, None).tolist()
+
+
+def time_grid(request: Dict[str, Any]) -> np.ndarray:
+    """
+    Returns the time points of an evaluation request, given as a list of "time" points or a "horizon" and "steps".
+
+    Raises:
+        ValueError: If the time grid is missing, not numeric, negative or longer than `MAX_STEPS`.
+    """
+    try:
+        if 'time' in request:
+            time = np.asarray(request['time'], dtype=float).ravel()
+        elif 'horizon' in request:
+            time = horizon_time_grid(request['horizon'], request.get('steps', DEFAULT_STEPS))
+        else:
+            raise ValueError("The request needs a 'horizon' in years or a list of 'time' points.")
+    except TypeError as e:
+        raise ValueError(f"The time grid must be numeric: {str(e)}") from e
+
+    if not 1 <= time.size <= MAX_STEPS:
+        raise ValueError(f"The time grid must have between 1 and {MAX_STEPS} points, got {time.size}.")
+    if not np.all(np.isfinite(time)) or np.any(time < 0):
+        raise ValueError("The time points must be finite and not negative.")
+    return time
+
+
+class EvaluationBatch:
+    """
+    A validated batch of scenarios of one model, evaluated and encoded chunk by chunk.
+
+    Attributes:
+        model (CorrosionModel): The model prototype; parameters without a column are taken from its defaults.
+        columns (Dict[str, np.ndarray]): The validated parameter columns, keyed by symbol.
+        count (int): The number of scenarios.
+        time (np.ndarray): The time points in years.
+        curves (bool): Whether the rows include the material loss curves.
+    """
+
+    def __init__(self, model: CorrosionModel, columns: Dict[str, np.ndarray], count: int, time: np.ndarray,
+                 curves: bool = False):
+        self.model = model
+        self.columns = columns
+        self.count = count
+        self.time = time
+        self.curves = curves
+
+    def header(self) -> Dict[str, Any]:
+        """The first line of the response, with what all rows share."""
+        return {'model': self.model.kadi_identifier, 'count': self.count, 'time': json_values(self.time),
+                'time_label': self.model.TIME_AXIS_LABEL, 'loss_label': self.model.LOSS_AXIS_LABEL}
+
+    def evaluate(self, start: int, stop: int) -> np.ndarray:
+        """Returns the material loss of the scenarios from `start` to `stop` as an array of one row per scenario."""
+        if not self.columns:
+            material_loss = self.model.evaluate_material_loss_batch(None, self.time)
+            return np.broadcast_to(material_loss, (stop - start, self.time.size))
+        chunk = {symbol: column[start:stop] for symbol, column in self.columns.items()}
+        return self.model.evaluate_material_loss_batch(chunk, self.time)
+
+    def encode_rows(self, start: int, stop: int) -> bytes:
+        """Evaluates the scenarios from `start` to `stop` and returns them as newline-delimited JSON."""
+        material_loss = self.evaluate(start, stop)
+        summary = {key: json_values(values) for key, values in summarize_material_loss(material_loss, self.time).items()}
+        curves = json_values(material_loss) if self.curves else None
+
+        lines = []
+        for row, index in enumerate(range(start, stop)):
+            line = {'index': index, **{key: values[row] for key, values in summary.items()}}
+            if curves is not None:
+                line['material_loss'] = curves[row]
+            lines.append(encode_json(line))
+        lines.append(b'')
+        return b'\n'.join(lines)
+
+
+class EvaluationService:
+    """
+    Answers the requests of the evaluation API from the catalog of the app.
+
+    The model prototypes of the catalog are shared with all requests; single evaluations work on a copy of the
+    prototype, and batches pass their parameters as columns, so the prototypes are never modified. The parameter
+    schema and the description of a model are built once per prototype, i.e. again only after its record changed.
+
+    Attributes:
+        chunk_size (int): The number of scenarios of a batch evaluated and streamed at a time.
+        executor (ThreadPoolExecutor): The threads evaluating single scenarios and the chunks of batches.
+    """
+
+    def __init__(self, catalog: Optional[Catalog] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: Optional[int] = None):
+        self._catalog = catalog
+        self.chunk_size = chunk_size
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self._models: Dict[str, Tuple[CorrosionModel, ParameterSchema, bytes]] = {}
+
+    @property
+    def catalog(self) -> Catalog:
+        if self._catalog is not None:
+            self._catalog.refresh()
+            return self._catalog
+        return get_catalog()
+
+    def _model(self, identifier: str) -> Tuple[CorrosionModel, ParameterSchema, bytes]:
+        """
+        Returns the prototype, the parameter schema and the encoded description of a model.
+
+        Raises:
+            KeyError: If the catalog does not list the model.
+        """
+        catalog = self.catalog
+        prototype = catalog.model(identifier)
+        cached = self._models.get(identifier)
+        if cached is None or cached[0] is not prototype:
+            schema = prototype.parameter_schema()
+            entry = catalog.model_entry(identifier)
+            description = encode_json({
+                'identifier': identifier,
+                'title': entry.title,
+                'process_type': entry.process_type,
+                'tags': entry.tags,
+                'time_label': prototype.TIME_AXIS_LABEL,
+                'loss_label': prototype.LOSS_AXIS_LABEL,
+                'parameters': schema.to_list(),
+                'defaults': schema.defaults(),
+            })
+            cached = self._models[identifier] = (prototype, schema, description)
+        return cached
+
+    def list_models(self, process_type: Optional[str] = None) -> bytes:
+        """Returns the encoded list of the models, optionally of one corrosion process type."""
+        catalog = self.catalog
+        entries = catalog.model_entries if process_type is None else catalog.model_entries_of_type(process_type)
+        return encode_json({'models': [{'identifier': entry.identifier, 'title': entry.title,
+                                        'process_type': entry.process_type, 'tags': entry.tags}
+                                       for entry in entries]})
+
+    def describe(self, identifier: str) -> bytes:
+        """Returns the encoded description of a model with its parameter schema and default parameters."""
+        return self._model(identifier)[2]
+
+    def evaluate(self, identifier: str, request: Dict[str, Any]) -> bytes:
+        """
+        Evaluates a single scenario and returns the encoded material loss curve with its summary values.
+
+        Raises:
+            KeyError: If the catalog does not list the model.
+            ValueError: If the parameters or the time grid are invalid.
+        """
+        prototype, schema, _ = self._model(identifier)
+        parameters = request.get('parameters') or {}
+        if not isinstance(parameters, dict):
+            raise ValueError("'parameters' must be an object of parameter values keyed by symbol.")
+        time = time_grid(request)
+
+        model = prototype.copy()
+        model.parameters = schema.resolve(parameters)
+        material_loss = model.evaluate_material_loss_batch(None, time)
+        summary = summarize_material_loss(material_loss, time)
+        return encode_json({
+            'model': identifier,
+            'parameters': model.parameters,
+            'time': json_values(time),
+            'material_loss': json_values(material_loss[0]),
+            **{key: json_values(values)[0] for key, values in summary.items()},
+            'time_label': model.TIME_AXIS_LABEL,
+            'loss_label': model.LOSS_AXIS_LABEL,
+        })
+
+    def batch(self, identifier: str, request: Dict[str, Any]) -> EvaluationBatch:
+        """
+        Validates a batch of scenarios as a whole, before anything is evaluated.
+
+        Raises:
+            KeyError: If the catalog does not list the model.
+            ValueError: If a scenario holds unknown or invalid parameters, or the time grid is invalid.
+        """
+        prototype, _, _ = self._model(identifier)
+        time = time_grid(request)
+
+        if 'scenarios' in request:
+            scenarios = request['scenarios']
+            if not isinstance(scenarios, list) or not all(isinstance(scenario, dict) for scenario in scenarios):
+                raise ValueError("'scenarios' must be a list of objects of parameter values keyed by symbol.")
+            # Parameters missing from a scenario become NaN, which `resolve_columns` replaces by the default
+            columns, _ = as_parameter_columns(pd.DataFrame.from_records(scenarios))
+            count = len(scenarios)
+        elif 'columns' in request:
+            if not isinstance(request['columns'], dict) or not request['columns']:
+                raise ValueError("'columns' must be an object of equally long lists of parameter values keyed by symbol.")
+            columns, count = as_parameter_columns(request['columns'])
+        else:
+            raise ValueError("The request needs a list of 'scenarios' or an object of parameter 'columns'.")
+
+        return EvaluationBatch(prototype, prototype.resolve_columns(columns), count, time, bool(request.get('curves')))
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    """Answers with JSON, and with the reason in "error" if a request fails."""
+
+    def initialize(self, service: EvaluationService):
+        self.service = service
+
+    def set_default_headers(self):
+        self.set_header('Content-Type', 'application/json')
+
+    def write_error(self, status_code: int, **kwargs: Any):
+        error = kwargs.get('exc_info', (None, None, None))[1]
+        if isinstance(error, tornado.web.HTTPError) and error.log_message:
+            message = error.log_message % error.args if error.args else error.log_message
+        else:
+            message = self._reason
+        self.finish(encode_json({'error': message}))
+
+    def json_request(self) -> Dict[str, Any]:
+        """Returns the decoded JSON object of the request body."""
+        try:
+            request = decode_json(self.request.body or b'{}')
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, "Invalid JSON: %s", str(e))
+        if not isinstance(request, dict):
+            raise tornado.web.HTTPError(400, "The request body must be a JSON object.")
+        return request
+
+    def call(self, method, *args: Any) -> Any:
+        """Calls a method of the service, answering unknown models with 404 and invalid requests with 400."""
+        try:
+            return method(*args)
+        except KeyError as e:
+            raise tornado.web.HTTPError(404, "Unknown model: %s", e.args[0] if e.args else '')
+        except (ValueError, TypeError) as e:
+            raise tornado.web.HTTPError(400, "%s", str(e))
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.finish(b'{"status":"ok"}')
+
+
+class ModelsHandler(BaseHandler):
+    def get(self):
+        self.finish(self.call(self.service.list_models, self.get_query_argument('process_type', None)))
+
+
+class ModelHandler(BaseHandler):
+    def get(self, identifier: str):
+        self.finish(self.call(self.service.describe, identifier))
+
+
+class EvaluateHandler(BaseHandler):
+    async def post(self, identifier: str):
+        # Evaluate on the thread pool, so the event loop keeps serving other requests meanwhile
+        request = self.json_request()
+        loop = asyncio.get_running_loop()
+        self.finish(await loop.run_in_executor(self.service.executor, self.call, self.service.evaluate, identifier, request))
+
+
+class BatchHandler(BaseHandler):
+    async def post(self, identifier: str):
+        batch = self.call(self.service.batch, identifier, self.json_request())
+        self.set_header('Content-Type', 'application/x-ndjson')
+        self.write(encode_json(batch.header()) + b'\n')
+
+        loop = asyncio.get_running_loop()
+        chunk_size = self.service.chunk_size
+        chunks = iter(range(0, batch.count, chunk_size))
+
+        def evaluate_next() -> Optional[asyncio.Future]:
+            start = next(chunks, None)
+            if start is None:
+                return None
+            return loop.run_in_executor(self.service.executor, batch.encode_rows, start, min(start + chunk_size, batch.count))
+
+        try:
+            # Evaluate the next chunk while the previous one is sent
+            pending = evaluate_next()
+            while pending is not None:
+                rows = await pending
+                pending = evaluate_next()
+                self.write(rows)
+                await self.flush()
+        except StreamClosedError:
+            return  # The client went away; the remaining chunks are not evaluated
+        self.finish()
+
+
+def make_app(service: Optional[EvaluationService] = None) -> tornado.web.Application:
+    """Returns the Tornado application of the evaluation API."""
+    arguments = {'service': service or EvaluationService()}
+    return tornado.web.Application([
+        (r'/api/health', HealthHandler, arguments),
+        (r'/api/models', ModelsHandler, arguments),
+        (r'/api/models/([^/]+)', ModelHandler, arguments),
+        (r'/api/models/([^/]+)/evaluate', EvaluateHandler, arguments),
+        (r'/api/models/([^/]+)/batch', BatchHandler, arguments),
+    ])
+
+
+async def serve(sockets: List[Any], chunk_size: int, workers: Optional[int]) -> None:
+    """Serves the evaluation API on the bound sockets until the process is stopped."""
+    server = HTTPServer(make_app(EvaluationService(chunk_size=chunk_size, workers=workers)))
+    server.add_sockets(sockets)
+    await asyncio.Event().wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the evaluation API from the command line."""
+    parser = argparse.ArgumentParser(prog='corwiz-api', description='Serve the CorWiz corrosion models over HTTP.')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT, help=f'port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('-a', '--address', default='', help='address to listen on (default: all interfaces)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='number of server processes; 0 starts one per core (default: 1)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of threads per process evaluating requests (default: CPU count plus 4)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'scenarios of a batch evaluated and streamed at a time (default: {DEFAULT_CHUNK_SIZE})')
+    args = parser.parse_args(argv)
+
+    try:
+        sockets = tornado.netutil.bind_sockets(args.port, args.address or None)
+        # Build the catalog before forking, so the server processes start from the same index
+        catalog = get_catalog()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    catalog.last_report.print_warnings()
+    print(f"Serving {len(catalog.model_entries)} models on port {args.port}")
+
+    if args.processes != 1:
+        tornado.process.fork_processes(args.processes)
+    asyncio.run(serve(sockets, args.chunk_size, args.workers))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from kaleido.scopes.plotly import PlotlyScope
+
+FigureLike = Union[go.Figure, dict]
+
+
+class RendererPool:
+    """
+    A pool of warm Kaleido renderers for exporting figures as PNG, SVG or PDF images.
+
+    Every renderer is a Kaleido scope with its own Chromium subprocess, which is started once and then reused
+    for all jobs. Render jobs queue for the next idle renderer, so up to `size` figures are rendered in
+    parallel, instead of one at a time through the single scope of `plotly.io`.
+
+    Attributes:
+        size (int): The number of renderers.
+    """
+
+    def __init__(self, size: Optional[int] = None, warm: bool = True):
+        self.size = size or min(4, os.cpu_count() or 1)
+        self._idle: 'queue.Queue[PlotlyScope]' = queue.Queue()
+        self._renderers: List[PlotlyScope] = []
+        self._lock = threading.Lock()
+        for _ in range(self.size):
+            renderer = self._create_renderer()
+            self._renderers.append(renderer)
+            self._idle.put(renderer)
+        if warm:
+            self.render_many([go.Figure()] * self.size, image_format='svg')
+
+    @staticmethod
+    def _create_renderer() -> PlotlyScope:
+        """Creates a Kaleido scope configured like the one of plotly.io, with the bundled plotly.js."""
+        defaults = pio.kaleido.scope
+        renderer = PlotlyScope(plotlyjs=getattr(defaults, 'plotlyjs', None), mathjax=getattr(defaults, 'mathjax', None))
+        return renderer
+
+    def render(self, figure: FigureLike, image_format: str = 'png', width: Optional[int] = None,
+               height: Optional[int] = None, scale: Optional[float] = None) -> bytes:
+        """
+        Renders a figure as an image on the next idle renderer.
+
+        Args:
+            figure (FigureLike): The figure or its dictionary representation.
+            image_format (str): 'png', 'svg', 'pdf', 'jpeg' or 'webp'. Defaults to 'png'.
+            width (Optional[int]): The image width in pixels. Defaults to the figure's layout width.
+            height (Optional[int]): The image height in pixels. Defaults to the figure's layout height.
+            scale (Optional[float]): The scale factor of the image. Defaults to 1.
+
+        Returns:
+            bytes: The rendered image.
+
+        Raises:
+            ValueError: If the figure cannot be rendered.
+        """
+        figure_dict = figure.to_dict() if isinstance(figure, go.Figure) else figure
+        layout = figure_dict.get('layout', {})
+        renderer = self._idle.get()
+        try:
+            return renderer.transform(figure_dict, format=image_format,
+                                      width=width or layout.get('width'), height=height or layout.get('height'),
+                                      scale=scale)
+        finally:
+            self._idle.put(renderer)
+
+    def render_many(self, figures: Iterable[FigureLike], image_format: str = 'png', width: Optional[int] = None,
+                    height: Optional[int] = None, scale: Optional[float] = None) -> List[bytes]:
+        """Renders many figures on all renderers in parallel and returns the images in the order of the figures."""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda figure: self.render(figure, image_format, width, height, scale), figures))
+
+    def close(self) -> None:
+        """Shuts down the Chromium subprocesses of all renderers."""
+        with self._lock:
+            for renderer in self._renderers:
+                renderer._shutdown_kaleido()
+
+
+_renderer_pool: Optional[RendererPool] = None
+_renderer_pool_lock = threading.Lock()
+
+
+def get_renderer_pool() -> RendererPool:
+    """Returns the renderer pool of this process, starting its renderers on first use."""
+    global _renderer_pool
+    with _renderer_pool_lock:
+        if _renderer_pool is None:
+            _renderer_pool = RendererPool()
+        return _renderer_pool
+
+
+def render_figures(figures: Iterable[FigureLike], image_format: str = 'png', **options) -> List[bytes]:
+    """Renders a batch of figures, e.g. the scenario plots of a report, with the renderer pool of this process."""
+    return get_renderer_pool().render_many(figures, image_format=image_format, **options)
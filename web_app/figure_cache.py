@@ -0,0 +1,125 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import plotly.graph_objects as go
+
+from export_service import get_renderer_pool
+from models import CorrosionModel
+from measurements import Measurement
+
+
+class CachedFigure:
+    """A cached figure with its fingerprint, and its HTML and images, which are rendered on first use."""
+
+    def __init__(self, fingerprint: str, figure: go.Figure):
+        self.fingerprint = fingerprint
+        self.figure = figure
+        self._html: Optional[str] = None
+        self._images: Dict[str, bytes] = {}
+        self._image_lock = threading.Lock()
+
+    @property
+    def html(self) -> str:
+        """The figure as an HTML fragment that loads plotly.js from the CDN."""
+        if self._html is None:
+            self._html = self.figure.to_html(full_html=False, include_plotlyjs='cdn')
+        return self._html
+
+    def has_image(self, image_format: str) -> bool:
+        """Whether the figure has already been rendered in the given format."""
+        return image_format in self._images
+
+    def image(self, image_format: str) -> bytes:
+        """
+        Returns the figure rendered as an image, e.g. in 'png', 'svg' or 'pdf' format.
+
+        Images are rendered on the warm renderer pool of the process on first request and then kept with the
+        figure, so each format is rendered at most once per fingerprint.
+        """
+        with self._image_lock:
+            if image_format not in self._images:
+                self._images[image_format] = get_renderer_pool().render(self.figure, image_format)
+            return self._images[image_format]
+
+    def add_image(self, image_format: str, image: bytes) -> None:
+        """Keeps an image of the figure that was rendered before, e.g. by an entry of the same fingerprint."""
+        with self._image_lock:
+            self._images.setdefault(image_format, image)
+
+
+class FigureCache:
+    """
+    A bounded, thread-safe LRU cache of figures keyed by the fingerprint of their inputs.
+
+    The cache is shared by all sessions of the process, so identical plots are built once. Cached figures
+    are shared and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, CachedFigure]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, fingerprint: str, factory: Callable[[], go.Figure]) -> CachedFigure:
+        """Returns the cached figure of a fingerprint, building it with the factory if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                self._entries.move_to_end(fingerprint)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = CachedFigure(fingerprint, factory())
+        with self._lock:
+            self._entries[fingerprint] = entry
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def find(self, figure: go.Figure) -> Optional[CachedFigure]:
+        """Returns the cache entry holding the given figure object, if any."""
+        with self._lock:
+            return next((entry for entry in self._entries.values() if entry.figure is figure), None)
+
+    def clear(self) -> None:
+        """Drops all cached figures."""
+        with self._lock:
+            self._entries.clear()
+
+
+def model_fingerprint(model: CorrosionModel) -> tuple:
+    """Returns a hashable description of a model and its current parameters."""
+    parameters = tuple(sorted((str(key), repr(value)) for key, value in model.parameters.items()))
+    return type(model).__name__, model.kadi_identifier, parameters
+
+
+def measurement_fingerprint(measurement: Measurement) -> tuple:
+    """Returns a hashable description of a measurement record."""
+    return measurement.kadi_identifier, measurement.json_file_path, str(measurement.last_modified)
+
+
+def plot_fingerprint(models: Iterable[CorrosionModel],
+                     current_model: Optional[CorrosionModel],
+                     measurements: Optional[Iterable[Measurement]],
+                     **options: Any) -> str:
+    """
+    Returns a fingerprint of the inputs of a plot: the models with their parameters, the measurements
+    and all further options such as the time range and the size.
+    """
+    description = (
+        None if current_model is None else model_fingerprint(current_model),
+        tuple(model_fingerprint(model) for model in models),
+        tuple(measurement_fingerprint(measurement) for measurement in measurements or ()),
+        tuple(sorted((key, repr(value)) for key, value in options.items())),
+    )
+    return hashlib.sha256(repr(description).encode('utf-8')).hexdigest()
+
+
+# The figure cache shared by all sessions of this process
+figure_cache = FigureCache()
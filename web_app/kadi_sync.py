@@ -0,0 +1,359 @@
+"""
+Command-line tool that mirrors a Kadi4Mat collection into data/kadi4mat_json and data/tables.
+
+Only records whose `last_modified` changed are exported again, and only files that are missing locally or whose
+size or checksum differ from the record are downloaded. Downloads are checked against the MD5 checksum and the
+size stated by Kadi4Mat before they replace a local file, and are added to the measurement blob store; a file
+whose content is already in the store is restored from it instead of being downloaded again. A record is written
+only after all of its files were downloaded, so the app never sees a record without its data. Files that several
+records name alike but state different contents of are kept side by side in the blob store, and are reported as
+a conflict without one. Transfers run concurrently over one pooled HTTP session.
+
+Records are placed in the directory named by their tags, e.g. a record tagged 'immersion corrosion model' in
+data/kadi4mat_json/immersion_corrosion_models/, or where the mirror already keeps them. Records that were
+removed from the collection are kept locally.
+
+Usage:
+    python kadi_sync.py https://kadi4mat.iam.kit.edu 123 --token <personal access token>
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from models import read_json_records
+from measurements import BlobStore, get_blob_store, md5_checksum
+from models.table_store import APP_DIR
+
+KADI_JSON_DIR = os.path.normpath(os.path.join(APP_DIR, '../data/kadi4mat_json/'))
+TABLE_DIR = os.path.normpath(os.path.join(APP_DIR, '../data/tables/'))
+PAGE_SIZE = 100
+CHUNK_SIZE = 1 << 16
+
+
+class KadiClient:
+    """
+    A minimal client of the Kadi4Mat REST API, with a pooled and retrying HTTP session.
+
+    Attributes:
+        base_url (str): The URL of the Kadi4Mat instance, e.g. 'https://kadi4mat.iam.kit.edu'.
+        timeout (float): The timeout of each request in seconds.
+    """
+
+    def __init__(self, base_url: str, token: Optional[str] = None, pool_size: int = 8, retries: int = 3,
+                 timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({'GET'}))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+
+    def _get(self, path: str, **kwargs) -> requests.Response:
+        response = self.session.get(f"{self.base_url}/api/{path}", timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def collection_records(self, collection_id: int) -> List[Dict[str, Any]]:
+        """Returns the records of a collection, with their id, identifier and last_modified, from all pages."""
+        records, page = [], 1
+        while True:
+            data = self._get(f"collections/{collection_id}/records", params={'page': page, 'per_page': PAGE_SIZE}).json()
+            records.extend(data.get('items', []))
+            if page >= data.get('_pagination', {}).get('total_pages', 1):
+                return records
+            page += 1
+
+    def export_record(self, record_id: int) -> Dict[str, Any]:
+        """Returns the JSON export of a record, including the metadata of its files and its links."""
+        return self._get(f"records/{record_id}/export/json").json()
+
+    def download_file(self, record_id: int, file_id: str, target_path: str, checksum: str, size: int) -> int:
+        """
+        Downloads a file of a record and replaces the target file only if the download matches the checksum and size.
+
+        Returns:
+            int: The number of bytes downloaded.
+
+        Raises:
+            ValueError: If the download does not match the checksum or the size.
+            requests.RequestException: If the download fails.
+        """
+        # A temporary file of its own, so concurrent downloads to the same target never write to the same file
+        descriptor, temporary_path = tempfile.mkstemp(suffix='.part', prefix=f"{os.path.basename(target_path)}.",
+                                                      dir=os.path.dirname(target_path) or None)
+        digest, downloaded = hashlib.md5(), 0
+        try:
+            with open(descriptor, 'wb') as file, \
+                    self._get(f"records/{record_id}/files/{file_id}/download", stream=True) as response:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    digest.update(chunk)
+                    downloaded += len(chunk)
+                    file.write(chunk)
+            if downloaded != size or digest.hexdigest() != checksum:
+                raise ValueError(f"Download of {os.path.basename(target_path)} does not match its record "
+                                 f"({downloaded} bytes, MD5 {digest.hexdigest()}; expected {size} bytes, MD5 {checksum}).")
+            os.replace(temporary_path, target_path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        return downloaded
+
+
+class SyncReport:
+    """
+    The outcome of a mirror sync.
+
+    Attributes:
+        records_checked (int): The number of records in the collection.
+        records_updated (List[str]): The identifiers of the records written.
+        files_checked (int): The number of files of all records.
+        files_downloaded (List[str]): The names of the files downloaded.
+        files_restored (List[str]): The names of the files restored from the blob store instead of downloaded.
+        bytes_downloaded (int): The number of bytes of the files downloaded.
+        errors (List[Tuple[str, str]]): The records or files that failed, with the reason.
+        seconds (float): The wall-clock time of the sync.
+    """
+
+    def __init__(self):
+        self.records_checked = 0
+        self.records_updated: List[str] = []
+        self.files_checked = 0
+        self.files_downloaded: List[str] = []
+        self.files_restored: List[str] = []
+        self.bytes_downloaded = 0
+        self.errors: List[Tuple[str, str]] = []
+        self.seconds = 0.0
+
+    def summary(self) -> str:
+        return (f"Checked {self.records_checked} records and {self.files_checked} files in {self.seconds:.2f} s: "
+                f"updated {len(self.records_updated)} records, downloaded {len(self.files_downloaded)} files "
+                f"({self.bytes_downloaded / 1e6:.1f} MB), restored {len(self.files_restored)} files, {len(self.errors)} errors")
+
+
+def record_directory(record: Dict[str, Any]) -> Optional[str]:
+    """Returns the mirror subdirectory named by the tags of a record, e.g. 'immersion_corrosion_models'."""
+    for tag in record.get('tags', []):
+        words = tag.split()
+        if len(words) == 3 and words[1] == 'corrosion' and words[2] in ('model', 'measurement'):
+            return f"{words[0]}_corrosion_{words[2]}s"
+    return None
+
+
+class MirrorSync:
+    """
+    Mirrors a Kadi4Mat collection into the record and table directories of the app.
+
+    Attributes:
+        client (KadiClient): The client of the Kadi4Mat instance.
+        json_directory (str): The directory of the record subdirectories.
+        table_directory (str): The directory of the data files.
+        workers (int): The number of concurrent transfers.
+        blob_store (Optional[BlobStore]): The store that downloads are added to and restored from, if any.
+    """
+
+    def __init__(self, client: KadiClient, json_directory: str = KADI_JSON_DIR, table_directory: str = TABLE_DIR,
+                 workers: int = 8, blob_store: Optional[BlobStore] = None):
+        self.client = client
+        self.json_directory = json_directory
+        self.table_directory = table_directory
+        self.workers = workers
+        self.blob_store = blob_store
+
+    def _checksum(self, path: str) -> str:
+        return self.blob_store.file_checksum(path) if self.blob_store else md5_checksum(path)
+
+    def local_records(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Returns the path and content of the mirrored records by identifier."""
+        paths = [os.path.join(root, name) for root, _, names in os.walk(self.json_directory)
+                 for name in names if name.endswith('.json')]
+        return {record.data['identifier']: (record.path, record.data) for record in read_json_records(paths)
+                if isinstance(record.data, dict) and record.data.get('identifier')}
+
+    def _file_is_current(self, file: Dict[str, Any], record_changed: bool) -> bool:
+        """Whether the local copy of a file matches its record: present, of the same size and, for changed records, checksum."""
+        path = os.path.join(self.table_directory, file['name'])
+        if not os.path.isfile(path) or os.path.getsize(path) != file['size']:
+            return False
+        return not record_changed or self._checksum(path) == file['checksum']
+
+    def run(self, collection_id: int, dry_run: bool = False) -> SyncReport:
+        """
+        Brings the mirror up to date with a collection.
+
+        Args:
+            collection_id (int): The id of the Kadi4Mat collection.
+            dry_run (bool): Only determine and report what would be updated.
+
+        Returns:
+            SyncReport: The records and files that were updated, and the errors.
+        """
+        report = SyncReport()
+        start = time.perf_counter()
+        local = self.local_records()
+        remote = self.client.collection_records(collection_id)
+        report.records_checked = len(remote)
+
+        changed = [item for item in remote
+                   if item['identifier'] not in local
+                   or local[item['identifier']][1].get('last_modified') != item.get('last_modified')]
+        changed_identifiers = {item['identifier'] for item in changed}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Export the changed records; unchanged records are checked against their local copy
+            exports = dict(zip((item['identifier'] for item in changed),
+                               executor.map(self._export, changed, [report] * len(changed))))
+            records = {item['identifier']: (item['id'], exports.get(item['identifier']) or local[item['identifier']][1])
+                       for item in remote if exports.get(item['identifier']) or item['identifier'] in local}
+
+            # Files shared by several records are downloaded once, and their records depend on that download
+            downloads: Dict[Tuple[str, str], Tuple[str, int, Dict[str, Any]]] = {}
+            dependents: Dict[Tuple[str, str], List[str]] = {}
+            contents: Dict[str, Dict[str, List[str]]] = {}
+            for identifier, (record_id, record) in records.items():
+                for file in record.get('files', []):
+                    report.files_checked += 1
+                    contents.setdefault(file['name'], {}).setdefault(file['checksum'], []).append(identifier)
+                    if not self._file_is_current(file, identifier in changed_identifiers):
+                        key = (file['name'], file['checksum'])
+                        downloads.setdefault(key, (identifier, record_id, file))
+                        dependents.setdefault(key, []).append(identifier)
+
+            if dry_run:
+                report.files_downloaded = [name for name, _ in downloads]
+                report.records_updated = sorted(identifier for identifier in exports if exports[identifier])
+                report.seconds = time.perf_counter() - start
+                return report
+
+            os.makedirs(self.table_directory, exist_ok=True)
+            failed = set()
+
+            # Files of the same name but different content share their path in data/tables. With a blob store they
+            # are downloaded one after another, each into the store under its checksum; otherwise they conflict.
+            groups: Dict[str, List[Tuple[str, str]]] = {}
+            for key in downloads:
+                groups.setdefault(key[0], []).append(key)
+            if self.blob_store is None:
+                for name in [name for name in groups if len(contents[name]) > 1]:
+                    del groups[name]
+                    identifiers = sorted({identifier for owners in contents[name].values() for identifier in owners})
+                    report.errors.append((name, f"The records {', '.join(identifiers)} state different contents of "
+                                                f"this file; a blob store is needed to keep them all."))
+                    failed.update(identifiers)
+
+            results = executor.map(self._download_all, [[downloads[key] for key in keys] for keys in groups.values()],
+                                   [len(contents[name]) > 1 for name in groups])
+            for keys, group_results in zip(list(groups.values()), results):
+                for key, result in zip(keys, group_results):
+                    if result is None:
+                        report.files_restored.append(key[0])
+                    elif isinstance(result, int):
+                        report.files_downloaded.append(key[0])
+                        report.bytes_downloaded += result
+                    else:
+                        report.errors.append((key[0], result))
+                        failed.update(dependents[key])
+
+        # Write the changed records whose files are all in place
+        for identifier, record in exports.items():
+            if record is None or identifier in failed:
+                continue
+            try:
+                self._write_record(record, local.get(identifier, (None,))[0])
+                report.records_updated.append(identifier)
+            except (OSError, ValueError) as e:
+                report.errors.append((identifier, str(e)))
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _export(self, item: Dict[str, Any], report: SyncReport) -> Optional[Dict[str, Any]]:
+        try:
+            return self.client.export_record(item['id'])
+        except (requests.RequestException, ValueError) as e:
+            report.errors.append((item['identifier'], str(e)))
+            return None
+
+    def _download_all(self, downloads: List[Tuple[str, int, Dict[str, Any]]], preserve: bool = False) -> List[Any]:
+        """
+        Downloads files of the same name one after another, and returns their results as `_download` does.
+
+        With `preserve`, the local copy is first added to the blob store, as it may be the content of another
+        record of the same file name.
+        """
+        target_path = os.path.join(self.table_directory, downloads[0][2]['name'])
+        if preserve and os.path.isfile(target_path):
+            try:
+                self.blob_store.add(target_path)
+            except OSError as e:
+                print(f"Warning: Could not add {target_path} to the blob store: {str(e)}")
+        return [self._download(download) for download in downloads]
+
+    def _download(self, download: Tuple[str, int, Dict[str, Any]]) -> Any:
+        """Returns the number of bytes downloaded, None if the file was restored from the blob store, or the error."""
+        _, record_id, file = download
+        target_path = os.path.join(self.table_directory, file['name'])
+        try:
+            if self.blob_store is not None and self.blob_store.has(file['checksum']):
+                self.blob_store.restore(file['checksum'], target_path)
+                return None
+            downloaded = self.client.download_file(record_id, file['id'], target_path, file['checksum'], file['size'])
+            if self.blob_store is not None:
+                self.blob_store.add(target_path, file['checksum'])
+            return downloaded
+        except (requests.RequestException, OSError, ValueError) as e:
+            return str(e)
+
+    def _write_record(self, record: Dict[str, Any], local_path: Optional[str]) -> None:
+        """Writes a record atomically, in place of its local copy or in the directory named by its tags."""
+        if local_path is None:
+            directory = record_directory(record)
+            if directory is None:
+                raise ValueError(f"Record '{record.get('identifier')}' has no corrosion model or measurement tag.")
+            local_path = os.path.join(self.json_directory, directory, f"{record['identifier']}.json")
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        temporary_path = f"{local_path}.{os.getpid()}.part"
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(record, file, indent=2, ensure_ascii=False)
+        os.replace(temporary_path, local_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the mirror sync from the command line."""
+    parser = argparse.ArgumentParser(prog='corwiz-sync', description='Mirror a Kadi4Mat collection into the CorWiz data directory.')
+    parser.add_argument('url', help='URL of the Kadi4Mat instance, e.g. https://kadi4mat.iam.kit.edu')
+    parser.add_argument('collection', type=int, help='id of the collection to mirror')
+    parser.add_argument('-t', '--token', default=os.environ.get('KADI_TOKEN'),
+                        help='personal access token (default: the KADI_TOKEN environment variable)')
+    parser.add_argument('-w', '--workers', type=int, default=8, help='number of concurrent transfers (default: 8)')
+    parser.add_argument('-n', '--dry-run', action='store_true', help='only report what would be updated')
+    args = parser.parse_args(argv)
+
+    try:
+        client = KadiClient(args.url, token=args.token, pool_size=args.workers)
+        report = MirrorSync(client, workers=args.workers, blob_store=get_blob_store()).run(args.collection, dry_run=args.dry_run)
+    except (requests.RequestException, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for name, message in report.errors:
+        print(f"Warning: {name}: {message}", file=sys.stderr)
+    print(("Dry run: " if args.dry_run else "") + report.summary())
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
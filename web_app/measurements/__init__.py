@@ -1 +1,3 @@
-from .measurement import load_measurements_from_directory, Measurement
\ No newline at end of file
+from .measurement import load_measurements_from_directory, Measurement
+from .blob_store import BLOB_DIR, BlobStore, get_blob_store, md5_checksum
+from .series import MeasurementSeries
@@ -0,0 +1,203 @@
+import os
+import shutil
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from models.table_store import APP_DIR
+
+from .file import File
+
+# Directory of the content-addressed measurement files
+BLOB_DIR = os.path.normpath(os.path.join(APP_DIR, '../data/blobs/'))
+
+# Directory of the measurement files by name, as exported from Kadi4Mat
+TABLE_DIR = os.path.normpath(os.path.join(APP_DIR, '../data/tables/'))
+
+
+def md5_checksum(file_path: str) -> str:
+    """Returns the MD5 digest of a file, the checksum Kadi4Mat states for its files."""
+    digest = hashlib.md5()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """
+    A content-addressed store of measurement files, keyed by their MD5 checksum as stated in `File.checksum`.
+
+    Each distinct content is stored once, as data/blobs/<first two hex digits>/<checksum>, and parsed at most once
+    per process: the parsed data of a blob is cached under its checksum, so a dataset shared by several records
+    is parsed once and held in memory once. Files that are not in the store yet are taken from data/tables by
+    name; if their content matches the checksum of the record they are added to the store (as a hard link where
+    possible). A file whose content differs from the checksum of its record is only used, with a warning and under
+    the checksum of its own content, while the store holds no blob of the record's content, so it can never shadow
+    the verified data of a record.
+
+    The parsed data is shared between all measurements and must be treated as read-only.
+    """
+
+    def __init__(self, root: str = BLOB_DIR, table_directory: Optional[str] = TABLE_DIR):
+        self.root = root
+        self.table_directory = table_directory
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._parsed: Dict[Tuple[str, Hashable], Any] = {}
+        self._key_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        self._mismatched: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def blob_path(self, checksum: str) -> str:
+        """Returns the path of the blob of a checksum."""
+        return os.path.join(self.root, checksum[:2], checksum)
+
+    def has(self, checksum: str) -> bool:
+        """Whether the store holds a blob of the checksum."""
+        return os.path.isfile(self.blob_path(checksum))
+
+    def file_checksum(self, file_path: str) -> str:
+        """Returns the MD5 digest of a file, computing it again only if its modification time or size changed."""
+        stat = os.stat(file_path)
+        cached = self._digests.get(file_path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            cached = (stat.st_mtime_ns, stat.st_size, md5_checksum(file_path))
+            with self._lock:
+                self._digests[file_path] = cached
+        return cached[2]
+
+    @staticmethod
+    def _link(source_path: str, target_path: str) -> None:
+        """Places a file at a target path atomically, as a hard link where possible and as a copy otherwise."""
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        temporary_path = f"{target_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(source_path, temporary_path)
+        except OSError:
+            shutil.copyfile(source_path, temporary_path)
+        os.replace(temporary_path, target_path)
+
+    def add(self, file_path: str, checksum: Optional[str] = None) -> str:
+        """
+        Adds a file to the store, unless a blob of the same content exists, and returns its checksum.
+
+        Args:
+            file_path (str): The file to add.
+            checksum (Optional[str]): The expected MD5 checksum. Computed if not given.
+
+        Returns:
+            str: The checksum of the blob.
+
+        Raises:
+            ValueError: If the content of the file does not match the expected checksum.
+        """
+        actual = self.file_checksum(file_path)
+        if checksum is not None and actual != checksum:
+            raise ValueError(f"The content of {file_path} does not match the checksum {checksum}.")
+        target_path = self.blob_path(actual)
+        if not os.path.isfile(target_path):
+            self._link(file_path, target_path)
+        return actual
+
+    def restore(self, checksum: str, target_path: str) -> None:
+        """
+        Places the blob of a checksum at a target path, e.g. to restore a file in data/tables without downloading it.
+
+        Raises:
+            OSError: If the store holds no blob of the checksum or the target cannot be written.
+        """
+        self._link(self.blob_path(checksum), target_path)
+
+    def resolve(self, file: File) -> Optional[Tuple[str, str]]:
+        """
+        Returns the path and content checksum of a measurement file, or None if it is neither stored nor in data/tables.
+
+        The blob of the record's checksum is preferred; a file in data/tables whose content differs from the record
+        is used as it is only if there is no such blob.
+        """
+        if file.checksum and self.has(file.checksum):
+            return self.blob_path(file.checksum), file.checksum
+
+        table_path = None if self.table_directory is None else os.path.join(self.table_directory, file.name)
+        if table_path is None or not os.path.isfile(table_path):
+            print(f"Warning: File {file.name} (checksum {file.checksum}) was not found.")
+            return None
+
+        checksum = self.file_checksum(table_path)
+        if not file.checksum:
+            return table_path, checksum
+        if checksum != file.checksum:
+            with self._lock:
+                warned = self._mismatched.get(table_path) == checksum
+                self._mismatched[table_path] = checksum
+            if not warned:
+                print(f"Warning: The content of {table_path} does not match the checksum {file.checksum} of its "
+                      f"record; using the file as is until the record's content is synced.")
+            return table_path, checksum
+        try:
+            self.add(table_path, checksum)
+            return self.blob_path(checksum), checksum
+        except OSError as e:
+            print(f"Warning: Could not add {file.name} to the blob store: {str(e)}")
+            return table_path, checksum
+
+    def cached(self, checksum: str, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Returns a value derived from a blob, e.g. its parsed arrays, building it once per process.
+
+        Args:
+            checksum (str): The checksum of the blob.
+            key (Hashable): What is derived, e.g. 'parsed' or 'series'.
+            build (Callable[[], Any]): Builds the value; called at most once per checksum and key.
+
+        Returns:
+            Any: The cached value, shared between all callers.
+        """
+        cache_key = (checksum, key)
+        with self._lock:
+            if cache_key in self._parsed:
+                return self._parsed[cache_key]
+            key_lock = self._key_locks.setdefault(cache_key, threading.Lock())
+        with key_lock:
+            if cache_key not in self._parsed:
+                value = build()
+                with self._lock:
+                    self._parsed[cache_key] = value
+            return self._parsed[cache_key]
+
+    def load(self, file: File, parse: Callable[[str], Any]) -> Tuple[Optional[str], Any]:
+        """
+        Returns the content checksum and the parsed data of a measurement file, parsing each content once.
+
+        Args:
+            file (File): The file of a measurement record.
+            parse (Callable[[str], Any]): Parses the file at a path.
+
+        Returns:
+            Tuple[Optional[str], Any]: The content checksum and the parsed data, or (None, None) if the file is missing
+            or does not match its record.
+        """
+        resolved = self.resolve(file)
+        if resolved is None:
+            return None, None
+        path, checksum = resolved
+        return checksum, self.cached(checksum, 'parsed', lambda: parse(path))
+
+    def clear_cache(self) -> None:
+        """Drops the parsed data of all blobs."""
+        with self._lock:
+            self._parsed.clear()
+            self._key_locks.clear()
+
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Returns the blob store of this process, so parsed blobs are shared by all measurements and sessions."""
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            _blob_store = BlobStore()
+        return _blob_store
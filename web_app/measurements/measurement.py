@@ -1,16 +1,28 @@
-import os
-import json
 import csv
-from typing import List, Dict, Any, Optional, Union
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 import numpy as np
+import pandas as pd
 
+from models.record_loader import bulk_load, list_json_files, read_json_record, LoadReport
+from models.units import AXIS_LABELS, base_unit, convert, mg_to_um, normalize_unit
+
+from .blob_store import get_blob_store
 from .creator import Creator
 from .file import File
+from .series import MeasurementSeries
 
 
 class Measurement:
-    """Class representing the details of a measurement extracted from a JSON file."""
+    """
+    Class representing the details of a measurement extracted from a JSON file.
+
+    Only the metadata of the record (title, identifier, parameters, files, ...) is read on construction.
+    The data files are loaded on the first access to `data` and then kept, so listing measurements costs
+    no more than parsing their JSON records. Files are resolved by their checksum through the blob store,
+    which parses each distinct file once for all records sharing it.
+    """
 
     KEY_TITLE = 'title'
     KEY_IDENTIFIER = 'identifier'
@@ -22,7 +34,7 @@ class Measurement:
     KEY_PARAMETERS = 'Parameters'
     KEY_TAGS = 'tags'
     KEY_FILES = 'files'
-    MEASUREMENT_DIR='../data/tables/'
+    KEY_SPECIMEN_AREA = 'Specimen area'
 
     def __init__(self, json_file_path: str):
         self.json_file_path = json_file_path
@@ -31,16 +43,45 @@ class Measurement:
         self.description: str = ''
         self.special_note: Optional[str] = None
         self.parameters: List[Dict[str, Any]] = []  # Parameters as a list of dictionaries
+        self.specimen_area: Optional[float] = None  # Exposed area of the specimens in cm², if the record states it
         self.files: List[File] = []
         self.tags: List[str] = []
         self.created_at: Optional[datetime] = None
         self.creator: Optional[Creator] = None
         self.last_modified: Optional[datetime] = None
         self.record_to: Dict[str, Any] = {}  # Record_to stored as a dictionary
-        self.data: Dict[str, Any] = {}  # Store processed data from valid files
+        self._data: Optional[Dict[str, Any]] = None  # Processed data from valid files, loaded on first access
+        self._series: Optional[List[MeasurementSeries]] = None  # Unit-normalised series, built on first access
+        self._checksums: Dict[str, str] = {}  # Content checksums of the loaded files by file name
+        self._data_lock = threading.RLock()
 
         self._load_and_extract_details()
-        self._process_files()  # Process the files after extraction
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The processed data of the valid files keyed by file name, loaded on first access."""
+        if self._data is None:
+            with self._data_lock:
+                if self._data is None:
+                    self._data = self._process_files()
+        return self._data
+
+    @property
+    def series(self) -> List[MeasurementSeries]:
+        """
+        The weight loss columns of the valid files as immutable series, converted once from the units given in the
+        files to the base units of the models (years, and mg or μm).
+        """
+        if self._series is None:
+            with self._data_lock:
+                if self._series is None:
+                    self._series = self._build_series()
+        return self._series
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the data files have been loaded."""
+        return self._data is not None
 
     def _load_and_extract_details(self) -> None:
         """Loads the JSON file and extracts measurement details."""
@@ -49,11 +90,7 @@ class Measurement:
 
     def _load_json_file(self) -> Dict[str, Any]:
         """Loads a JSON file and returns its content as a dictionary."""
-        try:
-            with open(self.json_file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            raise ValueError(f"Error loading JSON file at {self.json_file_path}: {str(e)}") from e
+        return read_json_record(self.json_file_path)
 
     def _extract_details(self, data: Dict[str, Any]) -> None:
         """Extracts measurement details from a JSON object and sets them as class attributes."""
@@ -73,6 +110,8 @@ class Measurement:
         for extra in data.get(self.KEY_EXTRAS, []):
             if extra.get('key') == self.KEY_PARAMETERS:
                 self.parameters = extra.get('value', [])
+        self.specimen_area = next((float(parameter['value']) for parameter in self.parameters
+                                   if parameter.get('key') == self.KEY_SPECIMEN_AREA and parameter.get('value')), None)
 
         # Extract record_to information from links
         if data.get(self.KEY_LINKS):
@@ -86,53 +125,56 @@ class Measurement:
                         (item['value'] for item in link.get('extras', []) if item.get('key') == 'journalName'), '')
                 }
 
-    def _process_files(self) -> None:
+    def _process_files(self) -> Dict[str, Any]:
         """
-        Processes valid files (those starting with 'Units') and loads the data into self.data.
+        Processes valid files (those starting with 'Units') and returns their data keyed by file name.
+
+        The files are resolved by their checksum in the blob store, which parses each distinct content once per
+        process, so the returned data may be shared with other measurements and must not be modified.
         """
+        data: Dict[str, Any] = {}
+        store = get_blob_store()
         for file in self.files:
             try:
-                # Construct the full file path using the measurement directory and the file name
-                file_path = os.path.join(self.MEASUREMENT_DIR, file.name)
-
-                # Load and process the file
-                file_data = self._load_file(file_path)
+                checksum, file_data = store.load(file, self._load_file)
                 if file_data:
-                    self.data[file.name] = file_data
+                    data[file.name] = file_data
+                    self._checksums[file.name] = checksum
             except Exception as e:
                 print(f"Error processing file {file.name}: {str(e)}")
+        return data
 
     def _load_file(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Loads the file if it starts with 'Units' and processes the data."""
+        """
+        Loads the file if its second row starts with 'Units' and parses the numeric block column by column.
+
+        The header rows are read once; the numeric block is parsed by the C reader of pandas into a single
+        contiguous float64 array with one row per file column, and time and weight losses are views of its rows.
+        """
         try:
             with open(file_path, newline='', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                rows = list(reader)
+                header_rows = list(csv.reader([csvfile.readline(), csvfile.readline()]))
 
                 # Check if the second row starts with 'Units'
-                if len(rows) < 2 or 'Units' not in rows[1][0]:
+                if len(header_rows) < 2 or not header_rows[1] or 'Units' not in header_rows[1][0]:
                     print(f"File {file_path} is not valid (no 'Units' in second row). Skipping.")
                     return None
 
                 # Extract the units and data
-                headers = rows[0]  # First row contains headers like 'time', 'weightloss_NaclX'
-                units = rows[1]  # Second row contains units like 'h', 'mg', etc.
-                data_rows = rows[2:]  # Data starts from the third row
+                headers = header_rows[0]  # First row contains headers like 'time', 'weightloss_NaclX'
+                units = header_rows[1]  # Second row contains units like 'h', 'mg', etc.
 
-                # Process time and weight loss data
-                time = []
-                weight_losses = {header: [] for header in headers[1:]}
-
-                for row in data_rows:
-                    time.append(float(row[0]))  # First column is time
-                    for idx, header in enumerate(headers[1:], start=1):
-                        weight_losses[header].append(float(row[idx]))
+                # Parse the numeric block, which starts from the third row
+                block = pd.read_csv(csvfile, header=None, names=range(len(headers)), dtype=np.float64, engine='c')
+                values = np.ascontiguousarray(block.to_numpy(dtype=np.float64).T)
+                values.setflags(write=False)
 
                 return {
                     "headers": headers,
                     "units": units,
-                    "time": time,
-                    "weight_losses": weight_losses
+                    "values": values,
+                    "time": values[0],
+                    "weight_losses": {header: values[idx] for idx, header in enumerate(headers[1:], start=1)}
                 }
 
         except Exception as e:
@@ -163,49 +205,59 @@ class Measurement:
             for header, weight_loss in value['weight_losses'].items():
                 print(f"    {header}: {weight_loss}")
 
-    def get_measurement_data_for_plot(self) -> List[Dict[str, Any]]:
-        """
-        Returns the data from the valid files in a structure that is compatible with the generate_plot function.
-
-        Each entry in the returned list will contain:
-        - 'name': The name of the weight loss column (e.g., 'weightloss_Nacl0').
-        - 'data': A NumPy array with two columns (time, weight loss).
-        - 'x_axis_label': The x-axis label (assumed to be 'Time [hours]').
-        - 'y_axis_label': The y-axis label (assumed to be 'Mass loss [mg]').
-        """
-        measurements = []
-
-        # If no valid files were processed, return an empty list
-        if not self.data:
-            return measurements
-
-        # Iterate over the processed data from valid files
+    def _build_series(self) -> List[MeasurementSeries]:
+        """Converts the weight loss columns of all valid files into series in the base units of the models."""
+        series = []
+        store = get_blob_store()
         for file_name, file_data in self.data.items():
-            time_values = np.array(file_data['time'])  # Convert time to a NumPy array
+            # The series of a file depend only on its content, so they are shared by all records holding it
+            series.extend(store.cached(self._checksums[file_name], ('series', self.specimen_area),
+                                       lambda: self._build_file_series(file_data, self.specimen_area)))
+        return series
 
-            # For each weight loss column (e.g., weightloss_Nacl0, weightloss_Nacl2, etc.)
-            for header, weight_loss in file_data['weight_losses'].items():
-                weight_loss_values = np.array(weight_loss)  # Convert weight loss values to a NumPy array
-
-                # Combine time and weight loss into a 2D array
-                data_matrix = np.column_stack((time_values, weight_loss_values))
+    @classmethod
+    def _build_file_series(cls, file_data: Dict[str, Any], specimen_area: Optional[float] = None) -> List[MeasurementSeries]:
+        """
+        Converts the weight loss columns of a single file into series in the base units of the models.
 
-                # Create a dictionary entry for this measurement
-                measurements.append({
-                    'name': header,
-                    'data': data_matrix,
-                    'x_axis_label': 'Time [hours]',  # Assuming the time is in hours based on the example file
-                    'y_axis_label': 'Mass loss [mg]'  # Assuming the weight loss is in mg based on the example file
-                })
+        Given the specimen area in cm², mass losses are converted to a thickness loss in μm of steel, so they
+        share the axis of the models that predict a thickness loss.
+        """
+        series = []
+        units = file_data['units']
+        time_values, x_axis_label = cls._to_base_unit(file_data['time'], units[0], 'Time')
+
+        # For each weight loss column (e.g., weightloss_Nacl0, weightloss_Nacl2, etc.)
+        for idx, (header, weight_loss) in enumerate(file_data['weight_losses'].items(), start=1):
+            unit = units[idx] if idx < len(units) else 'mg'
+            weight_loss_values, y_axis_label = cls._to_base_unit(weight_loss, unit, 'Mass loss')
+            if specimen_area and y_axis_label == AXIS_LABELS['mg']:
+                weight_loss_values, y_axis_label = mg_to_um(weight_loss_values, specimen_area), AXIS_LABELS['μm']
+            series.append(MeasurementSeries(header, time_values, weight_loss_values, x_axis_label, y_axis_label))
+        return series
+
+    @staticmethod
+    def _to_base_unit(values: np.ndarray, unit: str, quantity: str) -> Tuple[np.ndarray, str]:
+        """
+        Converts values to the base unit of their dimension and returns them with the matching axis label.
 
-        return measurements
+        Values that are already in the base unit, or in an unknown unit, are returned without copying.
+        """
+        try:
+            factor = float(convert(1.0, unit))
+            label = AXIS_LABELS[base_unit(unit)]
+        except ValueError:
+            return values, f"{quantity} [{normalize_unit(unit)}]"
+        return (values if factor == 1.0 else values * factor), label
 
 
-def load_measurements_from_directory(directory_paths: Union[str, List[str]]) -> List[Measurement]:
-    """Loads all measurements from JSON files in the specified directory or directories.
+def load_measurements_from_directory(directory_paths: Union[str, List[str]], report: Optional[LoadReport] = None) -> List[Measurement]:
+    """Loads all measurements from JSON files in the specified directory or directories, reading the files in parallel.
 
     Args:
         directory_paths (Union[str, List[str]]): A single directory path or a list of directory paths.
+        report (Optional[LoadReport]): A report collecting the failed records and the throughput. If None,
+                                       a warning is printed for each failed record.
 
     Returns:
         List[Measurement]: A list of Measurement instances loaded from the JSON files in the specified directory or directories.
@@ -213,23 +265,8 @@ def load_measurements_from_directory(directory_paths: Union[str, List[str]]) ->
     Raises:
         ValueError: If a directory does not exist or no JSON files are found.
     """
-    if isinstance(directory_paths, str):
-        directory_paths = [directory_paths]  # Convert to a list for uniform processing
-
-    measurements = []
-    for directory_path in directory_paths:
-        if not os.path.isdir(directory_path):
-            raise ValueError(f"The specified directory does not exist: {directory_path}")
-
-        json_files = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if f.endswith('.json')]
-        if not json_files:
-            raise ValueError(f"No JSON files found in the specified directory: {directory_path}")
-
-        for json_file in json_files:
-            try:
-                measurement = Measurement(json_file)
-                measurements.append(measurement)
-            except ValueError as e:
-                print(f"Warning: {e}")
-
-    return measurements
\ No newline at end of file
+    load_report = LoadReport() if report is None else report
+    measurements = bulk_load(list_json_files(directory_paths), lambda path, record: Measurement(path), report=load_report)
+    if report is None:
+        load_report.print_warnings()
+    return measurements
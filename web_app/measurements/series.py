@@ -0,0 +1,125 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class MeasurementSeries:
+    """
+    An immutable series of measured values, in the base units of the models.
+
+    The time (in years) and the loss values are read-only NumPy arrays that are converted once when the series
+    is created. They can be handed to plotting libraries without copying and can never be modified in place,
+    so series may be shared between sessions and reused for every replot.
+
+    Attributes:
+        name (str): The name of the column in the data file (e.g., 'weightloss_Nacl0').
+        time (np.ndarray): The time values in years.
+        loss (np.ndarray): The loss values.
+        x_axis_label (str): The axis label of the time values (e.g., 'Time [years]').
+        y_axis_label (str): The axis label of the loss values (e.g., 'Mass loss [mg]').
+    """
+
+    __slots__ = ('name', 'time', 'loss', 'x_axis_label', 'y_axis_label', '_downsampled')
+
+    def __init__(self, name: str, time: np.ndarray, loss: np.ndarray, x_axis_label: str, y_axis_label: str):
+        time, loss = _read_only(time), _read_only(loss)
+        if time.shape != loss.shape:
+            raise ValueError(f"Time and loss of series '{name}' differ in length: {time.size} and {loss.size}.")
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'time', time)
+        object.__setattr__(self, 'loss', loss)
+        object.__setattr__(self, 'x_axis_label', x_axis_label)
+        object.__setattr__(self, 'y_axis_label', y_axis_label)
+        object.__setattr__(self, '_downsampled', {})
+
+    def __setattr__(self, key, value):
+        raise AttributeError("MeasurementSeries is immutable.")
+
+    def __len__(self) -> int:
+        return self.time.size
+
+    @property
+    def display_name(self) -> str:
+        """A short legend name built from the last two parts of the column name (e.g., '0%Nacl (Exp.)')."""
+        parts = self.name.split('_')
+        return ''.join(parts[-2:]) + " (Exp.)"
+
+    def downsample(self, points: int, x_range: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns a visually faithful subset of at most `points` points, selected by largest-triangle-three-buckets.
+
+        Series with no more points are returned unchanged. The result is cached per number of points, unless it
+        is limited to a zoomed time range, which is selected from the points within the range on every call.
+
+        Args:
+            points (int): The maximum number of points, e.g. the pixel width of the plot.
+            x_range (Optional[Tuple[float, float]]): The visible time range in years. Defaults to None (all).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Read-only time and loss arrays of the selected points.
+        """
+        if x_range is not None:
+            start, stop = np.searchsorted(self.time, x_range[0], 'left'), np.searchsorted(self.time, x_range[1], 'right')
+            time, loss = self.time[start:stop], self.loss[start:stop]
+            if time.size <= points:
+                return time, loss
+            indices = largest_triangle_three_buckets(time, loss, points)
+            return _read_only(time[indices]), _read_only(loss[indices])
+        if len(self) <= points:
+            return self.time, self.loss
+        cached: Dict[int, Tuple[np.ndarray, np.ndarray]] = self._downsampled
+        if points not in cached:
+            indices = largest_triangle_three_buckets(self.time, self.loss, points)
+            cached[points] = (_read_only(self.time[indices]), _read_only(self.loss[indices]))
+        return cached[points]
+
+    def __repr__(self):
+        return f"MeasurementSeries(name={self.name}, points={len(self)}, x={self.x_axis_label}, y={self.y_axis_label})"
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    """Returns a read-only float64 view of an array, copying only if the dtype differs."""
+    array = np.asarray(values, dtype=np.float64).view()
+    array.setflags(write=False)
+    return array
+
+
+def largest_triangle_three_buckets(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Selects points of a series with the largest-triangle-three-buckets algorithm (Steinarsson, 2013).
+
+    The first and last points are kept, and the points in between are split into `points - 2` buckets of
+    equal count. From each bucket the point is kept that spans the largest triangle with the point kept from
+    the previous bucket and the mean of the next bucket, which preserves peaks and the visual shape.
+
+    Args:
+        x (np.ndarray): The x values, sorted in ascending order.
+        y (np.ndarray): The y values.
+        points (int): The number of points to keep, at least 3.
+
+    Returns:
+        np.ndarray: The sorted indices of the kept points.
+    """
+    count = len(x)
+    if points >= count or points < 3:
+        return np.arange(count)
+
+    # Bucket boundaries of the inner points and the mean of each bucket
+    edges = np.linspace(1, count - 1, points - 1).astype(int)
+    sums_x = np.add.reduceat(x[1:count - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:count - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    mean_x = np.append(sums_x / sizes, x[-1])
+    mean_y = np.append(sums_y / sizes, y[-1])
+
+    indices = np.empty(points, dtype=np.intp)
+    indices[0], indices[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Twice the triangle areas, with the next bucket represented by its mean
+        areas = np.abs((x[previous] - mean_x[bucket + 1]) * (y[start:stop] - y[previous]) -
+                       (x[previous] - x[start:stop]) * (mean_y[bucket + 1] - y[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+    return indices
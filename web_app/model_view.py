@@ -1,24 +1,11 @@
 import streamlit as st
-import io
 import pandas as pd
 from models import *
 from measurements import *
 from typing import List
-from plot_view import generate_plot, display_plot_html
-
-# Mapping from identifiers to their respective corrosion model classes
-corrosion_models = {
-    'model_benarie1986': Benarie1986Model,
-    'model_feliu1993': Feliu1993Model,
-    'din-corrosion-protection-model-iso-9223-compliant': ISO9223Model,
-    'model_klinesmith2007': KlineSmith2007Model,
-    'model_ma2010': Ma2010Model,
-    'model_soares1999': Soares1999Model,
-    'model_ali2020': Ali2020Model,
-    'model_garbatov2011': Garbatov2011Model,
-    'model_hicks2012': Hicks2012Model,
-    'model_kovalenko2016': Kovalenko2016Model,
-}
+from plot_view import cached_plot, generate_plot, display_plot_html
+from catalog import get_catalog
+from parameter_view import display_parameters
 
 def display_model_info(model: Model) -> None:
     """Display the model's description and any special notes."""
@@ -26,6 +13,13 @@ def display_model_info(model: Model) -> None:
     if model.special_note:
         st.markdown(f"#### Model Notes:\n{model.special_note}")
 
+def plot_zoom():
+    """Return the time range in years to which the plot is zoomed, or None if the whole duration is shown."""
+    lower, upper = st.session_state.get('plot_zoom', (0, 100))
+    if lower <= 0 and upper >= 100:
+        return None
+    return lower / 100 * st.session_state.time_range, upper / 100 * st.session_state.time_range
+
 def reset_plot():
     """Reset the plot data and regenerate the plot."""
     st.session_state.plot_data = []
@@ -34,49 +28,75 @@ def reset_plot():
         st.session_state.plot_data,
         st.session_state.selected_model,
         st.session_state.time_range,
-        measurements=st.session_state.measurement_data
+        measurements=st.session_state.measurement_data,
+        zoom=plot_zoom()
     )
 
+# Formats offered for plot downloads, with their MIME types
+EXPORT_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml', 'pdf': 'application/pdf'}
+
 def download_plot(key: str):
-    """Provide a download button for the plot as a PNG image."""
-    download_fig = generate_plot(
+    """
+    Provide a download button for the plot as a PNG, SVG or PDF image.
+
+    The image is only rendered when the user asks for it, and is kept with the cached figure, so it is
+    rendered once per figure and format and shared by all download buttons showing the same plot. The session
+    keeps the last image of each button too, so the button stays available if the figure is evicted from the cache.
+    """
+    cached = cached_plot(
         st.session_state.plot_data,
         st.session_state.selected_model,
         st.session_state.time_range,
         width=1920,
         height=1080,
-        measurements=st.session_state.measurement_data
+        measurements=st.session_state.measurement_data,
+        zoom=plot_zoom()
+    )
+    image_format = st.selectbox(
+        "Format", list(EXPORT_FORMATS), format_func=str.upper, key=f"{key}_format", label_visibility="collapsed"
     )
-    buffer = io.BytesIO()
-    download_fig.write_image(buffer, format="png")
-    buffer.seek(0)
+    exported = st.session_state.get(f"{key}_image")
+    if exported is not None and exported[:2] == (cached.fingerprint, image_format):
+        cached.add_image(image_format, exported[2])
+    if not cached.has_image(image_format) and not st.button(f"Export plot as {image_format.upper()}",
+                                                            key=f"{key}_export"):
+        return
+    image = cached.image(image_format)
+    st.session_state[f"{key}_image"] = (cached.fingerprint, image_format, image)
+
     st.download_button(
-        label="Download plot as PNG",
-        data=buffer,
-        file_name="corrosion_plot.png",
-        mime="image/png",
+        label=f"Download plot as {image_format.upper()}",
+        data=image,
+        file_name=f"corrosion_plot.{image_format}",
+        mime=EXPORT_FORMATS[image_format],
         key=key
     )
 
-def display_model_selection_tab(models, model_process_types):
+def get_session_model(catalog, identifier: str) -> CorrosionModel:
+    """Return the session's handle of a model, taking it from the catalog when the model is first selected."""
+    if identifier not in st.session_state.models:
+        st.session_state.models[identifier] = catalog.session_model(identifier)
+    return st.session_state.models[identifier]
+
+def display_model_selection_tab(catalog):
     """Display the Model Selection tab."""
-    corrosion_types = sorted({process_type for _, process_type in model_process_types})
+    corrosion_types = catalog.process_types()
     selected_corrosion_type = st.selectbox('**Corrosion Type**', corrosion_types, key="corrosion_type")
 
-    filtered_models = [
-        model for model, process_type in model_process_types if process_type == selected_corrosion_type
-    ]
-    st.session_state.selected_model = st.selectbox(
-        '**Model**', filtered_models,
-        format_func=lambda model: f"{model.name} ({model.kadi_identifier.split('_')[-1]})",
+    filtered_entries = catalog.model_entries_of_type(selected_corrosion_type)
+    titles = {entry.identifier: entry.title for entry in filtered_entries}
+    selected_identifier = st.selectbox(
+        '**Model**', list(titles),
+        format_func=lambda identifier: f"{titles[identifier]} ({identifier.split('_')[-1]})",
         key="model_select"
     )
+    st.session_state.selected_model = get_session_model(catalog, selected_identifier)
 
     st.number_input(
         'Enter duration [years]:', min_value=1.0, max_value=100.0, step=1.0, key="time_range"
     )
 
-    st.session_state.selected_model.display_parameters()
+    display_parameters(st.session_state.selected_model)
 
     if st.session_state.selected_model.model_coordinates is not None:
         st.map(st.session_state.selected_model.model_coordinates)
@@ -86,17 +106,19 @@ def display_model_selection_tab(models, model_process_types):
         st.session_state.plot_data,
         st.session_state.selected_model,
         st.session_state.time_range,
-        measurements=st.session_state.measurement_data
+        measurements=st.session_state.measurement_data,
+        zoom=plot_zoom()
     )
 
     with add_col:
         if st.button("Add Model to Plot", key="add_model_plot"):
-            st.session_state.plot_data.append(st.session_state.selected_model)
+            st.session_state.plot_data.append(st.session_state.selected_model.copy())
             figure = generate_plot(
                 st.session_state.plot_data,
                 st.session_state.selected_model,
                 st.session_state.time_range,
-                measurements=st.session_state.measurement_data
+                measurements=st.session_state.measurement_data,
+                zoom=plot_zoom()
             )
 
     with reset_col:
@@ -136,7 +158,8 @@ def display_measurement_tab(measurements, figure):
                     st.session_state.plot_data,
                     st.session_state.selected_model,
                     st.session_state.time_range,
-                    measurements=st.session_state.measurement_data
+                    measurements=st.session_state.measurement_data,
+                    zoom=plot_zoom()
                 )
 
         with reset_col:
@@ -145,24 +168,27 @@ def display_measurement_tab(measurements, figure):
 
         with download_col:
             download_plot("measurement_download")
+
+        # The plot is rebuilt for the zoomed range, with the measurements downsampled within it
+        st.slider("Visible time range [% of duration]", 0, 100, (0, 100), step=1, key="plot_zoom")
         return figure
     else:
         return None
 
-def display_wizard_tab(models, figure):
+def display_wizard_tab(model_entries, figure):
     """Display the Wizard tab."""
     material = st.selectbox('Select Material', ['Mild Steel'], key="wiz_material_select")
     has_coating = st.checkbox('Coating Applied', key="coating_checkbox")
 
     if has_coating:
-        available_models = [model for model in models if model.kadi_identifier == 'model_soares1999']
+        available_models = [entry for entry in model_entries if entry.identifier == 'model_soares1999']
     else:
-        available_models = models
+        available_models = model_entries
 
     if available_models:
         model_data = {
-            'Model Name': [model.name for model in available_models],
-            'Identifier': [model.kadi_identifier.split('_')[-1] for model in available_models]
+            'Model Name': [entry.title for entry in available_models],
+            'Identifier': [entry.identifier.split('_')[-1] for entry in available_models]
         }
         model_df = pd.DataFrame(model_data)
         st.markdown("### Available Models:")
@@ -174,12 +200,13 @@ def display_wizard_tab(models, figure):
 
     with add_col:
         if st.button("Add Model to Plot", key="wizard_add_model"):
-            st.session_state.plot_data.append(st.session_state.selected_model)
+            st.session_state.plot_data.append(st.session_state.selected_model.copy())
             figure = generate_plot(
                 st.session_state.plot_data,
                 st.session_state.selected_model,
                 st.session_state.time_range,
-                measurements=st.session_state.measurement_data
+                measurements=st.session_state.measurement_data,
+                zoom=plot_zoom()
             )
 
     with reset_col:
@@ -197,17 +224,15 @@ def display_model_view(page_container: st.container):
     Args:
         page_container (st.container): The Streamlit container in which to display the interface.
     """
-    # Load available corrosion models and measurements from directories
-    model_directories = [
-        '../data/kadi4mat_json/immersion_corrosion_models/',
-        '../data/kadi4mat_json/atmospheric_corrosion_models/'
-    ]
-    models = load_corrosion_models_from_directory(model_directories, corrosion_models)
-
-    measurement_directories = [
-        '../data/kadi4mat_json/immersion_corrosion_measurements/',
-    ]
-    measurements = load_measurements_from_directory(measurement_directories)
+    # Take the models and measurements from the process-wide catalog; each session keeps its own handles of
+    # the models it selected, which are renewed only when the catalog changed
+    catalog = get_catalog()
+    if st.session_state.get('catalog_version') != catalog.version:
+        st.session_state.models = {}
+        st.session_state.catalog_version = catalog.version
+        st.session_state.pop('selected_model', None)
+    model_entries = catalog.model_entries
+    measurements = catalog.measurements
 
     # Initialize session state variables
     if 'plot_data' not in st.session_state:
@@ -215,7 +240,7 @@ def display_model_view(page_container: st.container):
     if 'measurement_data' not in st.session_state:
         st.session_state.measurement_data = []
     if 'selected_model' not in st.session_state:
-        st.session_state.selected_model = models[0]
+        st.session_state.selected_model = get_session_model(catalog, model_entries[0].identifier)
     if 'time_range' not in st.session_state:
         st.session_state.time_range = 1.0
 
@@ -226,7 +251,6 @@ def display_model_view(page_container: st.container):
         st.header("Corrosion Mass Loss Models")
 
         main_container, description_container = st.container(), st.container()
-        model_process_types = get_corrosion_process_type(models)
 
         with main_container:
             plot_area, control_panel = st.columns((6, 4))
@@ -237,13 +261,13 @@ def display_model_view(page_container: st.container):
                 )
 
                 with model_tab:
-                    figure = display_model_selection_tab(models, model_process_types)
+                    figure = display_model_selection_tab(catalog)
 
                 with measurement_tab:
                     figure = display_measurement_tab(measurements, figure)
 
                 with wizard_tab:
-                    figure = display_wizard_tab(models, figure)
+                    figure = display_wizard_tab(model_entries, figure)
 
             with plot_area:
                 if figure:
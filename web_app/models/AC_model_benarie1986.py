@@ -1,8 +1,10 @@
+import textwrap
 import pandas as pd
-import streamlit as st
 import numpy as np
-from typing import Dict
+from typing import Any, Dict, Optional
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table, read_array
 
 
 class Benarie1986Model(CorrosionModel):
@@ -19,44 +21,48 @@ class Benarie1986Model(CorrosionModel):
     COORDINATES_FILE_PATH = '../data/tables/benarie1986_coordinates.csv'
     DEFAULT_CORROSION_SITE_KEY = 'corrosion_site'
 
+    EXTRA_INPUTS = ('A', 'n')
+
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Benarie1986Model')
-        self.parameters: Dict[str, float] = {}
         self.table_2 = self._load_data()
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
     def _load_data(self) -> pd.DataFrame:
         """Loads the relevant data for the model."""
-        return pd.read_csv(self.DATA_FILE_PATH, header=None)
-
-    def display_parameters(self) -> None:
-        """Displays the parameters selection interface for the user."""
-        corrosion_sites = self.table_2.iloc[1:, 0]
-        selected_site = st.selectbox('Select corrosion site:', corrosion_sites)
-        corrosion_site_index = corrosion_sites.tolist().index(selected_site) + 1
-        self.parameters[self.DEFAULT_CORROSION_SITE_KEY] = corrosion_site_index
-
-        # Add the selected location's coordinates to global MODEL_COORDINATES varaible
-        coordinates = pd.read_csv(self.COORDINATES_FILE_PATH, header=None)
+        return read_table(self.DATA_FILE_PATH, header=None)
+
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema; the corrosion site is stored as its row index in table 2."""
+        corrosion_sites = self.table_2.iloc[1:, 0].tolist()
+        return ParameterSchema([
+            Parameter(self.DEFAULT_CORROSION_SITE_KEY, 'Corrosion site',
+                      choices=range(1, len(corrosion_sites) + 1), labels=corrosion_sites,
+                      label='Select corrosion site:'),
+        ])
+
+    @property
+    def model_coordinates(self) -> Optional[pd.DataFrame]:
+        """The coordinates of the selected corrosion site."""
+        coordinates = read_table(self.COORDINATES_FILE_PATH, header=None)
         coordinates = coordinates.iloc[self.parameters[self.DEFAULT_CORROSION_SITE_KEY], 1:]
-        self.model_coordinates = pd.DataFrame({
+        return pd.DataFrame({
             'lat': [float(coordinates.iloc[0])],
             'lon': [float(coordinates.iloc[1])]
         })
-        self._display_site_info(corrosion_site_index)
 
-    def _display_site_info(self, corrosion_site: int) -> None:
-        """Displays detailed information about the selected corrosion site."""
-        site_info = self.table_2.iloc[corrosion_site, :5]
+    def parameter_notes(self) -> str:
+        """Returns detailed information about the selected corrosion site."""
+        site_info = self.table_2.iloc[self.parameters[self.DEFAULT_CORROSION_SITE_KEY], :5]
         site_name, weight_loss, exponent, so2_cl_deposits, ph_value = site_info
 
-        st.markdown(f"### Selected Site: **{site_name}**")
-        st.markdown(
+        return f"### Selected Site: **{site_name}**\n" + textwrap.dedent(
             f"""
             The following parameters have been selected for the site **{site_name}**. These parameters are used in the corrosion model to predict the material loss over time.
 
             **Weight Loss per Wetness Year ($A$):**
-            - The rate of material loss due to corrosion, expressed in micrometers per year (\u03BCm/year).  
-            - **Value:** {weight_loss} \u03BCm/year
+            - The rate of material loss due to corrosion, expressed in micrometers per year (μm/year).
+            - **Value:** {weight_loss} μm/year
 
             **Exponent ($b$):**
             - The exponent used in the corrosion rate equation, which modifies the time dependency of the corrosion process.
@@ -72,14 +78,15 @@ class Benarie1986Model(CorrosionModel):
             """
         )
 
-    def evaluate_material_loss(self, time: float) -> np.ndarray:
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """
-        Calculates and returns the material loss over time for the selected corrosion site.
+        Calculates the material loss over time for the selected corrosion sites.
 
-        This method also retrieves the necessary parameters (corrosion speed and exponent)
-        for the calculation based on the selected site.
+        The corrosion speed and exponent of each site are looked up from table 2 by the site index,
+        unless they are given directly as 'A' and 'n', e.g. to propagate their uncertainty.
         """
-        site_index = self.parameters[self.DEFAULT_CORROSION_SITE_KEY]
-        A = float(self.table_2.iloc[site_index, 1])
-        n = float(self.table_2.iloc[site_index, 2])
-        return A * time ** n, "Time [years]", "Mass loss [μm]"
+        site_coefficients = read_array(self.DATA_FILE_PATH, rows=slice(1, None), columns=slice(1, 3), header=None)
+        site_index = parameters[self.DEFAULT_CORROSION_SITE_KEY].astype(int) - 1
+        A = parameters['A'].astype(float) if 'A' in parameters else site_coefficients[site_index, 0]
+        n = parameters['n'].astype(float) if 'n' in parameters else site_coefficients[site_index, 1]
+        return A * time ** n
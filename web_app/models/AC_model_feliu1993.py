@@ -1,8 +1,11 @@
+import textwrap
 import pandas as pd
-import streamlit as st
 import numpy as np
-from typing import Dict, Tuple
+from typing import Any, Dict, Tuple
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table, read_array
+from .distributions import Distribution, Normal
 
 class Feliu1993Model(CorrosionModel):
     """
@@ -18,37 +21,44 @@ class Feliu1993Model(CorrosionModel):
     DATA_FILE_PATH_2 = '../data/tables/feliu1993_table_2.csv'
     DATA_FILE_PATH_4 = '../data/tables/feliu1993_table_4.csv'
 
+    EXTRA_INPUTS = ('exponent',)
+
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Feliu1993Model')
-        self.parameters: Dict[str, float] = {}
         self.table_2, self.table_4 = self._load_data()
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
     def _load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Loads the relevant data tables for the Feliu1993 model."""
-        table_2 = pd.read_csv(self.DATA_FILE_PATH_2, header=None)
-        table_4 = pd.read_csv(self.DATA_FILE_PATH_4, header=None)
+        table_2 = read_table(self.DATA_FILE_PATH_2, header=None)
+        table_4 = read_table(self.DATA_FILE_PATH_4, header=None)
         return table_2, table_4
 
-    def display_parameters(self) -> None:
-        """Displays the parameters selection interface for the user."""
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema; the atmosphere is stored as its index, the last one being manual input."""
         atmosphere_types = self.table_4.iloc[0, 1:].tolist()
         atmosphere_types.append("Enter Cl^- and SO_2 pollution annual averages")
-        atmosphere = st.selectbox('Select Atmosphere:', atmosphere_types)
-
-        self.parameters.update({
-            'Binary Interaction': st.selectbox('Use Binary Interaction?', [True, False]),
-            'Atmosphere': atmosphere_types.index(atmosphere),
-            'Chloride pollution annual average': float(
-                st.text_input(r"$Cl^-$ - Chloride pollution annual average  $[mg Cl^{-} dm^{-2} d^{-1}]$",
-                              str(self.table_2.iloc[7, 2]))),
-            'SO2 pollution annual average': float(
-                st.text_input(r"$SO_2$ - SO2 pollution annual average  $[mg SO_2 dm^{-2} d^{-1}]$",
-                              str(self.table_2.iloc[7, 2]))),
-            'Temperature': float(st.text_input(r"$T$ - Temperature [°C]", str(self.table_2.iloc[6, 2]))),
-            'Wetness time': float(st.text_input(r"$T_w$ - Wetness time [annual fraction]", str(self.table_2.iloc[4, 2])))
-        })
-
-        st.markdown(
+
+        return ParameterSchema([
+            Parameter('Atmosphere', 'Atmosphere', choices=range(len(atmosphere_types)), labels=atmosphere_types,
+                      label='Select Atmosphere:'),
+            Parameter('Binary Interaction', 'Binary interaction', choices=[True, False],
+                      label='Use Binary Interaction?'),
+            Parameter('Chloride pollution annual average', 'Chloride pollution annual average', 'mg Cl⁻/(dm²⋅d)',
+                      default=self.table_2.iloc[7, 2],
+                      label=r"$Cl^-$ - Chloride pollution annual average  $[mg Cl^{-} dm^{-2} d^{-1}]$"),
+            Parameter('SO2 pollution annual average', 'SO₂ pollution annual average', 'mg SO₂/(dm²⋅d)',
+                      default=self.table_2.iloc[7, 2],
+                      label=r"$SO_2$ - SO2 pollution annual average  $[mg SO_2 dm^{-2} d^{-1}]$"),
+            Parameter('Temperature', 'Temperature', '°C', default=self.table_2.iloc[6, 2],
+                      label=r"$T$ - Temperature [°C]"),
+            Parameter('Wetness time', 'Wetness time', 'annual fraction', default=self.table_2.iloc[4, 2],
+                      label=r"$T_w$ - Wetness time [annual fraction]"),
+        ])
+
+    def parameter_notes(self) -> str:
+        """Returns the model equations."""
+        return textwrap.dedent(
             r"""
             **Annual corrosion, $A [\mu m]$:**
             - With Binary Interaction: $A = 132.4 \cdot Cl^- \cdot (1 + 0.038 \cdot T - 1.96 \cdot T_w - 0.53 \cdot SO_2 + 74.6 \cdot T_w \cdot (1 + 1.07 \cdot SO_2) - 6.3)$
@@ -59,35 +69,60 @@ class Feliu1993Model(CorrosionModel):
             """
         )
 
-    def evaluate_material_loss(self, time: float) -> float:
-        """Calculates and returns the material loss over time for the selected atmospheric condition."""
+    def parameter_uncertainty(self) -> Dict[str, Distribution]:
+        """
+        Returns normal distributions around the current inputs with the standard deviations and the smallest and
+        largest values of table 2, and around the tabulated exponent with the standard deviation of table 4.
+        """
+        rows = {
+            'Chloride pollution annual average': 7,
+            'SO2 pollution annual average': 8,
+            'Temperature': 6,
+            'Wetness time': 4,
+        }
+        distributions: Dict[str, Distribution] = {}
+        for symbol, row in rows.items():
+            value = float(self.parameters[symbol])
+            sd, smallest, largest = self.table_2.iloc[row, 3:6].astype(float)
+            distributions[symbol] = Normal(value, sd, min(smallest, value), max(largest, value))
+
+        atmosphere = self.parameters['Atmosphere']
+        exponents = read_array(self.DATA_FILE_PATH_4, rows=slice(1, 3), columns=slice(1, 4), header=None)
+        if atmosphere < exponents.shape[1]:
+            distributions['exponent'] = Normal(exponents[0, atmosphere], exponents[1, atmosphere], lower=0.0)
+        return distributions
+
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
+        """Calculates the material loss over time for the selected atmospheric conditions."""
+        chloride = parameters['Chloride pollution annual average']
+        so2 = parameters['SO2 pollution annual average']
+        temperature = parameters['Temperature']
+        wetness_time = parameters['Wetness time']
+
         # Calculate the annual corrosion
-        if self.parameters['Binary Interaction']:
-            annual_corrosion = (132.4 * self.parameters['Chloride pollution annual average'] *
-                                (1 + 0.038 * self.parameters['Temperature'] -
-                                 1.96 * self.parameters['Wetness time'] -
-                                 0.53 * self.parameters['SO2 pollution annual average'] +
-                                 74.6 * self.parameters['Wetness time'] *
-                                 (1 + 1.07 * self.parameters['SO2 pollution annual average']) -
-                                 6.3))
-        else:
-            annual_corrosion = (33.0 +
-                                57.4 * self.parameters['Chloride pollution annual average'] +
-                                26.6 * self.parameters['SO2 pollution annual average'])
-
-        # Determine the exponent
-        if self.parameters['Atmosphere'] == 0:
-            exponent = float(self.table_4.iloc[1, 1])
-        elif self.parameters['Atmosphere'] == 1:
-            exponent = float(self.table_4.iloc[1, 2])
-        elif self.parameters['Atmosphere'] == 2:
-            exponent = float(self.table_4.iloc[1, 3])
-        else:
-            exponent = (0.570 +
-                        0.0057 * self.parameters['Chloride pollution annual average'] * self.parameters['Temperature'] +
-                        7.7e-4 * self.parameters['Wetness time'] * 365 -
-                        1.7e-3 * annual_corrosion)
-
-        # Calculate the material loss over time
-        material_loss = annual_corrosion * np.power(time, exponent)
-        return material_loss, "Time [years]", "Mass loss [μm]"
+        annual_corrosion = np.where(
+            parameters['Binary Interaction'].astype(bool),
+            132.4 * chloride * (1 + 0.038 * temperature - 1.96 * wetness_time - 0.53 * so2 +
+                                74.6 * wetness_time * (1 + 1.07 * so2) - 6.3),
+            33.0 + 57.4 * chloride + 26.6 * so2
+        )
+
+        # Determine the exponent, tabulated for the first three atmospheres and derived otherwise,
+        # unless it is given directly; NaN selects the tabulated or derived exponent
+        tabulated_exponents = read_array(self.DATA_FILE_PATH_4, rows=slice(1, 2), columns=slice(1, 4), header=None)[0]
+        atmosphere = parameters['Atmosphere'].astype(int)
+        derived_exponent = (0.570 + 0.0057 * chloride * temperature + 7.7e-4 * wetness_time * 365 -
+                            1.7e-3 * annual_corrosion)
+        exponent = np.where(
+            (atmosphere >= 0) & (atmosphere < tabulated_exponents.size),
+            tabulated_exponents[np.clip(atmosphere, 0, tabulated_exponents.size - 1)],
+            derived_exponent
+        )
+        if 'exponent' in parameters:
+            given_exponent = parameters['exponent'].astype(float)
+            exponent = np.where(np.isnan(given_exponent), exponent, given_exponent)
+
+        # Calculate the material loss over time; there is no loss before any exposure, also for the negative
+        # exponents derived for very corrosive atmospheres, for which the power law diverges at t = 0
+        exposed = time > 0
+        return np.where(exposed, annual_corrosion * np.power(np.where(exposed, time, 1.0), exponent), 0.0)
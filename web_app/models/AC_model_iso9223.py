@@ -1,9 +1,11 @@
 import pandas as pd
-import streamlit as st
 import numpy as np
-from typing import Dict, Tuple, Optional
-from scipy.interpolate import interp1d
+from typing import Any, Dict, Tuple
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table, read_array
+from .distributions import Distribution, Uniform
+from .units import PiecewiseLinearConversion
 
 class ISO9223Model(CorrosionModel):
     """
@@ -21,113 +23,148 @@ class ISO9223Model(CorrosionModel):
         'table_9224_3': '../data/tables/din-en-iso-92232012-05_9224_table_3.csv'
     }
 
+    CORROSION_SPEED_OPTIONS = {'lower': 'Use lower limit', 'upper': 'Use upper limit', 'average': 'Use average'}
+    EXPONENT_TYPES = {
+        'tabulated': 'Use DIN recommended time exponents measured from the ISO CORRAG program',
+        'manual': 'Enter manually'
+    }
+
+    # Corrosion speeds of carbon steel in g/(m²⋅a) and μm/a at the limits of the corrosivity categories in table 2.
+    # The μm/a values are rounded by the standard (1500 g/(m²⋅a) is listed as 200 μm/a, where the density of steel
+    # gives 191 μm/a), and are interpolated so that the category limits match the standard exactly.
+    GRAMS_TO_UM = PiecewiseLinearConversion([10, 200, 400, 650, 1500, 5500], [1.3, 25, 50, 80, 200, 700])
+    UM_TO_GRAMS = GRAMS_TO_UM.inverse()
+
+    EXTRA_INPUTS = ('corrosion_speed',)
+
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='ISO9223Model')
-        self.parameters: Dict[str, float] = {}
-        self.use_tabulated_exponent: bool = False  # Track whether to use tabulated exponents
         self.table_2, self.table_3, self.table_b3, self.table_b4, self.table_c1, self.table_9224_3 = self._load_data()
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
     def _load_data(self) -> Tuple[pd.DataFrame, ...]:
         """Loads and returns all relevant data tables for the ISO 9224 model."""
-        return tuple(pd.read_csv(self.DATA_FILE_PATHS[key], header=None) for key in self.DATA_FILE_PATHS)
+        return tuple(read_table(self.DATA_FILE_PATHS[key], header=None) for key in self.DATA_FILE_PATHS)
 
-    def display_parameters(self) -> None:
-        """Displays the parameter selection interface for the user."""
-        with st.expander("Description Corrosion Type"):
-            st.table(self.table_c1)
+    def parameter_schema(self) -> ParameterSchema:
+        """
+        Returns the parameter schema.
 
+        The corrosion type is stored as the index of the corrosivity category; the index after the last category
+        selects the dose-response functions with manually entered environmental parameters.
+        """
         corrosion_types = self.table_c1.iloc[1:, 1].tolist()
         corrosion_types.append("Manually enter Cl⁻ and SO₂ annual deposits, relative humidity, and temperature")
-
-        corrosion_type = st.selectbox('Select corrosion type:', corrosion_types)
-        corrosion_type_index = corrosion_types.index(corrosion_type)
-
-        if corrosion_type_index < 6:
-            corrosion_speed_options = ['Use lower limit', 'Use upper limit', 'Use average']
-            selected_option = st.selectbox('Select corrosion speed option:', corrosion_speed_options)
-
-            lower_limit = float(self.table_2.iloc[corrosion_type_index + 1, 2])
-            upper_limit = float(self.table_2.iloc[corrosion_type_index + 1, 3])
-
-            if selected_option == 'Use lower limit':
-                self.parameters['corrosion_speed'] = lower_limit
-            elif selected_option == 'Use upper limit':
-                self.parameters['corrosion_speed'] = upper_limit
-            else:
-                self.parameters['corrosion_speed'] = (lower_limit + upper_limit) / 2
-
-            st.write(f"Corrosion speed selected: {self.parameters['corrosion_speed']:.2f} μm/year")
-        else:
-            with st.expander("Typical Values:"):
-                st.table(self.table_3)
-                st.write("### Parameters used in deriving the dose-response functions")
-                st.table(self.table_b3)
-                st.write("### Classification of contamination by sulfur-containing substances, represented by SO₂ and Cl⁻")
-                st.table(self.table_b4)
-
-            limits = {
-                'T': {'desc': 'Temperature', 'lower': -17.1, 'upper': 28.7, 'unit': '°C'},
-                'RH': {'desc': 'Relative Humidity', 'lower': 34, 'upper': 93, 'unit': '%'},
-                'Pd': {'desc': 'SO₂-Deposit', 'lower': 0.7, 'upper': 150.4, 'unit': 'mg/(m²⋅d)'},
-                'Sd': {'desc': 'Cl⁻-Deposit', 'lower': 0.4, 'upper': 760.5, 'unit': 'mg/(m²⋅d)'}
-            }
-
-            for symbol, limit in limits.items():
-                value = st.number_input(f"Enter {limit['desc']} ({symbol}) [{limit['unit']}]:",
-                                        value=limit['lower'], min_value=limit['lower'], max_value=limit['upper'])
-                self.parameters[symbol] = float(value)
-
-        # Determine whether to use tabulated exponents or manual input
-        exponent_types = ['Use DIN recommended time exponents measured from the ISO CORRAG program', 'Enter manually']
-        selected_type = st.selectbox('Please select the time exponent', exponent_types)
-
-        if selected_type == exponent_types[0]:
-            self.use_tabulated_exponent = True
-        else:
-            self.use_tabulated_exponent = False
-            self.parameters['exponent'] = st.number_input('Enter exponent:', key="manual_exponent")
-
-    def _determine_tabulated_exponent(self, time: float) -> float:
-        """Determines the tabulated exponent based on the provided time."""
-        years = self.table_9224_3.iloc[6:, 0].astype(int).values  # 'table_9224_3'
-        exponents = self.table_9224_3.iloc[6:, 1].astype(float).values
-
-        max_time = np.max(time) if isinstance(time, np.ndarray) else time
-
-        if max_time in years:
-            return float(exponents[years == max_time][0])
+        categories = list(range(len(corrosion_types) - 1))
+        manual = [len(corrosion_types) - 1]
+
+        limits = {
+            'T': {'desc': 'Temperature', 'lower': -17.1, 'upper': 28.7, 'unit': '°C'},
+            'RH': {'desc': 'Relative Humidity', 'lower': 34, 'upper': 93, 'unit': '%'},
+            'Pd': {'desc': 'SO₂-Deposit', 'lower': 0.7, 'upper': 150.4, 'unit': 'mg/(m²⋅d)'},
+            'Sd': {'desc': 'Cl⁻-Deposit', 'lower': 0.4, 'upper': 760.5, 'unit': 'mg/(m²⋅d)'}
+        }
+
+        return ParameterSchema([
+            Parameter('corrosion_type', 'Corrosion type', choices=range(len(corrosion_types)), labels=corrosion_types,
+                      label='Select corrosion type:'),
+            Parameter('corrosion_speed_option', 'Corrosion speed option',
+                      choices=self.CORROSION_SPEED_OPTIONS, labels=self.CORROSION_SPEED_OPTIONS.values(),
+                      when={'corrosion_type': categories}, label='Select corrosion speed option:'),
+            *[Parameter(symbol, limit['desc'], limit['unit'], lower=limit['lower'], upper=limit['upper'],
+                        when={'corrosion_type': manual})
+              for symbol, limit in limits.items()],
+            Parameter('exponent_type', 'Time exponent', choices=self.EXPONENT_TYPES, labels=self.EXPONENT_TYPES.values(),
+                      label='Please select the time exponent'),
+            Parameter('exponent', 'Time exponent', when={'exponent_type': ['manual']}, label='Enter exponent:'),
+        ])
+
+    def reference_tables(self) -> Dict[str, pd.DataFrame]:
+        """Returns the corrosivity categories and the parameters used in deriving the dose-response functions."""
+        return {
+            'Description Corrosion Type': self.table_c1,
+            'Typical Values': self.table_3,
+            'Parameters used in deriving the dose-response functions': self.table_b3,
+            'Classification of contamination by sulfur-containing substances, represented by SO₂ and Cl⁻': self.table_b4,
+        }
+
+    def parameter_notes(self) -> str:
+        """Returns the selected corrosion speed for the corrosivity categories."""
+        if 'corrosion_speed_option' not in self.parameters:
+            return ''
+        corrosion_speed = self._category_corrosion_speed(np.asarray(self.parameters['corrosion_type']),
+                                                         np.asarray(self.parameters['corrosion_speed_option']))
+        return f"Corrosion speed selected: {float(corrosion_speed):.2f} g/(m²⋅a)"
+
+    def parameter_uncertainty(self) -> Dict[str, Distribution]:
+        """
+        Returns a uniform distribution of the corrosion speed between the limits of the selected corrosivity
+        category in table 2. The dose-response functions come without documented uncertainties.
+        """
+        if 'corrosion_speed_option' not in self.parameters:
+            return {}
+        speed_limits = read_array(self.DATA_FILE_PATHS['table_2'], rows=slice(1, None), columns=slice(2, 4), header=None)
+        lower_limit, upper_limit = speed_limits[self.parameters['corrosion_type']]
+        return {'corrosion_speed': Uniform(lower_limit, upper_limit)}
+
+    def _category_corrosion_speed(self, corrosion_type: np.ndarray, option: np.ndarray) -> np.ndarray:
+        """Returns the corrosion speed of the corrosivity categories in g/(m²⋅a), NaN for manual input."""
+        speed_limits = read_array(self.DATA_FILE_PATHS['table_2'], rows=slice(1, None), columns=slice(2, 4), header=None)
+        corrosion_type = corrosion_type.astype(int)
+        index = np.clip(corrosion_type, 0, len(speed_limits) - 1)
+        lower_limit, upper_limit = speed_limits[index, 0], speed_limits[index, 1]
+
+        corrosion_speed = np.where(option == 'lower', lower_limit,
+                                   np.where(option == 'upper', upper_limit, (lower_limit + upper_limit) / 2))
+        return np.where(corrosion_type < len(speed_limits), corrosion_speed, np.nan)
+
+    def _determine_tabulated_exponent(self, time: np.ndarray) -> np.ndarray:
+        """
+        Determines the tabulated exponent at each of the provided time points.
+
+        The years and exponents of the ISO 9224 table are compiled once into a read-only float array by the table
+        store, and interpolated linearly between the tabulated years; times outside the table take the nearest value.
+        """
+        exponent_table = read_array(self.DATA_FILE_PATHS['table_9224_3'], rows=slice(6, None), columns=slice(0, 2),
+                                    header=None)
+        return np.interp(time, exponent_table[:, 0], exponent_table[:, 1])
+
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
+        """
+        Calculates the material loss over time based on the provided parameters.
+
+        Parameter sets of a corrosivity category use its corrosion speed, all others use the dose-response functions.
+        A 'corrosion_speed' given directly in g/(m²⋅a) takes precedence over the category; NaN selects the
+        dose-response functions.
+        """
+        if 'corrosion_speed' in parameters:
+            corrosion_speed = parameters['corrosion_speed'].astype(float)
         else:
-            return float(np.interp(max_time, years, exponents))
-
-    def evaluate_material_loss(self, time: float) -> float:
-        """Calculates and returns the material loss over time based on the provided parameters."""
-
-        # Re-determine the exponent if using tabulated values and the time has changed
-        if self.use_tabulated_exponent:
-            self.parameters['exponent'] = self._determine_tabulated_exponent(time)
+            corrosion_speed = self._category_corrosion_speed(parameters['corrosion_type'],
+                                                             parameters.get('corrosion_speed_option', np.asarray('average')))
+        use_category = ~np.isnan(corrosion_speed)
 
-        if 'corrosion_speed' in self.parameters:
-            corrosion_speed = self.grams_to_um_map(self.parameters['corrosion_speed'])
-            material_loss = time*corrosion_speed
+        if np.all(use_category):
+            corrosion_speed = self.grams_to_um_map(corrosion_speed)
         else:
-            if self.parameters['T'] <= 10:
-                temperature_factor = 0.15 * (self.parameters['T'] - 10)
-            else:
-                temperature_factor = -0.054 * (self.parameters['T'] - 10)
-
-            corrosion_speed = (
-                1.77 * self.parameters['Pd'] ** 0.52 * np.exp(0.02 * self.parameters['RH'] + temperature_factor) +
-                0.102 * self.parameters['Sd'] ** 0.62 * np.exp(0.033 * self.parameters['RH'] + 0.04 * self.parameters['T'])
+            temperature = parameters['T']
+            temperature_factor = np.where(temperature <= 10, 0.15 * (temperature - 10), -0.054 * (temperature - 10))
+            dose_response_speed = (
+                1.77 * parameters['Pd'] ** 0.52 * np.exp(0.02 * parameters['RH'] + temperature_factor) +
+                0.102 * parameters['Sd'] ** 0.62 * np.exp(0.033 * parameters['RH'] + 0.04 * temperature)
             )
+            corrosion_speed = np.where(use_category, self.grams_to_um_map(np.nan_to_num(corrosion_speed)), dose_response_speed)
 
-        return self.parameters['exponent'] * corrosion_speed * time ** (self.parameters['exponent'] - 1), "Time [years]", "Mass loss [μm]"
+        # Use the tabulated exponent of each time point unless the exponent was entered manually
+        exponent = np.where(parameters['exponent_type'] == 'tabulated',
+                            self._determine_tabulated_exponent(time),
+                            parameters.get('exponent', np.asarray(np.nan)).astype(float))
+        return exponent * corrosion_speed * time ** (exponent - 1)
 
-    def grams_to_um_map(self, corrosion_speed: float) -> float:
-        """Maps corrosion speed from g/(m²⋅a) to μm/a."""
-        g_to_um_mapping = interp1d([10, 200, 400, 650, 1500, 500], [1.3, 25, 50, 80, 200, 700], kind='linear', fill_value='extrapolate')
-        return g_to_um_mapping(corrosion_speed)
+    def grams_to_um_map(self, corrosion_speed: np.ndarray) -> np.ndarray:
+        """Maps corrosion speed from g/(m²⋅a) to μm/a along the category limits of table 2."""
+        return self.GRAMS_TO_UM(corrosion_speed)
 
-    def um_to_grams_map(self, corrosion_speed: float) -> float:
+    def um_to_grams_map(self, corrosion_speed: np.ndarray) -> np.ndarray:
         """Maps corrosion speed from μm/a to g/(m²⋅a)."""
-        um_to_g_mapping = interp1d([1.3, 25, 50, 80, 200, 700], [10, 200, 400, 650, 1500, 500], kind='linear', fill_value='extrapolate')
-        return um_to_g_mapping(corrosion_speed)
+        return self.UM_TO_GRAMS(corrosion_speed)
@@ -1,8 +1,8 @@
-import streamlit as st
-import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Any, Dict
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table, read_array
 
 class KlineSmith2007Model(CorrosionModel):
     """
@@ -19,21 +19,13 @@ class KlineSmith2007Model(CorrosionModel):
 
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='KlineSmith2007Model')
-        self.specimen_type = None
-        self.parameters = {}
-        self.coefficients = {}
+        self.table_2 = read_table(self.DATA_FILE_PATH)
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
-    def display_parameters(self) -> None:
-        """Prompts the user to input values for all parameters within defined limits."""
-        # Select the specimen type
-        table_2 = pd.read_csv(self.DATA_FILE_PATH)
-        specimen_types = table_2['Specimen'].str.strip().unique()  # Extract and clean up specimen types
-        self.specimen_type = st.selectbox('Select specimen type:', specimen_types)
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema; the specimen type is stored by its name in table 2."""
+        specimen_types = self.table_2['Specimen'].str.strip().unique()  # Extract and clean up specimen types
 
-        # Load coefficients based on the selected specimen type
-        self.coefficients = self._load_coefficients()
-
-        # Display input fields for other parameters
         limits = {
             'T': {'desc': 'Temperature', 'lower': -17.1, 'upper': 28.7, 'unit': '°C'},
             'TOW': {'desc': 'Time of Wetness', 'lower': 0.01, 'upper': 1.0, 'unit': 'annual fraction'},
@@ -41,39 +33,36 @@ class KlineSmith2007Model(CorrosionModel):
             'Cl': {'desc': 'Cl⁻ Deposit', 'lower': 0.4, 'upper': 760.5, 'unit': 'mg/(m²⋅d)'}
         }
 
-        for symbol, limit in limits.items():
-            self.parameters[symbol] = st.number_input(
-                f"Enter {limit['desc']} ({symbol}) [{limit['unit']}]:",
-                min_value=limit['lower'],
-                max_value=limit['upper'],
-                value=limit['lower'],
-                step=0.01,
-                key=f"input_{symbol}"
-            )
+        return ParameterSchema([
+            Parameter('specimen_type', 'Specimen type', choices=specimen_types, label='Select specimen type:'),
+            *[Parameter(symbol, limit['desc'], limit['unit'], lower=limit['lower'], upper=limit['upper'], step=0.01)
+              for symbol, limit in limits.items()],
+        ])
 
-    def _load_coefficients(self) -> Dict[str, float]:
-        """Loads coefficients dynamically from the CSV file based on the selected specimen type."""
-        table_2 = pd.read_csv(self.DATA_FILE_PATH)
+    def _load_coefficients(self, specimen_type: np.ndarray) -> Dict[str, np.ndarray]:
+        """Looks up the coefficients of table 2 for each of the given specimen types."""
+        specimen_types = self.table_2['Specimen'].str.strip().to_numpy()
+        coefficient_table = read_array(self.DATA_FILE_PATH, columns=slice(2, None))
 
-        # Select the row corresponding to the selected specimen type
-        row = table_2.loc[table_2['Specimen'].str.strip() == self.specimen_type].iloc[0]
+        # Select the rows corresponding to the specimen types
+        rows = np.full(np.shape(specimen_type), -1)
+        for row, name in enumerate(specimen_types):
+            rows[specimen_type == name] = row
+        if np.any(rows < 0):
+            raise ValueError(f"Unknown specimen type, expected one of {list(specimen_types)}.")
 
         # Automatically map all relevant columns to coefficients
-        coefficients = {col: float(row[col]) for col in table_2.columns[2:]}
-
-        return coefficients
+        return {col: coefficient_table[rows, i] for i, col in enumerate(self.table_2.columns[2:])}
 
-    def evaluate_material_loss(self, time: float) -> float:
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """Calculates the material loss over time based on the provided environmental parameters."""
-        coeffs = self.coefficients
+        coeffs = self._load_coefficients(parameters['specimen_type'])
 
         # Calculate material loss using the model equation
-        material_loss = (
+        return (
             coeffs['A'] * (time ** coeffs['B']) *
-            ((self.parameters['TOW'] * 365 * 24 / coeffs['C']) ** coeffs['D']) *
-            (1 + (self.parameters['SO2'] / coeffs['E']) ** coeffs['F']) *
-            (1 + (self.parameters['Cl'] / coeffs['G']) ** coeffs['H']) *
-            (np.exp(coeffs['J'] * (self.parameters['T'] + coeffs['T0'])))
+            ((parameters['TOW'] * 365 * 24 / coeffs['C']) ** coeffs['D']) *
+            (1 + (parameters['SO2'] / coeffs['E']) ** coeffs['F']) *
+            (1 + (parameters['Cl'] / coeffs['G']) ** coeffs['H']) *
+            (np.exp(coeffs['J'] * (parameters['T'] + coeffs['T0'])))
         )
-
-        return material_loss, "Time [years]", "Mass loss [μm]"
@@ -1,8 +1,9 @@
 import pandas as pd
-import streamlit as st
 import numpy as np
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table
 
 class Ma2010Model(CorrosionModel):
     """
@@ -20,49 +21,41 @@ class Ma2010Model(CorrosionModel):
 
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Ma2010Model')
-        self.parameters: Dict[str, float] = {}
         self.table_2 = self._load_data()
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
     def _load_data(self) -> pd.DataFrame:
         """Loads the relevant data table for the Ma2010 model."""
-        return pd.read_csv(self.DATA_FILE_PATH, header=None)
+        return read_table(self.DATA_FILE_PATH, header=None)
 
-    def display_parameters(self) -> None:
-        """Prompts the user to input values for all parameters and returns a dictionary of the parameters."""
-        st.table(self.table_2)
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema; the corrosion site is stored as its row index in table 2."""
         corrosion_sites = self.table_2.iloc[1:, 0].tolist()
-        corrosion_site = st.selectbox('Select corrosion site:', corrosion_sites)
-        corrosion_site_index = corrosion_sites.index(corrosion_site) + 1
-
-        limits = {'D': {'desc': 'Distance', 'lower': 25, 'upper': 375, 'unit': 'm'}}
-
-        self.parameters = {
-            'corrosion_site': corrosion_site_index,
-        }
         limits = {'D': {'desc': 'Distance', 'lower': 25, 'upper': 375, 'unit': 'm'}}
 
-        # Collect user input for the distance parameter
-        for symbol, limit in limits.items():
-            value = st.number_input(
-                f"Enter {limit['desc']} ({symbol}) [{limit['unit']}]:",
-                min_value=float(limit['lower']),
-                max_value=float(limit['upper']),
-                value=float(limit['lower']),
-                step=0.01,
-                key=f"input_{symbol}"
-            )
-            if symbol == 'D':
-                self.parameters['distance'] = value
-
-        # Add the selected location's coordinates to global MODEL_COORDINATES varaible
-        coordinates = pd.read_csv(self.COORDINATES_FILE_PATH, header=None)
+        return ParameterSchema([
+            Parameter('corrosion_site', 'Corrosion site', choices=range(1, len(corrosion_sites) + 1),
+                      labels=corrosion_sites, label='Select corrosion site:'),
+            Parameter('distance', 'Distance from sea', limits['D']['unit'],
+                      lower=limits['D']['lower'], upper=limits['D']['upper'], step=0.01,
+                      label=f"Enter {limits['D']['desc']} (D) [{limits['D']['unit']}]:"),
+        ])
+
+    def reference_tables(self) -> Dict[str, pd.DataFrame]:
+        """Returns the environmental conditions of the test sites."""
+        return {'Test sites': self.table_2}
+
+    @property
+    def model_coordinates(self) -> Optional[pd.DataFrame]:
+        """The coordinates of the selected corrosion site."""
+        coordinates = read_table(self.COORDINATES_FILE_PATH, header=None)
         coordinates = coordinates.iloc[self.parameters['corrosion_site'], 1:]
-        self.model_coordinates = pd.DataFrame({
+        return pd.DataFrame({
             'lat': [float(coordinates.iloc[0])],
             'lon': [float(coordinates.iloc[1])]
         })
 
-    def evaluate_material_loss(self, time: float) -> float:
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """Calculates the material loss over time based on the provided environmental parameters."""
 
         # Define the distance points and their corresponding log(A) and n values
@@ -72,25 +65,10 @@ class Ma2010Model(CorrosionModel):
         log_A_site_II = [1.5095, 1.5981, 1.26836]
         n_site_II = [1.15232, 1.05915, 0.76748]
 
-        if self.parameters['corrosion_site'] == 1:
-            log_A_values = log_A_site_I
-            n_values = n_site_I
-        elif self.parameters['corrosion_site'] == 2:
-            log_A_values = log_A_site_II
-            n_values = n_site_II
-
-        for i in range(len(distances) - 1):
-            if distances[i] <= self.parameters['distance'] <= distances[i + 1]:
-                log_A = log_A_values[i] + (log_A_values[i + 1] - log_A_values[i]) * \
-                        (self.parameters['distance'] - distances[i]) / (distances[i + 1] - distances[i])
-                n = n_values[i] + (n_values[i + 1] - n_values[i]) * \
-                    (self.parameters['distance'] - distances[i]) / (distances[i + 1] - distances[i])
-                A = np.exp(log_A)
-                return A * time ** n, "Time [years]", "Mass loss [μm]"
-
-        if self.parameters['distance'] == distances[0]:
-            A, n = np.exp(log_A_values[0]), n_values[0]
-        elif self.parameters['distance'] == distances[-1]:
-            A, n = np.exp(log_A_values[-1]), n_values[-1]
+        # Interpolate log(A) and n linearly between the distance points of each site
+        distance = parameters['distance']
+        site_I = parameters['corrosion_site'] == 1
+        log_A = np.where(site_I, np.interp(distance, distances, log_A_site_I), np.interp(distance, distances, log_A_site_II))
+        n = np.where(site_I, np.interp(distance, distances, n_site_I), np.interp(distance, distances, n_site_II))
 
-        return A * time ** n, "Time [years]", "Mass loss [μm]"
+        return np.exp(log_A) * time ** n
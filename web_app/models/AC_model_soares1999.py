@@ -1,7 +1,7 @@
-import streamlit as st
 import numpy as np
-from typing import Dict, Optional
+from typing import Any, Dict
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
 
 class Soares1999Model(CorrosionModel):
     """
@@ -16,39 +16,33 @@ class Soares1999Model(CorrosionModel):
 
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Soares1999Model')
-        self.parameters: Dict[str, float] = {}
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
-    def display_parameters(self) -> None:
-        """Prompts the user to input values for all parameters and stores them in the parameters dictionary."""
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema."""
         limits = {
             'd_inf': {'desc': 'Long term thickness of corrosion wastage', 'lower': 0.001, 'upper': 1000, 'unit': 'mm'},
             't_c': {'desc': 'Coating life', 'lower': 0.01, 'upper': 100, 'unit': 'years'},
             't_t': {'desc': 'Transition time', 'lower': 0.01, 'upper': 100, 'unit': 'years'}
         }
 
-        for symbol, limit in limits.items():
-            self.parameters[symbol] = st.number_input(
-                f"Enter {limit['desc']} ({symbol}) [{limit['unit']}]:",
-                min_value=float(limit['lower']),
-                max_value=float(limit['upper']),
-                value=float(limit['lower']),
-                step=0.01 if 'mm' in limit['unit'] else 1.0,
-                key=f"input_{symbol}"
-            )
-
-    def evaluate_material_loss(self, time: np.ndarray) -> np.ndarray:
+        return ParameterSchema([
+            Parameter(symbol, limit['desc'], limit['unit'], lower=limit['lower'], upper=limit['upper'],
+                      step=0.01 if 'mm' in limit['unit'] else 1.0)
+            for symbol, limit in limits.items()
+        ])
+
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """
         Evaluates the material loss over time based on the provided parameters.
 
         Args:
-            time (np.ndarray): Array of time values in years.
+            parameters (Dict[str, np.ndarray]): Parameter arrays, either scalars or columns of shape (N, 1).
+            time (np.ndarray): Time values in years with shape (1, T).
 
         Returns:
-            np.ndarray: Array of material loss values corresponding to each time point.
+            np.ndarray: Material loss values, zero before the coating life has elapsed.
         """
-        material_loss = np.zeros_like(time)
-        mask = time >= self.parameters['t_c']
-        material_loss[mask] = self.parameters['d_inf'] * (
-            1 - np.exp(-(time[mask] - self.parameters['t_c']) / self.parameters['t_t'])
-        )
-        return material_loss, "Time [years]", "Mass loss [μm]"
+        elapsed = np.maximum(time - parameters['t_c'], 0.0)
+        material_loss = parameters['d_inf'] * (1 - np.exp(-elapsed / parameters['t_t']))
+        return np.where(time >= parameters['t_c'], material_loss, 0.0)
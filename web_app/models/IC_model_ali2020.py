@@ -1,8 +1,10 @@
 import pandas as pd
-import streamlit as st
 import numpy as np
-from typing import Dict
+from typing import Any, Dict
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table, read_array
+from .units import years_to_hours
 
 class Ali2020Model(CorrosionModel):
     """
@@ -17,57 +19,54 @@ class Ali2020Model(CorrosionModel):
 
     DATA_FILE_PATHS = {'table_3': '../data/tables/ali2020_table_3.csv',
     }
+    LOSS_AXIS_LABEL = "Mass loss [mg]"
+
+    EXTRA_INPUTS = ('b',)
 
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Ali2010Model')
         self.table_3 = self._load_data()
-        self.parameters: Dict[str, float] = {}
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
     def _load_data(self) -> pd.DataFrame:
         """Loads the relevant data tables for the Ali2020 model."""
         return (
-            pd.read_csv(self.DATA_FILE_PATHS['table_3'], header=None)
+            read_table(self.DATA_FILE_PATHS['table_3'], header=None)
         )
 
-
-    def display_parameters(self) -> Dict[str, float]:
-        """Prompts the user to input values for all parameters and returns a dictionary of the parameters."""
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema."""
         limits = {
             'C': {'desc': 'Concentration of NaCl', 'lower': 0.0, 'upper': 5.0, 'unit': '%w/w'},
         }
 
-        for symbol, limit in limits.items():
-            self.parameters[symbol] = st.number_input(
-                f"${symbol}$ - Enter {limit['desc']} [${limit['unit']}$]:",
-                min_value=float(limit['lower']),
-                max_value=float(limit['upper']),
-                value=float(limit['lower']),
-                step=0.01,
-                key=f"input_{symbol}"
-            )
-
-        # Load the data and calculate 'b'
-        nacl_concs = np.array(self.table_3.iloc[1:, 0].astype(float))
-        constants = np.array(self.table_3.iloc[1:, 2].astype(float))
+        return ParameterSchema([
+            Parameter(symbol, limit['desc'], limit['unit'], lower=limit['lower'], upper=limit['upper'], step=0.01,
+                      label=f"${symbol}$ - Enter {limit['desc']} [${limit['unit']}$]:")
+            for symbol, limit in limits.items()
+        ])
 
-        if self.parameters['C'] in nacl_concs:
-            self.parameters['b'] = constants[nacl_concs == self.parameters['C']][0]
-        else:
-            self.parameters['b'] = np.interp(self.parameters['C'], nacl_concs, constants)
+    def parameter_notes(self) -> str:
+        """Returns the model equation."""
+        return r'Mass loss due to corrosion, $W_L [\mu m] = (0.00006C + 0.0008)t + b $'
 
-        st.write(r'Mass loss due to corrosion, $W_L [\mu m] = (0.00006C + 0.0008)t + b $')
+    def _determine_constant(self, concentration: np.ndarray) -> np.ndarray:
+        """Interpolates the constant 'b' of table 3 for the given NaCl concentrations."""
+        table_3 = read_array(self.DATA_FILE_PATHS['table_3'], rows=slice(1, None), header=None)
+        nacl_concs, constants = table_3[:, 0], table_3[:, 2]
+        return np.interp(concentration, nacl_concs, constants)
 
-    def evaluate_material_loss(self, time: float) -> float:
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """
         Evaluates the material loss over time based on the provided parameters.
 
         Args:
-            time (float): The time duration in years.
+            parameters (Dict[str, np.ndarray]): Parameter arrays, either scalars or columns of shape (N, 1).
+            time (np.ndarray): Time values in years with shape (1, T).
 
         Returns:
-            float: The calculated material loss.
+            np.ndarray: The calculated material loss.
         """
-        material_loss = (0.00006 * self.parameters['C'] + 0.0008) * time*24*365 + self.parameters['b']
-        
-        return material_loss, "Time [years]", "Mass loss [mg]"
+        b = parameters['b'] if 'b' in parameters else self._determine_constant(parameters['C'])
+        return (0.00006 * parameters['C'] + 0.0008) * years_to_hours(time) + b
 
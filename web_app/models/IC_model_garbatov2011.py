@@ -1,8 +1,7 @@
-import pandas as pd
-import streamlit as st
 import numpy as np
-from typing import Dict, Optional
+from typing import Any, Dict
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
 
 class Garbatov2011Model(CorrosionModel):
     """
@@ -17,56 +16,40 @@ class Garbatov2011Model(CorrosionModel):
 
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Garbatov2011Model')
-        self.parameters: Dict[str, float] = {}
-
-    def display_parameters(self) -> None:
-        """Prompts the user to input values for all parameters and stores them in the parameters dictionary."""
-        self.parameters = {
-            'Temperature': st.number_input(
-                'Enter the Temperature [°C]:',
-                min_value=-10.0,
-                max_value=50.0,
-                value=20.0,
-                step=0.1,
-                key="temperature"
-            ),
-            'Dissolved Oxygen Concentration': st.number_input(
-                'Enter the Dissolved Oxygen Concentration [ml/l]:',
-                min_value=0.0,
-                max_value=14.6,
-                value=6.0,
-                step=0.1,
-                key="oxygen_concentration"
-            ),
-            'Flow Velocity': st.number_input(
-                'Enter the Flow Velocity [m/s]:',
-                min_value=0.0,
-                max_value=10.0,
-                value=1.0,
-                step=0.1,
-                key="flow_velocity"
-            )
-        }
-
-    def evaluate_material_loss(self, time: float) -> float:
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
+
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema."""
+        return ParameterSchema([
+            Parameter('Temperature', 'Temperature', '°C', lower=-10.0, upper=50.0, default=20.0, step=0.1,
+                      label='Enter the Temperature [°C]:'),
+            Parameter('Dissolved Oxygen Concentration', 'Dissolved oxygen concentration', 'ml/l',
+                      lower=0.0, upper=14.6, default=6.0, step=0.1,
+                      label='Enter the Dissolved Oxygen Concentration [ml/l]:'),
+            Parameter('Flow Velocity', 'Flow velocity', 'm/s', lower=0.0, upper=10.0, default=1.0, step=0.1,
+                      label='Enter the Flow Velocity [m/s]:'),
+        ])
+
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """
         Evaluates the material loss over time based on the provided parameters.
 
         Args:
-            time (float): The time duration in years.
+            parameters (Dict[str, np.ndarray]): Parameter arrays, either scalars or columns of shape (N, 1).
+            time (np.ndarray): Time values in years with shape (1, T).
 
         Returns:
-            float: The calculated material loss.
+            np.ndarray: The calculated material loss.
         """
         # Calculate the effects of temperature, dissolved oxygen concentration, and flow velocity
-        d_temperature = 0.0014 * self.parameters['Temperature'] + 0.0154
-        f_temperature = self.parameters['Temperature'] / 15.5
+        d_temperature = 0.0014 * parameters['Temperature'] + 0.0154
+        f_temperature = parameters['Temperature'] / 15.5
 
-        d_dissolved_oxygen = 0.0268 * self.parameters['Dissolved Oxygen Concentration'] + 0.0086
-        f_dissolved_oxygen = 0.9483 * self.parameters['Dissolved Oxygen Concentration'] + 0.0517
+        d_dissolved_oxygen = 0.0268 * parameters['Dissolved Oxygen Concentration'] + 0.0086
+        f_dissolved_oxygen = 0.9483 * parameters['Dissolved Oxygen Concentration'] + 0.0517
 
-        d_flow_velocity = 0.9338 * (1 - np.exp(-0.4457 * (self.parameters['Flow Velocity'] + 0.2817)))
-        f_flow_velocity = 1.0978 * (1 - np.exp(-2.2927 * (self.parameters['Flow Velocity'] + 0.0548)))
+        d_flow_velocity = 0.9338 * (1 - np.exp(-0.4457 * (parameters['Flow Velocity'] + 0.2817)))
+        f_flow_velocity = 1.0978 * (1 - np.exp(-2.2927 * (parameters['Flow Velocity'] + 0.0548)))
 
         # Calculate the nominal corrosion rate
         nominal_corrosion_rate = d_temperature + d_dissolved_oxygen + d_flow_velocity
@@ -75,6 +58,4 @@ class Garbatov2011Model(CorrosionModel):
         corrosion_rate = f_temperature * f_dissolved_oxygen * f_flow_velocity * nominal_corrosion_rate
 
         # Calculate the material loss over time
-        material_loss = corrosion_rate * time
-
-        return material_loss, "Time [years]", "Mass loss [μm]"
+        return corrosion_rate * time
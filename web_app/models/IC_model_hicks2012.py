@@ -1,8 +1,9 @@
 import pandas as pd
-import streamlit as st
 import numpy as np
-from typing import Dict, Optional
+from typing import Any, Dict
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table
 
 class Hicks2012Model(CorrosionModel):
     """
@@ -24,45 +25,43 @@ class Hicks2012Model(CorrosionModel):
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Hicks2012Model')
         self.steel = "A328 Sheet Steel"
-        self.parameters: Dict[str, float] = {}
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
-    def _display_reference_values(self) -> None:
-        """Displays the reference values related to the study."""
-        with st.expander("Reference Values"):
-            # Display relevant data tables
-            st.title('Statistical relationship between the long-term rate of steel corrosion (mm/yr) and various water quality parameters measured during 2010 at ten sites in the Duluth-Superior Harbor.')
-            st.table(pd.read_csv(self.DATA_FILE_PATHS['table_2']))
-
-            st.title('Water quality measurements made from 9-10 August 2010 in the Duluth-Superior Harbor.')
-            st.table(pd.read_csv(self.DATA_FILE_PATHS['table_7']))
-
-            st.title('Water quality measurements made from 26-27 July 2011 in the Duluth-Superior Harbor and three harbors on the north shore of Lake Superior.')
-            st.table(pd.read_csv(self.DATA_FILE_PATHS['table_8']))
-
-    def display_parameters(self) -> None:
-        """Prompts the user to input values for all parameters and stores them in the parameters dictionary."""
-        self.parameters = {
-            'Alkalinity': st.number_input(r'Enter the Alkalinity [$mg L^{-1}$]:', min_value=0.0, value=0.1, step=0.1, key="alkalinity"),
-            'Chloride': st.number_input(r'Enter the Chloride content [$mg L^{-1}$]:', min_value=0.0, value=0.1, step=0.1, key="chloride"),
-            'Sulfate': st.number_input(r'Enter the Sulfate content [$mg L^{-1}$]:', min_value=0.0, value=0.1, step=0.1, key="sulfate"),
-            'Larson Skold Index': st.number_input(r'Enter the Larson Skold Index:', min_value=0.0, value=0.1, step=0.1, key="larson_skold"),
-            'Conductivity': st.number_input(r'Enter the Conductivity [$\mu D cm^{-1}$]:', min_value=0.0, value=0.1, step=0.1, key="conductivity"),
-            'pH': st.number_input(r'Enter the pH:', min_value=0.0, value=7.0, step=0.1, key="ph"),
-            'Dissolved Oxygen': st.number_input(r'Enter the Dissolved Oxygen content [$mg L^{-1}$]:', min_value=0.0, value=0.1, step=0.1, key="dissolved_oxygen"),
-            'Dissolved Organic Carbon': st.number_input(r'Enter the Dissolved Organic Carbon content [$mg L^{-1}$]:', min_value=0.0, value=0.1, step=0.1, key="dissolved_organic_carbon"),
-            'Dissolved Copper': st.number_input(r'Enter the Dissolved Copper content [$mg L^{-1}$]:', min_value=0.0, value=0.1, step=0.1, key="dissolved_copper")
+    def reference_tables(self) -> Dict[str, pd.DataFrame]:
+        """Returns the reference values related to the study."""
+        return {
+            'Statistical relationship between the long-term rate of steel corrosion (mm/yr) and various water quality parameters measured during 2010 at ten sites in the Duluth-Superior Harbor.':
+                read_table(self.DATA_FILE_PATHS['table_2']),
+            'Water quality measurements made from 9-10 August 2010 in the Duluth-Superior Harbor.':
+                read_table(self.DATA_FILE_PATHS['table_7']),
+            'Water quality measurements made from 26-27 July 2011 in the Duluth-Superior Harbor and three harbors on the north shore of Lake Superior.':
+                read_table(self.DATA_FILE_PATHS['table_8']),
         }
-        self._display_reference_values()
 
-    def evaluate_material_loss(self, time: float) -> float:
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema."""
+        return ParameterSchema([
+            Parameter('Alkalinity', 'Alkalinity', 'mg/L', lower=0.0, default=0.1, step=0.1, label=r'Enter the Alkalinity [$mg L^{-1}$]:'),
+            Parameter('Chloride', 'Chloride content', 'mg/L', lower=0.0, default=0.1, step=0.1, label=r'Enter the Chloride content [$mg L^{-1}$]:'),
+            Parameter('Sulfate', 'Sulfate content', 'mg/L', lower=0.0, default=0.1, step=0.1, label=r'Enter the Sulfate content [$mg L^{-1}$]:'),
+            Parameter('Larson Skold Index', 'Larson Skold Index', lower=0.0, default=0.1, step=0.1, label=r'Enter the Larson Skold Index:'),
+            Parameter('Conductivity', 'Conductivity', 'μS/cm', lower=0.0, default=0.1, step=0.1, label=r'Enter the Conductivity [$\mu D cm^{-1}$]:'),
+            Parameter('pH', 'pH', lower=0.0, default=7.0, step=0.1, label=r'Enter the pH:'),
+            Parameter('Dissolved Oxygen', 'Dissolved oxygen content', 'mg/L', lower=0.0, default=0.1, step=0.1, label=r'Enter the Dissolved Oxygen content [$mg L^{-1}$]:'),
+            Parameter('Dissolved Organic Carbon', 'Dissolved organic carbon content', 'mg/L', lower=0.0, default=0.1, step=0.1, label=r'Enter the Dissolved Organic Carbon content [$mg L^{-1}$]:'),
+            Parameter('Dissolved Copper', 'Dissolved copper content', 'mg/L', lower=0.0, default=0.1, step=0.1, label=r'Enter the Dissolved Copper content [$mg L^{-1}$]:'),
+        ])
+
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """
         Evaluates the material loss over time based on the provided parameters.
 
         Args:
-            time (float): The time duration in years.
+            parameters (Dict[str, np.ndarray]): Parameter arrays, either scalars or columns of shape (N, 1).
+            time (np.ndarray): Time values in years with shape (1, T).
 
         Returns:
-            float: The calculated material loss.
+            np.ndarray: The calculated material loss.
         """
         # Define the parameters and their formulas
         parameter_formulas = {
@@ -79,7 +78,7 @@ class Hicks2012Model(CorrosionModel):
 
         # Calculate the d_values based on the input parameters
         d_values = {
-            f'd_{key.replace(" ", "_")}': (multiplier * self.parameters[key] + constant) if self.parameters[key] != 0 else 0
+            f'd_{key.replace(" ", "_")}': np.where(parameters[key] != 0, multiplier * parameters[key] + constant, 0)
             for key, (multiplier, constant) in parameter_formulas.items()
         }
 
@@ -87,6 +86,4 @@ class Hicks2012Model(CorrosionModel):
         corrosion_rate = sum(d_values.values())
 
         # Calculate the material loss over time
-        material_loss = corrosion_rate * time
-
-        return material_loss, "Time [years]", "Mass loss [μm]"
+        return corrosion_rate * time
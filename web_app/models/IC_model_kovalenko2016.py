@@ -1,7 +1,9 @@
 import pandas as pd
-import streamlit as st
-from typing import Dict, Optional
+import numpy as np
+from typing import Any, Dict
 from .corrosion_model import CorrosionModel
+from .parameters import Parameter, ParameterSchema
+from .table_store import read_table, read_array
 
 class Kovalenko2016Model(CorrosionModel):
     """
@@ -16,42 +18,45 @@ class Kovalenko2016Model(CorrosionModel):
 
     DATA_FILE_PATH = '../data/tables/kovalenko2016_table_3.csv'
 
+    EXTRA_INPUTS = ('c_s', 'r_s')
+
     def __init__(self, json_file_path: str):
         super().__init__(json_file_path=json_file_path, model_name='Kovalenko2016Model')
-        self.parameters: Dict[str, float] = {}
         self.table = self._load_data()
+        self.parameters: Dict[str, Any] = self.parameter_schema().defaults()
 
     def _load_data(self) -> pd.DataFrame:
         """Loads the relevant data table for the Kovalenko2016 model."""
-        return pd.read_csv(self.DATA_FILE_PATH, header=None)
-
-    def display_parameters(self) -> None:
-        """Prompts the user to input values for all parameters and selects the appropriate condition."""
-        self._display_condition_reference_table()
+        return read_table(self.DATA_FILE_PATH, header=None)
 
-        # Select condition based on user input
-        condition_index = st.selectbox('Select the Temperature and Dissolved Inorganic Nitrogen condition:', self.table.iloc[1:, 0])
-        condition_index = int(condition_index)
+    def parameter_schema(self) -> ParameterSchema:
+        """Returns the parameter schema; the condition is stored as its row index in table 3."""
+        return ParameterSchema([
+            Parameter('condition', 'Temperature and dissolved inorganic nitrogen condition',
+                      choices=[int(condition) for condition in self.table.iloc[1:, 0]],
+                      label='Select the Temperature and Dissolved Inorganic Nitrogen condition:'),
+        ])
 
-        # Extract the relevant parameters based on the selected condition
-        self.parameters = {
-            'c_s': float(self.table.iloc[condition_index, 3]),
-            'r_s': float(self.table.iloc[condition_index, 4])
-        }
+    def reference_tables(self) -> Dict[str, pd.DataFrame]:
+        """Returns the condition reference table."""
+        return {'Condition Reference Table': self.table.iloc[:, 1:-2]}
 
-    def _display_condition_reference_table(self) -> None:
-        """Displays the condition reference table."""
-        with st.expander("Condition Reference Table"):
-            st.table(self.table.iloc[:, 1:-2])
-
-    def evaluate_material_loss(self, time: float) -> float:
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
         """
         Evaluates the material loss over time based on the provided parameters.
 
         Args:
-            time (float): The time duration in years.
+            parameters (Dict[str, np.ndarray]): Parameter arrays, either scalars or columns of shape (N, 1).
+            time (np.ndarray): Time values in years with shape (1, T).
 
         Returns:
-            float: The calculated material loss.
+            np.ndarray: The calculated material loss.
         """
-        return self.parameters['c_s'] + time * self.parameters['r_s'], "Time [years]", "Mass loss [μm]"
+        # Extract the relevant parameters based on the selected condition
+        conditions = read_array(self.DATA_FILE_PATH, rows=slice(1, None), columns=slice(3, 5), header=None)
+        if 'c_s' in parameters and 'r_s' in parameters:
+            c_s, r_s = parameters['c_s'], parameters['r_s']
+        else:
+            condition_index = parameters['condition'].astype(int) - 1
+            c_s, r_s = conditions[condition_index, 0], conditions[condition_index, 1]
+        return c_s + time * r_s
@@ -1,12 +1,21 @@
-from .AC_model_benarie1986 import Benarie1986Model
-from .AC_model_feliu1993 import Feliu1993Model
-from .AC_model_iso9223 import ISO9223Model
-from .AC_model_klinesmith2007 import KlineSmith2007Model
-from .AC_model_ma2010 import Ma2010Model
-from .AC_model_soares1999 import Soares1999Model
-from .IC_model_ali2020 import Ali2020Model
-from .IC_model_garbatov2011 import Garbatov2011Model
-from .IC_model_hicks2012 import Hicks2012Model
-from .IC_model_kovalenko2016 import Kovalenko2016Model
 from .model import load_models_from_directory, Model
-from .corrosion_model import get_corrosion_process_type, CorrosionProcessTypeError, CorrosionModel, load_corrosion_models_from_directory
\ No newline at end of file
+from .corrosion_model import get_corrosion_process_type, process_type_from_tags, CorrosionProcessTypeError, CorrosionModel, load_corrosion_models_from_directory, as_parameter_columns
+from .parameters import Parameter, ParameterSchema
+from .registry import corrosion_models, ModelRegistry, MODEL_DIRECTORIES, MODEL_MANIFESTS, MEASUREMENT_DIRECTORIES
+from .table_store import TableStore, read_table, read_array
+from .distributions import Distribution, Normal, Uniform
+from .uncertainty import MonteCarloSimulation, StreamingQuantiles
+from .sensitivity import SensitivityAnalysis
+from .units import convert, hours_to_years, years_to_hours, grams_per_m2_to_um, um_to_grams_per_m2, mg_to_um, um_to_mg, PiecewiseLinearConversion
+from .sampling import adaptive_time_grid
+from .record_loader import bulk_load, decode_json, read_json_records, read_json_record, list_json_files, JsonRecord, LoadError, LoadReport
+
+
+def __getattr__(name: str):
+    """Imports the model classes, e.g. `from models import Feliu1993Model`, only when they are first requested."""
+    if name.endswith('Model'):
+        try:
+            return corrosion_models.find_class(name)
+        except KeyError:
+            pass
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
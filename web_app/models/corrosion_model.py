@@ -1,7 +1,14 @@
-import os
-import json
-from typing import List, Dict, Union, Tuple, Optional, Any
+import copy
+from typing import List, Dict, Union, Tuple, Optional, Any, Mapping
+import numpy as np
+import pandas as pd
 from .model import Model
+from .record_loader import bulk_load, list_json_files, LoadReport
+from .parameters import ParameterSchema
+from .distributions import Distribution
+
+# Parameter sets accepted by the batch evaluation: a DataFrame, a structured array or a mapping of columns
+ParameterSets = Union[pd.DataFrame, np.ndarray, Mapping[str, Any]]
 
 
 class CorrosionModel(Model):
@@ -9,10 +16,12 @@ class CorrosionModel(Model):
     A base class for corrosion models, inheriting from the Model class.
 
     This class serves as a template for specific corrosion models, providing basic attributes
-    and methods that can be overridden by subclasses.
+    and methods that can be overridden by subclasses. Corrosion models are free of any user interface:
+    their parameters are declared by `parameter_schema` and set through `set_parameters`.
 
     Attributes:
         model_name (str): The name of the corrosion model.
+        parameters (Dict[str, Any]): The current parameter values, keyed by symbol.
     """
 
     def __init__(self, json_file_path: str, model_name: str = 'parent class'):
@@ -25,22 +34,212 @@ class CorrosionModel(Model):
         """
         super().__init__(json_file_path)  # Initialize the Model base class
         self.model_name = model_name
-        self.model_coordinates = None # Initialize the coordinates associated with the model to be None
 
-    def evaluate_material_loss(self, *args, **kwargs):
+    def copy(self) -> 'CorrosionModel':
+        """
+        Returns a copy of the model with its own parameters.
+
+        The record details and the reference tables are shared with the original, so copies are cheap.
+        """
+        model = copy.copy(self)
+        model.parameters = dict(self.parameters)
+        return model
+
+    def parameter_schema(self) -> ParameterSchema:
+        """
+        Returns the declarative schema of the model's input parameters.
+
+        This method should be overridden by subclasses that take parameters.
+        """
+        return ParameterSchema([])
+
+    def set_parameters(self, values: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Validates parameter values against the schema and stores them in `self.parameters`.
+
+        Parameters that are not given are set to their defaults.
+
+        Args:
+            values (Optional[Dict[str, Any]]): Parameter values keyed by symbol.
+            **kwargs (Any): Further parameter values, for symbols that are valid identifiers.
+
+        Returns:
+            Dict[str, Any]: The stored parameter values.
+
+        Raises:
+            ValueError: If a value is invalid or the symbol is unknown.
+        """
+        self.parameters = self.parameter_schema().resolve({**(values or {}), **kwargs})
+        return self.parameters
+
+    @property
+    def model_coordinates(self) -> Optional[pd.DataFrame]:
+        """The coordinates ('lat', 'lon') of the site selected by the parameters, if the model is site-specific."""
+        return None
+
+    def reference_tables(self) -> Dict[str, pd.DataFrame]:
+        """Returns reference tables that help choosing the parameters, keyed by caption."""
+        return {}
+
+    def parameter_notes(self) -> str:
+        """Returns Markdown notes on the current parameters, such as the model equations or the selected values."""
+        return ''
+
+    def parameter_uncertainty(self) -> Dict[str, Distribution]:
         """
-        Placeholder method for evaluating material loss.
+        Returns the distributions of the uncertain inputs around the current parameters, keyed by symbol.
+
+        These are the default inputs of the Monte Carlo uncertainty propagation. The keys are parameter symbols
+        or further columns understood by `_evaluate_material_loss`. Models without documented uncertainties
+        return an empty dictionary.
+        """
+        return {}
+
+    @property
+    def has_uncertainty(self) -> bool:
+        """Whether the model documents the uncertainty of its inputs, i.e. can show uncertainty bands by default."""
+        return bool(self.parameter_uncertainty())
+
+    TIME_AXIS_LABEL = "Time [years]"
+    LOSS_AXIS_LABEL = "Mass loss [μm]"
+
+    # Columns besides the parameters that `_evaluate_material_loss` understands, such as the uncertain
+    # coefficients returned by `parameter_uncertainty`
+    EXTRA_INPUTS: Tuple[str, ...] = ()
+
+    def evaluate_material_loss(self, time: Union[float, np.ndarray]) -> Tuple[np.ndarray, str, str]:
+        """
+        Evaluates the material loss over time for the parameters currently held in `self.parameters`.
+
+        Args:
+            time (Union[float, np.ndarray]): Time value or array of time values in years.
+
+        Returns:
+            Tuple[np.ndarray, str, str]: The material loss with the shape of `time`, and the x- and y-axis labels.
+        """
+        material_loss = self.evaluate_material_loss_batch(None, time)[0]
+        return material_loss.reshape(np.shape(time))[()], self.TIME_AXIS_LABEL, self.LOSS_AXIS_LABEL
+
+    def evaluate_material_loss_batch(self, parameter_sets: Optional[ParameterSets], time: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Evaluates the material loss of N parameter sets at T time points in one vectorized pass.
+
+        Parameters missing from `parameter_sets` are taken from `self.parameters`, so a batch only needs
+        to carry the parameters that vary between the sets.
+
+        Args:
+            parameter_sets (Optional[ParameterSets]): A DataFrame, a structured array or a mapping of equally long
+                                                      columns, keyed by parameter name. None evaluates `self.parameters`.
+            time (Union[float, np.ndarray]): Time value or array of time values in years.
+
+        Returns:
+            np.ndarray: An N×T array with the material loss of each parameter set at each time point.
+
+        Raises:
+            ValueError: If a column is neither a parameter nor an extra input, or holds invalid values.
+        """
+        columns, count = as_parameter_columns(parameter_sets)
+        if columns:
+            columns = self.resolve_columns(columns)
+        parameters = {key: np.asarray(value) for key, value in self.parameters.items()}
+        parameters.update({key: value.reshape(-1, 1) for key, value in columns.items()})
+
+        time = np.asarray(time, dtype=float).reshape(1, -1)
+        material_loss = np.asarray(self._evaluate_material_loss(parameters, time), dtype=float)
+        if material_loss.shape != (count, time.shape[1]):
+            material_loss = np.broadcast_to(material_loss, (count, time.shape[1])).copy()
+        return material_loss
+
+    def resolve_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Validates columns of parameter values against the parameter schema and fills missing values with defaults.
+
+        Args:
+            columns (Dict[str, np.ndarray]): Equally long columns keyed by parameter symbol or extra input.
+
+        Returns:
+            Dict[str, np.ndarray]: The validated columns.
+
+        Raises:
+            ValueError: If a column is neither a parameter nor an extra input, or holds invalid values.
+        """
+        schema = self.parameter_schema()
+        unknown = set(columns) - set(schema.symbols) - set(self.EXTRA_INPUTS)
+        if unknown:
+            raise ValueError(f"Unknown parameters of {self.model_name}: {', '.join(sorted(map(str, unknown)))}")
+        return schema.resolve_columns(columns)
+
+    def _evaluate_material_loss(self, parameters: Dict[str, np.ndarray], time: np.ndarray) -> np.ndarray:
+        """
+        Computes the material loss with NumPy broadcasting.
 
         This method should be overridden by subclasses to provide specific implementations.
+
+        Args:
+            parameters (Dict[str, np.ndarray]): Parameter arrays, either scalars or columns of shape (N, 1).
+            time (np.ndarray): Time values in years with shape (1, T).
+
+        Returns:
+            np.ndarray: The material loss, broadcastable to shape (N, T).
         """
         raise NotImplementedError("This method should be implemented by subclasses.")
 
 
+def as_parameter_columns(parameter_sets: Optional[ParameterSets]) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Converts N parameter sets into a dictionary of one-dimensional columns.
+
+    Args:
+        parameter_sets (Optional[ParameterSets]): A DataFrame, a structured array, a mapping of columns or None.
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], int]: The columns keyed by parameter name and the number of parameter sets N.
+
+    Raises:
+        ValueError: If the columns differ in length.
+        TypeError: If the input is not one of the supported types.
+    """
+    if parameter_sets is None:
+        return {}, 1
+
+    if isinstance(parameter_sets, pd.DataFrame):
+        columns = {str(name): parameter_sets[name].to_numpy() for name in parameter_sets.columns}
+        return columns, len(parameter_sets)
+
+    if isinstance(parameter_sets, np.ndarray):
+        if parameter_sets.dtype.names is None:
+            raise TypeError("Parameter sets given as an array must be a structured array with named fields.")
+        columns = {name: parameter_sets[name].ravel() for name in parameter_sets.dtype.names}
+        return columns, parameter_sets.size
+
+    if isinstance(parameter_sets, Mapping):
+        columns = {str(name): np.atleast_1d(np.asarray(value)).ravel() for name, value in parameter_sets.items()}
+        lengths = {column.size for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All parameter columns must have the same length, got lengths {sorted(lengths)}.")
+        return columns, lengths.pop() if lengths else 1
+
+    raise TypeError("Parameter sets must be a DataFrame, a structured array or a mapping of columns.")
+
+
 class CorrosionProcessTypeError(Exception):
     """Custom exception for invalid corrosion process type."""
     pass
 
 
+def process_type_from_tags(tags: List[str]) -> Optional[str]:
+    """
+    Returns the corrosion process type named by a list of tags, e.g. 'immersion corrosion' for the tag
+    'immersion corrosion model', or None if no tag has exactly three words ending in "corrosion model".
+    """
+    for tag in tags:
+        words = tag.split()
+        # The tag must have exactly three words, with the last two being "corrosion" and "model"
+        if len(words) == 3 and words[-2] == "corrosion" and words[-1] == "model":
+            return words[0] + " corrosion"  # Extract and format the process type
+    return None
+
+
 def get_corrosion_process_type(models: Union[Model, List[Model]]) -> Union[Tuple[Model, str], List[Tuple[Model, str]]]:
     """
     Determines the corrosion process type for a single model or a list of models based on their tags.
@@ -65,14 +264,10 @@ def get_corrosion_process_type(models: Union[Model, List[Model]]) -> Union[Tuple
 
     def determine_type(model: Model) -> str:
         """Helper function to determine the corrosion process type for a single model."""
-        for tag in model.tags:
-            words = tag.split()
-            # The tag must have exactly three words, with the last two being "corrosion" and "model"
-            if len(words) == 3 and words[-2] == "corrosion" and words[-1] == "model":
-                process_type = words[0] + " corrosion"  # Extract and format the process type
-                return process_type
-
-        raise CorrosionProcessTypeError("Model does not have any valid corrosion process tags.")
+        process_type = process_type_from_tags(model.tags)
+        if process_type is None:
+            raise CorrosionProcessTypeError("Model does not have any valid corrosion process tags.")
+        return process_type
 
     if isinstance(models, Model):
         # Handle the case where a single model is passed
@@ -95,12 +290,15 @@ def get_corrosion_process_type(models: Union[Model, List[Model]]) -> Union[Tuple
         raise TypeError("Input must be a Model instance or a list of Model instances.")
 
 
-def load_corrosion_models_from_directory(directory_paths: Union[str, List[str]], model_classes: Dict[str, Any]) -> List[CorrosionModel]:
-    """Loads all corrosion models from JSON files in the specified directory or directories.
+def load_corrosion_models_from_directory(directory_paths: Union[str, List[str]], model_classes: Mapping[str, Any],
+                                         report: Optional[LoadReport] = None) -> List[CorrosionModel]:
+    """Loads all corrosion models from JSON files in the specified directory or directories, reading the files in parallel.
 
     Args:
         directory_paths (Union[str, List[str]]): A single directory path or a list of directory paths.
-        model_classes (Dict[str, Any]): A dictionary mapping model identifiers to their corresponding classes.
+        model_classes (Mapping[str, Any]): A mapping from model identifiers to their corresponding classes.
+        report (Optional[LoadReport]): A report collecting the failed records and the throughput. If None,
+                                       a warning is printed for each failed record.
 
     Returns:
         List[CorrosionModel]: A list of CorrosionModel instances loaded from the JSON files in the specified directory or directories.
@@ -108,35 +306,15 @@ def load_corrosion_models_from_directory(directory_paths: Union[str, List[str]],
     Raises:
         ValueError: If a directory does not exist or no JSON files are found.
     """
-    if isinstance(directory_paths, str):
-        directory_paths = [directory_paths]  # Convert to a list for uniform processing
-
-    corrosion_models = []
-    for directory_path in directory_paths:
-        if not os.path.isdir(directory_path):
-            raise ValueError(f"The specified directory does not exist: {directory_path}")
-
-        json_files = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if f.endswith('.json')]
-        if not json_files:
-            raise ValueError(f"No JSON files found in the specified directory: {directory_path}")
-
-        for json_file in json_files:
-            try:
-                # Load the JSON data
-                with open(json_file, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
-
-                # Determine the model identifier
-                model_identifier = data.get('identifier', '')
-
-                # Match the identifier with the corresponding class
-                if model_identifier in model_classes:
-                    corrosion_model = model_classes[model_identifier](json_file)
-                    corrosion_models.append(corrosion_model)
-                else:
-                    print(f"Warning: No matching corrosion model class for identifier '{model_identifier}' in file {json_file}")
-
-            except (ValueError, json.JSONDecodeError) as e:
-                print(f"Warning: Error processing JSON file at {json_file}: {str(e)}")
-
-    return corrosion_models
\ No newline at end of file
+    def build(path: str, record: Dict[str, Any]) -> CorrosionModel:
+        # Match the identifier with the corresponding class
+        model_identifier = record.get('identifier', '')
+        if model_identifier not in model_classes:
+            raise ValueError(f"No matching corrosion model class for identifier '{model_identifier}'")
+        return model_classes[model_identifier](path)
+
+    load_report = LoadReport() if report is None else report
+    corrosion_models = bulk_load(list_json_files(directory_paths), build, report=load_report)
+    if report is None:
+        load_report.print_warnings()
+    return corrosion_models
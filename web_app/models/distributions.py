@@ -0,0 +1,69 @@
+from typing import Optional
+
+import numpy as np
+
+
+class Distribution:
+    """A base class for the probability distributions of uncertain model parameters."""
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """
+        Draws samples from the distribution.
+
+        This method should be overridden by subclasses to provide specific implementations.
+
+        Args:
+            rng (np.random.Generator): The random number generator.
+            size (int): The number of samples.
+
+        Returns:
+            np.ndarray: A one-dimensional array of samples.
+        """
+        raise NotImplementedError("This method should be implemented by subclasses.")
+
+
+class Uniform(Distribution):
+    """A uniform distribution between a lower and an upper limit."""
+
+    def __init__(self, lower: float, upper: float):
+        if upper < lower:
+            raise ValueError(f"The upper limit {upper} is below the lower limit {lower}.")
+        self.lower = float(lower)
+        self.upper = float(upper)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.uniform(self.lower, self.upper, size)
+
+    def __repr__(self):
+        return f"Uniform(lower={self.lower}, upper={self.upper})"
+
+
+class Normal(Distribution):
+    """A normal distribution, optionally truncated to a lower and an upper limit."""
+
+    MAX_REJECTION_ROUNDS = 100
+
+    def __init__(self, mean: float, sd: float, lower: Optional[float] = None, upper: Optional[float] = None):
+        if sd < 0:
+            raise ValueError(f"The standard deviation must not be negative, got {sd}.")
+        self.mean = float(mean)
+        self.sd = float(sd)
+        self.lower = -np.inf if lower is None else float(lower)
+        self.upper = np.inf if upper is None else float(upper)
+        if not self.lower <= self.mean <= self.upper:
+            raise ValueError(f"The mean {mean} is outside the limits [{lower}, {upper}].")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        samples = rng.normal(self.mean, self.sd, size)
+
+        # Redraw the samples outside the limits; the mean lies within them, so few rounds are needed
+        outside = (samples < self.lower) | (samples > self.upper)
+        for _ in range(self.MAX_REJECTION_ROUNDS):
+            if not outside.any():
+                break
+            samples[outside] = rng.normal(self.mean, self.sd, np.count_nonzero(outside))
+            outside = (samples < self.lower) | (samples > self.upper)
+        return np.clip(samples, self.lower, self.upper)
+
+    def __repr__(self):
+        return f"Normal(mean={self.mean}, sd={self.sd}, lower={self.lower}, upper={self.upper})"
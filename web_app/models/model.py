@@ -1,7 +1,7 @@
-import os
-import json
 from typing import List, Dict, Any, Optional, Union
 
+from .record_loader import bulk_load, list_json_files, read_json_record, LoadReport
+
 
 class Model:
     """Class representing the details of a single model extracted from a JSON file."""
@@ -38,11 +38,7 @@ class Model:
 
     def _load_json_file(self) -> Dict[str, Any]:
         """Loads a JSON file and returns its content as a dictionary."""
-        try:
-            with open(self.json_file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            raise ValueError(f"Error loading JSON file at {self.json_file_path}: {str(e)}") from e
+        return read_json_record(self.json_file_path)
 
     def _extract_details(self, data: Dict[str, Any]) -> None:
         """Extracts model details from a JSON object and sets them as class attributes."""
@@ -70,11 +66,13 @@ class Model:
         print(f"Tags: {', '.join(self.tags)}")
 
 
-def load_models_from_directory(directory_paths: Union[str, List[str]]) -> List[Model]:
-    """Loads all models from JSON files in the specified directory or directories.
+def load_models_from_directory(directory_paths: Union[str, List[str]], report: Optional[LoadReport] = None) -> List[Model]:
+    """Loads all models from JSON files in the specified directory or directories, reading the files in parallel.
 
     Args:
         directory_paths (Union[str, List[str]]): A single directory path or a list of directory paths.
+        report (Optional[LoadReport]): A report collecting the failed records and the throughput. If None,
+                                       a warning is printed for each failed record.
 
     Returns:
         List[Model]: A list of Model instances loaded from the JSON files in the specified directory or directories.
@@ -82,24 +80,9 @@ def load_models_from_directory(directory_paths: Union[str, List[str]]) -> List[M
     Raises:
         ValueError: If a directory does not exist or no JSON files are found.
     """
-    if isinstance(directory_paths, str):
-        directory_paths = [directory_paths]  # Convert to a list for uniform processing
-
-    models = []
-    for directory_path in directory_paths:
-        if not os.path.isdir(directory_path):
-            raise ValueError(f"The specified directory does not exist: {directory_path}")
-
-        json_files = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if f.endswith('.json')]
-        if not json_files:
-            raise ValueError(f"No JSON files found in the specified directory: {directory_path}")
-
-        for json_file in json_files:
-            try:
-                model = Model(json_file)
-                models.append(model)
-            except ValueError as e:
-                print(f"Warning: {e}")
-
+    load_report = LoadReport() if report is None else report
+    models = bulk_load(list_json_files(directory_paths), lambda path, record: Model(path), report=load_report)
+    if report is None:
+        load_report.print_warnings()
     return models
 
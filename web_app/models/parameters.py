@@ -0,0 +1,258 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+class Parameter:
+    """
+    A declarative description of a single model parameter.
+
+    A parameter is either numeric, with optional lower and upper limits, or a choice between a fixed
+    set of values. It may be conditional on the values of parameters declared before it.
+
+    Attributes:
+        symbol (str): The key of the parameter in the model's `parameters` dictionary.
+        description (str): A human-readable description of the parameter.
+        unit (str): The unit of the parameter, empty for dimensionless parameters and choices.
+        lower (Optional[float]): The lower limit of a numeric parameter, if any.
+        upper (Optional[float]): The upper limit of a numeric parameter, if any.
+        default (Any): The default value. Defaults to the lower limit or the first choice.
+        step (Optional[float]): The suggested input step of a numeric parameter.
+        choices (Optional[List[Any]]): The allowed values of a choice parameter.
+        labels (Optional[List[str]]): Display labels of the choices. Defaults to the choices themselves.
+        when (Dict[str, Sequence[Any]]): Values other parameters must hold for this parameter to be active.
+        label (Optional[str]): A custom label for input widgets.
+    """
+
+    def __init__(self,
+                 symbol: str,
+                 description: str,
+                 unit: str = '',
+                 lower: Optional[float] = None,
+                 upper: Optional[float] = None,
+                 default: Any = None,
+                 step: Optional[float] = None,
+                 choices: Optional[Sequence[Any]] = None,
+                 labels: Optional[Sequence[str]] = None,
+                 when: Optional[Dict[str, Sequence[Any]]] = None,
+                 label: Optional[str] = None):
+        self.symbol = symbol
+        self.description = description
+        self.unit = unit
+        self.lower = None if lower is None else float(lower)
+        self.upper = None if upper is None else float(upper)
+        self.step = step
+        self.choices = None if choices is None else list(choices)
+        self.labels = None if labels is None else [str(label) for label in labels]
+        self.when = dict(when or {})
+        self.label = label
+
+        if self.choices is not None:
+            if not self.choices:
+                raise ValueError(f"Choice parameter '{symbol}' needs at least one choice.")
+            self.default = self.choices[0] if default is None else default
+        elif default is None:
+            self.default = self.lower if self.lower is not None else 0.0
+        else:
+            self.default = float(default)
+
+    @property
+    def is_choice(self) -> bool:
+        """Whether the parameter is a choice between fixed values."""
+        return self.choices is not None
+
+    def is_active(self, values: Dict[str, Any]) -> bool:
+        """Returns whether the parameter applies given the values of the parameters it depends on."""
+        return all(values.get(symbol) in allowed for symbol, allowed in self.when.items())
+
+    def format_choice(self, value: Any) -> str:
+        """Returns the display label of a choice value."""
+        if self.labels is None:
+            return str(value)
+        return self.labels[self.choices.index(value)]
+
+    def validate(self, value: Any) -> Any:
+        """
+        Checks a value against the parameter's choices or limits.
+
+        Returns:
+            Any: The value, converted to float for numeric parameters.
+
+        Raises:
+            ValueError: If the value is not an allowed choice, not a finite number or outside the limits.
+        """
+        if self.choices is not None:
+            if value not in self.choices:
+                raise ValueError(f"Invalid value {_plain(value)!r} for parameter '{self.symbol}', "
+                                 f"expected one of {self.choices}.")
+            return value
+
+        try:
+            number = float(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Parameter '{self.symbol}' must be numeric, got {_plain(value)!r}.") from e
+        if not np.isfinite(number):
+            raise ValueError(f"Parameter '{self.symbol}' must be a finite number, got {_plain(value)!r}.")
+        value = number
+
+        if (self.lower is not None and value < self.lower) or (self.upper is not None and value > self.upper):
+            raise ValueError(f"Value {value} for parameter '{self.symbol}' is outside the limits "
+                             f"[{self.lower}, {self.upper}] {self.unit}".rstrip() + ".")
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a plain dictionary description of the parameter."""
+        return {
+            'symbol': self.symbol,
+            'description': self.description,
+            'unit': self.unit,
+            'lower': self.lower,
+            'upper': self.upper,
+            'default': self.default,
+            'step': self.step,
+            'choices': self.choices,
+            'labels': self.labels,
+            'when': {symbol: list(allowed) for symbol, allowed in self.when.items()},
+        }
+
+    def __repr__(self):
+        if self.choices is not None:
+            return f"Parameter(symbol={self.symbol}, choices={self.choices}, default={self.default})"
+        return (f"Parameter(symbol={self.symbol}, unit={self.unit}, lower={self.lower}, upper={self.upper}, "
+                f"default={self.default})")
+
+
+class ParameterSchema:
+    """An ordered collection of the parameters of a model."""
+
+    def __init__(self, parameters: Sequence[Parameter]):
+        self._parameters: List[Parameter] = list(parameters)
+
+    def __iter__(self) -> Iterator[Parameter]:
+        return iter(self._parameters)
+
+    def __len__(self) -> int:
+        return len(self._parameters)
+
+    def __getitem__(self, symbol: str) -> Parameter:
+        for parameter in self._parameters:
+            if parameter.symbol == symbol:
+                return parameter
+        raise KeyError(symbol)
+
+    @property
+    def symbols(self) -> List[str]:
+        """The symbols of all parameters in declaration order."""
+        return [parameter.symbol for parameter in self._parameters]
+
+    def defaults(self) -> Dict[str, Any]:
+        """Returns the default values of all parameters that are active with the defaults."""
+        return self.resolve({})
+
+    def resolve(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validates parameter values and completes them with defaults.
+
+        Parameters are resolved in declaration order; parameters whose conditions are not met are left out.
+
+        Args:
+            values (Dict[str, Any]): Parameter values keyed by symbol.
+
+        Returns:
+            Dict[str, Any]: The validated values of all active parameters.
+
+        Raises:
+            ValueError: If a value is invalid or the symbol is unknown.
+        """
+        unknown = set(values) - set(self.symbols)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+        resolved: Dict[str, Any] = {}
+        for parameter in self._parameters:
+            if parameter.is_active(resolved):
+                resolved[parameter.symbol] = parameter.validate(values.get(parameter.symbol, parameter.default))
+        return resolved
+
+    def resolve_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Validates columns of parameter values and fills missing values with defaults.
+
+        This is the vectorized counterpart of `resolve` for batch evaluation. Columns of unknown symbols are
+        passed through unchanged, and parameters without a column are left to the model's current values.
+        Values are only validated in the rows where the parameter is active.
+
+        Args:
+            columns (Dict[str, np.ndarray]): Equally long columns of parameter values keyed by symbol.
+
+        Returns:
+            Dict[str, np.ndarray]: The columns with missing values (None or NaN) replaced by the defaults.
+
+        Raises:
+            ValueError: If a column holds values that are not allowed choices, not finite numbers or outside the limits.
+        """
+        resolved = dict(columns)
+        for parameter in self._parameters:
+            if parameter.symbol not in resolved:
+                continue
+
+            column = np.asarray(resolved[parameter.symbol])
+            missing = _is_missing(column)
+            if np.any(missing):
+                column = np.where(missing, np.asarray(parameter.default, dtype=object), column.astype(object))
+
+            active = np.ones(column.shape, dtype=bool)
+            for symbol, allowed in parameter.when.items():
+                if symbol in resolved:
+                    active &= _is_in(np.asarray(resolved[symbol]), allowed)
+
+            if parameter.is_choice:
+                invalid = active & ~_is_in(column, parameter.choices)
+                if np.any(invalid):
+                    raise ValueError(f"{np.count_nonzero(invalid)} value(s) of parameter '{parameter.symbol}' are not "
+                                     f"one of {parameter.choices}, e.g. {_plain(column[invalid][0])!r}.")
+            else:
+                try:
+                    column = column.astype(float)
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"Parameter '{parameter.symbol}' must be numeric.") from e
+                # Missing values were replaced by the default, so NaN can only come from values such as "nan"
+                invalid = active & ~np.isfinite(column)
+                if np.any(invalid):
+                    raise ValueError(f"{np.count_nonzero(invalid)} value(s) of parameter '{parameter.symbol}' are not "
+                                     f"finite numbers, e.g. {_plain(np.asarray(columns[parameter.symbol])[invalid][0])!r}.")
+                lower = -np.inf if parameter.lower is None else parameter.lower
+                upper = np.inf if parameter.upper is None else parameter.upper
+                invalid = active & ((column < lower) | (column > upper))
+                if np.any(invalid):
+                    raise ValueError(f"{np.count_nonzero(invalid)} value(s) of parameter '{parameter.symbol}' are outside "
+                                     f"the limits [{parameter.lower}, {parameter.upper}] {parameter.unit}".rstrip() + ".")
+
+            resolved[parameter.symbol] = column
+        return resolved
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Returns plain dictionary descriptions of all parameters."""
+        return [parameter.to_dict() for parameter in self._parameters]
+
+
+def _plain(value: Any) -> Any:
+    """Returns a NumPy scalar as the Python value it holds, so messages show e.g. 99 instead of np.int64(99)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _is_missing(column: np.ndarray) -> np.ndarray:
+    """Returns a mask of the None and NaN entries of a column."""
+    if column.dtype.kind == 'f':
+        return np.isnan(column)
+    if column.dtype.kind == 'O':
+        return np.array([value is None or value != value for value in column.ravel()], dtype=bool).reshape(column.shape)
+    return np.zeros(column.shape, dtype=bool)
+
+
+def _is_in(column: np.ndarray, allowed: Sequence[Any]) -> np.ndarray:
+    """Returns a mask of the entries of a column that equal one of the allowed values."""
+    mask = np.zeros(column.shape, dtype=bool)
+    for value in allowed:
+        mask |= column == value
+    return mask
@@ -0,0 +1,133 @@
+import os
+import json
+import importlib
+import threading
+from importlib import metadata
+from typing import Dict, Iterator, List, Mapping, Optional, Type, Union
+
+from .table_store import APP_DIR
+
+# Manifests declaring the corrosion model classes by identifier, next to the Kadi4Mat records
+MODEL_MANIFESTS = [
+    os.path.normpath(os.path.join(APP_DIR, '../data/kadi4mat_json/model_plugins.json')),
+]
+
+# Entry point group under which installed packages can declare further corrosion model classes
+MODEL_ENTRY_POINT_GROUP = 'corwiz.models'
+
+
+class ModelRegistry(Mapping[str, Type]):
+    """
+    A mapping from model identifiers to corrosion model classes, which imports each class only on first use.
+
+    Classes are declared by identifier as import targets 'module:ClassName', either in JSON manifests of the form
+    `{"models": {"<identifier>": "<target>"}}` or as entry points of the group 'corwiz.models' of installed packages.
+    Targets starting with '.' are relative to this package. Declarations are read on first access; listing and
+    membership tests never import a model module, so in-house models can be added without editing the app.
+
+    Later declarations of an identifier replace earlier ones: entry points override the manifests, and classes
+    registered with `register` override both.
+    """
+
+    def __init__(self, manifest_paths: Optional[List[str]] = None, entry_point_group: Optional[str] = MODEL_ENTRY_POINT_GROUP):
+        self.manifest_paths = list(MODEL_MANIFESTS if manifest_paths is None else manifest_paths)
+        self.entry_point_group = entry_point_group
+        self._targets: Optional[Dict[str, Union[str, metadata.EntryPoint, Type]]] = None
+        self._classes: Dict[str, Type] = {}
+        self._lock = threading.RLock()
+
+    def _load_declarations(self) -> Dict[str, Union[str, metadata.EntryPoint, Type]]:
+        """Reads the model declarations from the manifests and the entry points."""
+        targets: Dict[str, Union[str, metadata.EntryPoint, Type]] = {}
+        for manifest_path in self.manifest_paths:
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as file:
+                    targets.update(json.load(file).get('models', {}))
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"Warning: Error reading model manifest at {manifest_path}: {str(e)}")
+        if self.entry_point_group:
+            for entry_point in metadata.entry_points(group=self.entry_point_group):
+                targets[entry_point.name] = entry_point
+        return targets
+
+    @property
+    def targets(self) -> Dict[str, Union[str, metadata.EntryPoint, Type]]:
+        """The declared import targets by identifier, read on first access."""
+        with self._lock:
+            if self._targets is None:
+                self._targets = self._load_declarations()
+            return self._targets
+
+    def register(self, identifier: str, target: Union[str, Type]) -> None:
+        """Declares a model class, or its import target 'module:ClassName', for an identifier."""
+        with self._lock:
+            self.targets[identifier] = target
+            self._classes.pop(identifier, None)
+
+    def is_loaded(self, identifier: str) -> bool:
+        """Whether the class of an identifier has already been imported."""
+        return identifier in self._classes
+
+    def __getitem__(self, identifier: str) -> Type:
+        """
+        Returns the model class of an identifier, importing its module on first use.
+
+        Raises:
+            KeyError: If no model class is declared for the identifier.
+            ImportError: If the declared module or class cannot be imported.
+        """
+        with self._lock:
+            if identifier not in self._classes:
+                self._classes[identifier] = self._import(self.targets[identifier])
+            return self._classes[identifier]
+
+    @staticmethod
+    def _import(target: Union[str, metadata.EntryPoint, Type]) -> Type:
+        """Imports the class of a declaration."""
+        if isinstance(target, type):
+            return target
+        if isinstance(target, metadata.EntryPoint):
+            return target.load()
+        module_name, _, class_name = target.partition(':')
+        module = importlib.import_module(module_name, package=__package__)
+        try:
+            return getattr(module, class_name)
+        except AttributeError:
+            raise ImportError(f"Model class '{class_name}' not found in module '{module.__name__}'.") from None
+
+    def find_class(self, class_name: str) -> Type:
+        """
+        Returns a declared model class by its class name, e.g. 'Feliu1993Model', importing only its module.
+
+        Raises:
+            KeyError: If no declared target names the class.
+        """
+        for identifier, target in self.targets.items():
+            name = target.__name__ if isinstance(target, type) else str(getattr(target, 'value', target)).rpartition(':')[2]
+            if name == class_name:
+                return self[identifier]
+        raise KeyError(class_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.targets)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __contains__(self, identifier: object) -> bool:
+        return identifier in self.targets
+
+
+# Mapping from identifiers to their respective corrosion model classes
+corrosion_models = ModelRegistry()
+
+# Directories holding the Kadi4Mat records of the corrosion models
+MODEL_DIRECTORIES = [
+    os.path.normpath(os.path.join(APP_DIR, '../data/kadi4mat_json/immersion_corrosion_models/')),
+    os.path.normpath(os.path.join(APP_DIR, '../data/kadi4mat_json/atmospheric_corrosion_models/')),
+]
+
+# Directories holding the Kadi4Mat records of the measurements
+MEASUREMENT_DIRECTORIES = [
+    os.path.normpath(os.path.join(APP_DIR, '../data/kadi4mat_json/immersion_corrosion_measurements/')),
+]
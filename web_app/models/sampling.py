@@ -0,0 +1,87 @@
+from typing import Callable, Tuple
+
+import numpy as np
+
+SPACINGS = ('linear', 'log')
+
+
+def adaptive_time_grid(evaluate: Callable[[np.ndarray], np.ndarray],
+                       time_range: float,
+                       tolerance: float = 1e-3,
+                       initial_points: int = 17,
+                       max_points: int = 2000,
+                       spacing: str = 'linear') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Samples a curve on [0, time_range] with points placed where the curve bends.
+
+    Starting from a coarse grid, the midpoints of all intervals are evaluated in one vectorized call per pass.
+    An interval is split where its midpoint deviates from the straight line between its ends by more than
+    `tolerance` times the range of the curve, so straight segments keep their few points while kinks and steep
+    starts, such as power laws with exponents below 1, are refined until the polyline is within the tolerance.
+
+    Args:
+        evaluate (Callable[[np.ndarray], np.ndarray]): Maps an array of times in years to the curve values,
+            e.g. `lambda t: model.evaluate_material_loss(t)[0]`.
+        time_range (float): The end of the time range in years.
+        tolerance (float): The allowed deviation of the polyline, relative to the range of the curve. Defaults to 1e-3.
+        initial_points (int): The number of points of the initial grid. Defaults to 17.
+        max_points (int): The maximum number of points; the largest deviations are refined first. Defaults to 2000.
+        spacing (str): 'linear', or 'log' for an initial grid that is log-spaced from 10⁻⁴ · time_range, which
+            suits long horizons. Defaults to 'linear'.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The sorted time points, starting at 0 and ending at time_range, and the
+                                       curve values at these points.
+
+    Raises:
+        ValueError: If the time range is not positive or the spacing is unknown.
+    """
+    if time_range <= 0:
+        raise ValueError(f"The time range must be positive, got {time_range}.")
+    if spacing not in SPACINGS:
+        raise ValueError(f"Unknown spacing '{spacing}', expected one of {SPACINGS}.")
+
+    initial_points = max(initial_points, 2)
+    if spacing == 'log':
+        time = np.concatenate([[0.0], np.geomspace(time_range * 1e-4, time_range, initial_points - 1)])
+    else:
+        time = np.linspace(0.0, time_range, initial_points)
+    values = np.asarray(evaluate(time), dtype=float).reshape(time.shape)
+
+    min_width = time_range * 2.0 ** -40
+    active = np.ones(time.size - 1, dtype=bool)
+    while active.any() and time.size < max_points:
+        finite = values[np.isfinite(values)]
+        scale = np.ptp(finite) if finite.size else 0.0
+        if scale == 0.0:
+            break
+
+        left, right = time[:-1][active], time[1:][active]
+        value_left, value_right = values[:-1][active], values[1:][active]
+        if spacing == 'log':
+            middle = np.where(left > 0, np.sqrt(left * np.maximum(right, 0)), (left + right) / 2)
+        else:
+            middle = (left + right) / 2
+        value_middle = np.asarray(evaluate(middle), dtype=float).reshape(middle.shape)
+
+        # Deviation of the midpoint from the chord; NaN deviations are never refined
+        chord = value_left + (value_right - value_left) * (middle - left) / (right - left)
+        deviation = np.abs(value_middle - chord)
+        refine = (deviation > tolerance * scale) & (right - left > min_width)
+        if not refine.any():
+            break
+
+        budget = max_points - time.size
+        if np.count_nonzero(refine) > budget:
+            largest = np.argsort(np.where(refine, deviation, -np.inf))[::-1][:budget]
+            refine = np.zeros_like(refine)
+            refine[largest] = True
+
+        # Insert the refined midpoints and mark the intervals next to them for the next pass
+        order = np.argsort(np.concatenate([time, middle[refine]]), kind='stable')
+        is_new = np.concatenate([np.zeros(time.size, dtype=bool), np.ones(np.count_nonzero(refine), dtype=bool)])[order]
+        time = np.concatenate([time, middle[refine]])[order]
+        values = np.concatenate([values, value_middle[refine]])[order]
+        active = is_new[:-1] | is_new[1:]
+
+    return time, values
@@ -0,0 +1,192 @@
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .corrosion_model import CorrosionModel
+
+
+class RunningMoments:
+    """Mean and variance per time point, accumulated over blocks of samples with the parallel algorithm of Chan et al."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+
+    def update(self, block: np.ndarray) -> None:
+        """Adds a block of N samples with T values each (an N×T array)."""
+        count = len(block)
+        mean = block.mean(axis=0)
+        m2 = ((block - mean) ** 2).sum(axis=0)
+        if self.mean is None:
+            self.count, self.mean, self._m2 = count, mean, m2
+            return
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self._m2 = self._m2 + m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self) -> np.ndarray:
+        """The population variance per time point."""
+        return self._m2 / self.count
+
+
+class SensitivityAnalysis:
+    """
+    Global sensitivity analysis of the material loss of a corrosion model with respect to its numeric parameters.
+
+    The parameters are varied uniformly between the limits of the model's parameter schema, all other parameters
+    keep the model's current values. Designs are generated and evaluated chunk by chunk through the vectorized
+    batch evaluation and reduced to running sums, so designs of millions of evaluations never have to be held
+    in memory at once.
+
+    Attributes:
+        model (CorrosionModel): The corrosion model to analyse.
+        symbols (List[str]): The parameters to vary. Defaults to all numeric parameters with lower and upper limits
+                             that are active for the current parameters, e.g. T, RH, Pd and Sd of the ISO 9223
+                             dose-response functions once the manual corrosion type is selected.
+        chunk_size (int): The number of base samples or trajectories evaluated at once.
+    """
+
+    def __init__(self,
+                 model: CorrosionModel,
+                 symbols: Optional[Sequence[str]] = None,
+                 chunk_size: int = 10000,
+                 seed: Optional[Union[int, np.random.SeedSequence]] = None):
+        self.model = model
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+
+        schema = model.parameter_schema()
+        if symbols is None:
+            symbols = [parameter.symbol for parameter in schema
+                       if not parameter.is_choice and parameter.lower is not None and parameter.upper is not None
+                       and parameter.is_active(model.parameters)]
+        self.symbols = list(symbols)
+        if not self.symbols:
+            raise ValueError(f"{model.model_name} has no bounded numeric parameters to analyse.")
+
+        bounds = []
+        for symbol in self.symbols:
+            parameter = schema[symbol]
+            if parameter.is_choice or parameter.lower is None or parameter.upper is None:
+                raise ValueError(f"Parameter '{symbol}' needs a lower and an upper limit for the sensitivity analysis.")
+            if not parameter.is_active(model.parameters):
+                raise ValueError(f"Parameter '{symbol}' is not used with the current parameters of {model.model_name}.")
+            bounds.append((parameter.lower, parameter.upper))
+        self.lower, self.upper = np.array(bounds).T
+
+    def _evaluate(self, unit_samples: np.ndarray, time: np.ndarray) -> np.ndarray:
+        """Evaluates samples from the unit hypercube (an N×k array), scaled to the parameter limits."""
+        values = self.lower + unit_samples * (self.upper - self.lower)
+        columns = {symbol: values[:, i] for i, symbol in enumerate(self.symbols)}
+        return self.model.evaluate_material_loss_batch(columns, time)
+
+    def _chunks(self, total: int) -> List[int]:
+        """Returns the sizes of the chunks to split a number of samples into."""
+        return [min(self.chunk_size, total - start) for start in range(0, total, self.chunk_size)]
+
+    def sobol(self, time: np.ndarray, samples: int = 100000) -> pd.DataFrame:
+        """
+        Estimates first-order and total Sobol indices per time point from a Saltelli design.
+
+        The design takes two independent base samples A and B and, per parameter i, the matrix A_B^(i) with the
+        i-th column taken from B, which amounts to samples × (k + 2) evaluations. The first-order indices use
+        the estimator of Saltelli et al. (2010), the total indices that of Jansen (1999).
+
+        Args:
+            time (np.ndarray): Time values in years.
+            samples (int): The number of base samples. Defaults to 100000.
+
+        Returns:
+            pd.DataFrame: One row per time point and parameter with the columns 'time', 'parameter',
+                          'first_order' and 'total'. Indices are NaN where the loss does not vary, e.g. at t=0.
+        """
+        time = np.asarray(time, dtype=float).ravel()
+        k = len(self.symbols)
+        moments = RunningMoments()
+        first_order_sum = np.zeros((k, time.size))
+        total_sum = np.zeros((k, time.size))
+
+        for size in self._chunks(samples):
+            base = self.rng.random((size, 2 * k))
+            a, b = base[:, :k], base[:, k:]
+            # Evaluate A, B and all A_B^(i) in one vectorized call
+            mixed = np.repeat(a[np.newaxis], k, axis=0)
+            mixed[np.arange(k), :, np.arange(k)] = b.T
+            loss = self._evaluate(np.concatenate([a, b, mixed.reshape(-1, k)]), time)
+            loss_a, loss_b, loss_mixed = loss[:size], loss[size:2 * size], loss[2 * size:].reshape(k, size, -1)
+
+            moments.update(loss[:2 * size])
+            first_order_sum += (loss_b * (loss_mixed - loss_a)).sum(axis=1)
+            total_sum += ((loss_a - loss_mixed) ** 2).sum(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = np.where(moments.variance > 0, moments.variance, np.nan)
+            first_order = first_order_sum / samples / variance
+            total = total_sum / (2 * samples) / variance
+
+        return self._to_frame(time, first_order=first_order, total=total)
+
+    def morris(self, time: np.ndarray, trajectories: int = 1000, levels: int = 4) -> pd.DataFrame:
+        """
+        Screens the parameters with the elementary effects method of Morris (1991).
+
+        Each trajectory starts from a random point of the level grid and moves every parameter once, in random
+        order, by Δ = levels / (2 (levels - 1)), which amounts to trajectories × (k + 1) evaluations.
+        The elementary effects are taken relative to the parameter ranges, so they share the unit of the loss.
+
+        Args:
+            time (np.ndarray): Time values in years.
+            trajectories (int): The number of trajectories. Defaults to 1000.
+            levels (int): The even number of levels of the grid. Defaults to 4.
+
+        Returns:
+            pd.DataFrame: One row per time point and parameter with the columns 'time', 'parameter', 'mu',
+                          'mu_star' (the mean absolute elementary effect) and 'sigma'.
+        """
+        if levels < 2 or levels % 2:
+            raise ValueError(f"The number of levels must be even, got {levels}.")
+        time = np.asarray(time, dtype=float).ravel()
+        k = len(self.symbols)
+        delta = levels / (2 * (levels - 1))
+        effect_sum = np.zeros((k, time.size))
+        absolute_sum = np.zeros((k, time.size))
+        square_sum = np.zeros((k, time.size))
+
+        for size in self._chunks(trajectories):
+            # Start points on the lower half of the grid, so every parameter can move up by delta
+            start = self.rng.integers(0, levels // 2, (size, k)) / (levels - 1)
+            position = np.argsort(self.rng.random((size, k)), axis=1)
+            steps = np.arange(k + 1)[:, np.newaxis, np.newaxis]
+            points = start + delta * (position < steps)
+
+            loss = self._evaluate(points.reshape(-1, k), time).reshape(k + 1, size, -1)
+            # The effect of parameter i is the change between the steps before and after it moves
+            trajectory = np.arange(size)[:, np.newaxis]
+            effects = (loss[position + 1, trajectory] - loss[position, trajectory]) / delta
+            effects = np.transpose(effects, (1, 0, 2))
+
+            effect_sum += effects.sum(axis=1)
+            absolute_sum += np.abs(effects).sum(axis=1)
+            square_sum += (effects ** 2).sum(axis=1)
+
+        mu = effect_sum / trajectories
+        variance = (square_sum - trajectories * mu ** 2) / max(trajectories - 1, 1)
+        return self._to_frame(time, mu=mu, mu_star=absolute_sum / trajectories,
+                              sigma=np.sqrt(np.maximum(variance, 0.0)))
+
+    def _to_frame(self, time: np.ndarray, **indices: np.ndarray) -> pd.DataFrame:
+        """Arranges k×T arrays of indices in a long table with one row per time point and parameter."""
+        k = len(self.symbols)
+        frame = pd.DataFrame({
+            'time': np.tile(time, k),
+            'parameter': np.repeat(self.symbols, time.size),
+        })
+        for name, values in indices.items():
+            frame[name] = values.ravel()
+        return frame.sort_values(['time', 'parameter'], kind='stable', ignore_index=True)
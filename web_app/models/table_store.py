@@ -0,0 +1,106 @@
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Relative table paths such as '../data/tables/...' are relative to the web_app directory
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TableStore:
+    """
+    A process-wide, read-only store for the reference tables in data/tables.
+
+    Each table is parsed once and then served to every model instance and every session.
+    Entries are keyed by the absolute file path and the reader options, and are re-parsed
+    only when the modification time of the file changes.
+
+    The returned objects are shared between all callers and must be treated as read-only.
+    Arrays handed out by `read_array` are flagged as non-writeable to enforce this.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[int, Any]] = {}
+
+    @staticmethod
+    def _resolve(path: str) -> str:
+        """Returns the normalised absolute path of a table file, independent of the working directory."""
+        return os.path.normpath(os.path.join(APP_DIR, path))
+
+    def _get(self, key: Tuple[Hashable, ...], path: str, loader) -> Any:
+        """Returns the cached value for the key, calling the loader if the file changed since it was cached."""
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (mtime, value)
+        return value
+
+    def read_table(self, path: str, header: Optional[str] = 'infer') -> pd.DataFrame:
+        """
+        Returns the table stored in a CSV file as a shared DataFrame.
+
+        Args:
+            path (str): Path to the CSV file.
+            header (Optional[str]): Passed on to `pd.read_csv`. Defaults to 'infer'.
+
+        Returns:
+            pd.DataFrame: The parsed table. The frame is shared and must not be modified.
+        """
+        path = self._resolve(path)
+        key = ('table', path, header)
+        return self._get(key, path, lambda: pd.read_csv(path, header=header))
+
+    def read_array(self, path: str, rows: slice = slice(None), columns: slice = slice(None),
+                   header: Optional[str] = 'infer', dtype: Any = float) -> np.ndarray:
+        """
+        Returns a numeric block of a CSV table as a read-only NumPy array.
+
+        Args:
+            path (str): Path to the CSV file.
+            rows (slice): Positional row slice of the block. Defaults to all rows.
+            columns (slice): Positional column slice of the block. Defaults to all columns.
+            header (Optional[str]): Passed on to `pd.read_csv`. Defaults to 'infer'.
+            dtype (Any): The dtype of the returned array. Defaults to float.
+
+        Returns:
+            np.ndarray: A contiguous, non-writeable array holding the block.
+        """
+        path = self._resolve(path)
+        key = ('array', path, header, rows.start, rows.stop, rows.step,
+               columns.start, columns.stop, columns.step, np.dtype(dtype).str)
+
+        def load() -> np.ndarray:
+            table = self.read_table(path, header=header)
+            array = np.ascontiguousarray(table.iloc[rows, columns].to_numpy(dtype=dtype))
+            array.setflags(write=False)
+            return array
+
+        return self._get(key, path, load)
+
+    def clear(self) -> None:
+        """Drops all cached tables."""
+        with self._lock:
+            self._entries.clear()
+
+
+# The table store shared by all models of this process
+table_store = TableStore()
+
+
+def read_table(path: str, header: Optional[str] = 'infer') -> pd.DataFrame:
+    """Returns a shared, read-only DataFrame of a CSV table from the process-wide table store."""
+    return table_store.read_table(path, header=header)
+
+
+def read_array(path: str, rows: slice = slice(None), columns: slice = slice(None),
+               header: Optional[str] = 'infer', dtype: Any = float) -> np.ndarray:
+    """Returns a read-only NumPy array of a numeric CSV block from the process-wide table store."""
+    return table_store.read_array(path, rows=rows, columns=columns, header=header, dtype=dtype)
@@ -0,0 +1,154 @@
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .corrosion_model import CorrosionModel
+from .distributions import Distribution
+
+
+class StreamingQuantiles:
+    """
+    A mergeable quantile sketch for streams of curves.
+
+    Each block of samples is summarised by its order statistics at a fixed grid of levels per time point.
+    Once the number of summaries exceeds a limit they are merged into a single weighted summary, so the memory
+    use is bounded by the grid size and the number of time points, independent of the number of samples.
+    The rank error of the estimated quantiles is of the order of the grid spacing.
+    """
+
+    def __init__(self, grid_size: int = 1001, max_summaries: int = 8):
+        self.levels = np.linspace(0.0, 1.0, grid_size)
+        self.max_summaries = max_summaries
+        self.count = 0
+        self._total: Optional[np.ndarray] = None
+        self._summaries: List[np.ndarray] = []
+        self._weights: List[float] = []
+
+    def update(self, block: np.ndarray) -> None:
+        """Adds a block of N samples with T values each (an N×T array) to the sketch."""
+        # Sort the samples of each time point in a contiguous T×N copy, which is much faster than sorting columns
+        count = len(block)
+        block = np.ascontiguousarray(np.transpose(block))
+        block.sort(axis=1)
+        indices = np.round(self.levels * (count - 1)).astype(int)
+        self._summaries.append(np.transpose(block[:, indices]))
+        self._weights.append(float(count))
+
+        total = block.sum(axis=1)
+        self._total = total if self._total is None else self._total + total
+        self.count += count
+
+        if len(self._summaries) > self.max_summaries:
+            self._compress()
+
+    def _compress(self) -> None:
+        """Merges all summaries into one summary on the grid of levels."""
+        if len(self._summaries) <= 1:
+            return
+
+        values = np.concatenate(self._summaries, axis=0)
+        weights = np.concatenate([np.full(len(summary), weight / len(summary))
+                                  for summary, weight in zip(self._summaries, self._weights)])
+
+        # Sort the points of each time point and compute their cumulative weight
+        order = np.argsort(values, axis=0)
+        values = np.take_along_axis(values, order, axis=0)
+        cumulative = np.cumsum(weights[order], axis=0) / weights.sum()
+
+        # Look up the grid levels in all columns at once by offsetting each column by its index
+        columns = values.shape[1]
+        offsets = np.arange(columns)
+        positions = np.searchsorted((cumulative + offsets).ravel(order='F'),
+                                    (self.levels[:, None] + offsets).ravel(order='F'))
+        positions = np.minimum(positions.reshape(columns, -1).T - offsets * len(values), len(values) - 1)
+        merged = np.take_along_axis(values, np.clip(positions, 0, len(values) - 1), axis=0)
+
+        self._summaries = [merged]
+        self._weights = [float(sum(self._weights))]
+
+    @property
+    def mean(self) -> np.ndarray:
+        """The mean of all samples per time point."""
+        if not self.count:
+            raise ValueError("No samples have been added.")
+        return self._total / self.count
+
+    def quantiles(self, levels: Sequence[float]) -> np.ndarray:
+        """
+        Returns estimates of the quantiles of all samples per time point.
+
+        Args:
+            levels (Sequence[float]): Quantile levels between 0 and 1.
+
+        Returns:
+            np.ndarray: An array of shape (len(levels), T).
+        """
+        if not self.count:
+            raise ValueError("No samples have been added.")
+        self._compress()
+        summary = self._summaries[0]
+
+        positions = np.asarray(levels, dtype=float) * (len(self.levels) - 1)
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, len(self.levels) - 1)
+        fraction = (positions - lower)[:, None]
+        return summary[lower] * (1 - fraction) + summary[upper] * fraction
+
+
+class MonteCarloSimulation:
+    """
+    Propagates the uncertainty of model parameters to the material loss curves of a corrosion model.
+
+    Parameters are drawn from their distributions in large blocks, each block is evaluated with the vectorized
+    batch evaluation of the model and summarised in a streaming quantile sketch, so the memory use stays bounded
+    for any number of samples. Parameters without a distribution keep the model's current values.
+
+    Attributes:
+        model (CorrosionModel): The corrosion model to evaluate.
+        distributions (Dict[str, Distribution]): The distributions of the uncertain parameters, keyed by symbol.
+            Defaults to the model's `parameter_uncertainty()`; models without documented uncertainties, see
+            `CorrosionModel.has_uncertainty`, need them given explicitly.
+        block_size (int): The number of samples evaluated at once.
+    """
+
+    def __init__(self,
+                 model: CorrosionModel,
+                 distributions: Optional[Dict[str, Distribution]] = None,
+                 block_size: int = 50000,
+                 seed: Optional[Union[int, np.random.SeedSequence]] = None):
+        self.model = model
+        self.distributions = model.parameter_uncertainty() if distributions is None else distributions
+        if not self.distributions:
+            # Without uncertain inputs all samples coincide and the bands would collapse to a single curve
+            raise ValueError(f"{model.model_name} has no documented parameter uncertainties; "
+                             f"pass the distributions of its uncertain inputs explicitly.")
+        self.block_size = block_size
+        self.rng = np.random.default_rng(seed)
+
+    def run(self, time: np.ndarray, samples: int = 1000000,
+            percentiles: Sequence[float] = (5, 50, 95)) -> pd.DataFrame:
+        """
+        Draws the samples and returns percentile bands of the material loss.
+
+        Args:
+            time (np.ndarray): Time values in years.
+            samples (int): The number of parameter samples. Defaults to one million.
+            percentiles (Sequence[float]): The percentiles of the bands. Defaults to (5, 50, 95).
+
+        Returns:
+            pd.DataFrame: A frame indexed by time with the column 'mean' and one column per percentile, e.g. 'P5'.
+        """
+        time = np.asarray(time, dtype=float).ravel()
+        sketch = StreamingQuantiles()
+
+        for start in range(0, samples, self.block_size):
+            size = min(self.block_size, samples - start)
+            columns = {symbol: distribution.sample(self.rng, size)
+                       for symbol, distribution in self.distributions.items()}
+            sketch.update(self.model.evaluate_material_loss_batch(columns, time))
+
+        bands = pd.DataFrame({'mean': sketch.mean}, index=pd.Index(time, name='time'))
+        for percentile, values in zip(percentiles, sketch.quantiles(np.asarray(percentiles) / 100)):
+            bands[f"P{percentile:g}"] = values
+        return bands
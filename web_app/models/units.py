@@ -0,0 +1,162 @@
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# Density of carbon steel in g/cm³
+STEEL_DENSITY = 7.85
+
+HOURS_PER_YEAR = 24 * 365
+
+# Linear factors to the base unit of each dimension: years for time, μm for thickness and mg for mass
+TIME_UNITS: Dict[str, float] = {
+    'h': 1 / HOURS_PER_YEAR,
+    'hours': 1 / HOURS_PER_YEAR,
+    'd': 1 / 365,
+    'days': 1 / 365,
+    'a': 1.0,
+    'years': 1.0,
+}
+THICKNESS_UNITS: Dict[str, float] = {
+    'nm': 1e-3,
+    'μm': 1.0,
+    'um': 1.0,
+    'mm': 1e3,
+}
+MASS_UNITS: Dict[str, float] = {
+    'μg': 1e-3,
+    'mg': 1.0,
+    'g': 1e3,
+}
+UNIT_SYSTEMS: Dict[str, Dict[str, float]] = {'years': TIME_UNITS, 'μm': THICKNESS_UNITS, 'mg': MASS_UNITS}
+
+# The axis label used for each base unit
+AXIS_LABELS = {
+    'years': 'Time [years]',
+    'μm': 'Mass loss [μm]',
+    'mg': 'Mass loss [mg]',
+}
+
+
+def normalize_unit(unit: str) -> str:
+    """Returns a unit string without surrounding whitespace and a 'Units:' prefix, as found in measurement files."""
+    unit = unit.strip()
+    if unit.lower().startswith('units:'):
+        unit = unit[len('units:'):].strip()
+    return unit
+
+
+def base_unit(unit: str) -> str:
+    """
+    Returns the base unit of the dimension of a unit, e.g. 'years' for 'h'.
+
+    Raises:
+        ValueError: If the unit is not known.
+    """
+    unit = normalize_unit(unit)
+    for base, units in UNIT_SYSTEMS.items():
+        if unit in units:
+            return base
+    raise ValueError(f"Unknown unit '{unit}'.")
+
+
+def convert(values: ArrayLike, from_unit: str, to_unit: Optional[str] = None) -> np.ndarray:
+    """
+    Converts values between two units of the same dimension.
+
+    Args:
+        values (ArrayLike): The values to convert.
+        from_unit (str): The unit of the values, e.g. 'h'.
+        to_unit (Optional[str]): The target unit. Defaults to the base unit of the dimension.
+
+    Returns:
+        np.ndarray: A new float array with the converted values.
+
+    Raises:
+        ValueError: If a unit is unknown or the units measure different dimensions.
+    """
+    from_unit = normalize_unit(from_unit)
+    to_unit = base_unit(from_unit) if to_unit is None else normalize_unit(to_unit)
+    for units in UNIT_SYSTEMS.values():
+        if from_unit in units:
+            if to_unit not in units:
+                raise ValueError(f"Cannot convert from '{from_unit}' to '{to_unit}'.")
+            return np.asarray(values, dtype=float) * (units[from_unit] / units[to_unit])
+    raise ValueError(f"Unknown unit '{from_unit}'.")
+
+
+def hours_to_years(values: ArrayLike) -> np.ndarray:
+    """Converts times from hours to years."""
+    return np.asarray(values, dtype=float) / HOURS_PER_YEAR
+
+
+def years_to_hours(values: ArrayLike) -> np.ndarray:
+    """Converts times from years to hours."""
+    return np.asarray(values, dtype=float) * HOURS_PER_YEAR
+
+
+def grams_per_m2_to_um(values: ArrayLike, density: float = STEEL_DENSITY) -> np.ndarray:
+    """Converts a mass loss per area in g/m² to a thickness loss in μm, for steel unless a density in g/cm³ is given."""
+    return np.asarray(values, dtype=float) / density
+
+
+def um_to_grams_per_m2(values: ArrayLike, density: float = STEEL_DENSITY) -> np.ndarray:
+    """Converts a thickness loss in μm to a mass loss per area in g/m², for steel unless a density in g/cm³ is given."""
+    return np.asarray(values, dtype=float) * density
+
+
+def mg_to_um(values: ArrayLike, area: float, density: float = STEEL_DENSITY) -> np.ndarray:
+    """
+    Converts the mass loss of a specimen in mg to a uniform thickness loss in μm.
+
+    Args:
+        values (ArrayLike): The mass loss in mg.
+        area (float): The exposed area of the specimen in cm².
+        density (float): The density of the material in g/cm³. Defaults to steel.
+    """
+    # 1 mg/cm² equals 10 g/m²
+    return grams_per_m2_to_um(np.asarray(values, dtype=float) * (10 / area), density)
+
+
+def um_to_mg(values: ArrayLike, area: float, density: float = STEEL_DENSITY) -> np.ndarray:
+    """
+    Converts a uniform thickness loss in μm to the mass loss of a specimen in mg.
+
+    Args:
+        values (ArrayLike): The thickness loss in μm.
+        area (float): The exposed area of the specimen in cm².
+        density (float): The density of the material in g/cm³. Defaults to steel.
+    """
+    return um_to_grams_per_m2(values, density) * (area / 10)
+
+
+class PiecewiseLinearConversion:
+    """
+    A conversion given by a table of corresponding values, interpolated linearly and extrapolated linearly
+    beyond both ends of the table.
+
+    The table is sorted and stored once as read-only arrays, so a conversion costs a single `np.interp`
+    over the whole input array.
+    """
+
+    def __init__(self, x: Sequence[float], y: Sequence[float]):
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        if x.shape != y.shape or x.size < 2:
+            raise ValueError("A piecewise linear conversion needs at least two pairs of values.")
+        order = np.argsort(x)
+        self.x, self.y = x[order], y[order]
+        self.x.setflags(write=False)
+        self.y.setflags(write=False)
+        self._lower_slope = (self.y[1] - self.y[0]) / (self.x[1] - self.x[0])
+        self._upper_slope = (self.y[-1] - self.y[-2]) / (self.x[-1] - self.x[-2])
+
+    def __call__(self, values: ArrayLike) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        converted = np.interp(values, self.x, self.y)
+        converted = np.where(values < self.x[0], self.y[0] + (values - self.x[0]) * self._lower_slope, converted)
+        return np.where(values > self.x[-1], self.y[-1] + (values - self.x[-1]) * self._upper_slope, converted)
+
+    def inverse(self) -> 'PiecewiseLinearConversion':
+        """Returns the inverse conversion; the table must be monotonic."""
+        return PiecewiseLinearConversion(self.y, self.x)
@@ -1,10 +1,10 @@
 import os
 import streamlit as st
-import py7zr
-from io import BytesIO
+from download_archives import ARCHIVE_FORMATS, ArchiveFormat, archive_name_for, archive_url, get_archive_store
 from header import add_header
 from footer import add_footer
 from helper import display_logo
+from measurements import BLOB_DIR
 
 # Function to truncate long file names
 def truncate_filename(file_name: str, max_length: int = 16) -> str:
@@ -14,50 +14,65 @@ def truncate_filename(file_name: str, max_length: int = 16) -> str:
     return file_name
 
 
-# Function to compress all files in a directory into a 7-Zip archive (with README.md)
-def download_all_files_as_zip(directory_path: str) -> BytesIO:
-    """Compresses all files in a directory into a 7-Zip archive and returns a BytesIO object."""
-    zip_buffer = BytesIO()  # Buffer for the zip file in memory
+# Function to get the archive of all files in a directory (with README.md)
+def download_all_files_as_zip(directory_path: str, archive_format: str = '7z') -> str:
+    """Returns the path of the prebuilt archive of all files in a directory, rebuilt only when a file changed."""
     readme_path = os.path.join("..", 'README.md')
+    members = [(file_path, os.path.relpath(file_path, directory_path))
+               for file_path in list_files_in_directory(directory_path)]
 
-    # Create a 7-Zip archive in the buffer
-    with py7zr.SevenZipFile(zip_buffer, 'w') as archive:
-        # Add all files in the directory to the archive
-        for root, _, files in os.walk(directory_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                archive.write(file_path, os.path.relpath(file_path, directory_path))
+    # Include README.md in the archive if it exists
+    if os.path.exists(readme_path):
+        members.append((readme_path, 'README.md'))
+    return get_archive_store().get_archive('all_files', members, archive_format)
 
-        # Include README.md in the archive if it exists
-        if os.path.exists(readme_path):
-            archive.write(readme_path, 'README.md')
 
-    zip_buffer.seek(0)  # Set the buffer's position to the start
-    return zip_buffer
+# Function to get the archive of a single file (with README.md)
+def compress_single_file_as_zip(file_path: str, directory_path: str, readme_path: str, archive_format: str = '7z') -> str:
+    """Returns the path of the prebuilt archive of a single file (and README.md)."""
+    members = [(file_path, os.path.basename(file_path))]
 
+    # Include README.md in the archive if it exists
+    if os.path.exists(readme_path):
+        members.append((readme_path, 'README.md'))
+    return get_archive_store().get_archive(archive_name_for(file_path, directory_path), members, archive_format)
 
-# Function to compress a single file (with README.md) into a 7-Zip archive
-def compress_single_file_as_zip(file_path: str, readme_path: str) -> BytesIO:
-    """Compresses a single file (and README.md) into a 7-Zip archive."""
-    zip_buffer = BytesIO()
 
-    # Create a 7-Zip archive in the buffer
-    with py7zr.SevenZipFile(zip_buffer, 'w') as archive:
-        archive.write(file_path, os.path.basename(file_path))
+def read_archive(archive_path: str) -> bytes:
+    """Reads a prebuilt archive for a download button."""
+    with open(archive_path, 'rb') as archive:
+        return archive.read()
 
-        # Include README.md in the archive if it exists
-        if os.path.exists(readme_path):
-            archive.write(readme_path, 'README.md')
 
-    zip_buffer.seek(0)
-    return zip_buffer
+def offer_archive(key: str, label: str, file_name: str, build_archive, archive_type: ArchiveFormat) -> None:
+    """
+    Shows a button that builds an archive only when it is clicked, followed by a link to download it.
+
+    The archive is served from disk as a static file of the app, so it is never read into memory. Only archives
+    too large for Streamlit's static file serving are read, for a download button.
+    """
+    key = f"{key}{archive_type.extension}"
+    if st.button(f"Prepare {label}", key=f"prepare_{key}"):
+        st.session_state.prepared_download = key
+    if st.session_state.get('prepared_download') != key:
+        return
+
+    archive_path = build_archive()
+    url = archive_url(archive_path)
+    if url is not None:
+        st.markdown(f'<a href="{url}" download="{file_name}">Download {label}</a>', unsafe_allow_html=True)
+    else:
+        st.download_button(label=f"Download {label}", data=read_archive(archive_path), file_name=file_name,
+                           mime=archive_type.mime, key=f"download_{key}")
 
 
 # Function to list all files in a directory for individual download
 def list_files_in_directory(directory_path: str):
-    """Returns a list of all files in the given directory."""
+    """Returns a list of all files in the given directory, except the blob store, which duplicates data/tables."""
     file_list = []
-    for root, _, files in os.walk(directory_path):
+    for root, directories, files in os.walk(directory_path):
+        directories[:] = [name for name in directories
+                          if os.path.abspath(os.path.join(root, name)) != os.path.abspath(BLOB_DIR)]
         for file in files:
             file_path = os.path.join(root, file)
             file_list.append(file_path)
@@ -87,51 +102,33 @@ with col2:
 directory_path = "../data/"
 readme_path = os.path.join("..", 'README.md')
 
-st.markdown("## Download All Files")
-zip_buffer = download_all_files_as_zip(directory_path)
-st.download_button(
-    label="Download all files as 7-Zip",
-    data=zip_buffer,
-    file_name="all_files.7z",
-    mime="application/x-7z-compressed"
+archive_format = st.selectbox(
+    "Archive format",
+    options=list(ARCHIVE_FORMATS),
+    format_func=lambda name: ARCHIVE_FORMATS[name].label,
+    help="7-Zip gives the smallest files; ZIP and tar are faster to build and to extract.",
 )
+archive_type = ARCHIVE_FORMATS[archive_format]
+
+st.markdown("## Download All Files")
+offer_archive('all_files', f"all files as {archive_type.label}", f"all_files{archive_type.extension}",
+              lambda: download_all_files_as_zip(directory_path, archive_format), archive_type)
 
 st.markdown("## Download Individual Files")
 file_list = list_files_in_directory(directory_path)
 
-col1, col2, col3 = st.columns(3)
+columns = st.columns(3)
 
 for i, file_path in enumerate(file_list):
-    with open(file_path, 'rb') as file:
-        file_name = os.path.basename(file_path)
-        truncated_file_name = truncate_filename(file_name)
-        zip_buffer = compress_single_file_as_zip(file_path, readme_path)
-
-        # Display in columns
-        if i % 3 == 0:
-            with col1:
-                st.download_button(
-                    label=f"Download {truncated_file_name} as 7-Zip",
-                    data=zip_buffer,
-                    file_name=f"{file_name}.7z",
-                    mime="application/x-7z-compressed"
-                )
-        elif i % 3 == 1:
-            with col2:
-                st.download_button(
-                    label=f"Download {truncated_file_name} as 7-Zip",
-                    data=zip_buffer,
-                    file_name=f"{file_name}.7z",
-                    mime="application/x-7z-compressed"
-                )
-        else:
-            with col3:
-                st.download_button(
-                    label=f"Download {truncated_file_name} as 7-Zip",
-                    data=zip_buffer,
-                    file_name=f"{file_name}.7z",
-                    mime="application/x-7z-compressed"
-                )
+    file_name = os.path.basename(file_path)
+    truncated_file_name = truncate_filename(file_name)
+
+    # Display in columns
+    with columns[i % 3]:
+        offer_archive(file_path, f"{truncated_file_name} as {archive_type.label}", f"{file_name}{archive_type.extension}",
+                      lambda file_path=file_path: compress_single_file_as_zip(file_path, directory_path, readme_path,
+                                                                              archive_format),
+                      archive_type)
 
 # Footer
 add_footer()
@@ -0,0 +1,49 @@
+import streamlit as st
+from typing import Any, Dict
+from models import CorrosionModel, Parameter
+
+
+def display_parameter_input(parameter: Parameter, key: str) -> Any:
+    """Displays the input widget of a single parameter and returns the entered value."""
+    if parameter.is_choice:
+        label = parameter.label or f"Select {parameter.description}:"
+        return st.selectbox(label, parameter.choices, format_func=parameter.format_choice, key=key)
+
+    unit = f" [{parameter.unit}]" if parameter.unit else ""
+    label = parameter.label or f"Enter {parameter.description} ({parameter.symbol}){unit}:"
+    return st.number_input(
+        label,
+        min_value=parameter.lower,
+        max_value=parameter.upper,
+        value=parameter.default,
+        step=parameter.step,
+        key=key
+    )
+
+
+def display_parameters(model: CorrosionModel) -> None:
+    """
+    Displays the parameter selection interface of a model and stores the selected values on the model.
+
+    The widgets are built from the model's parameter schema; parameters whose conditions are not met
+    by the values selected before them are not shown.
+
+    Args:
+        model (CorrosionModel): The model whose parameters are selected.
+    """
+    reference_tables = model.reference_tables()
+    if reference_tables:
+        with st.expander("Reference Tables"):
+            for caption, table in reference_tables.items():
+                st.write(f"### {caption}")
+                st.table(table)
+
+    values: Dict[str, Any] = {}
+    for parameter in model.parameter_schema():
+        if parameter.is_active(values):
+            values[parameter.symbol] = display_parameter_input(parameter, key=f"{model.kadi_identifier}_{parameter.symbol}")
+    model.set_parameters(values)
+
+    notes = model.parameter_notes()
+    if notes:
+        st.markdown(notes)
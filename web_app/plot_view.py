@@ -2,18 +2,27 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 import streamlit.components.v1 as components
-from typing import List, Optional, Dict
-from models import CorrosionModel
+from typing import Any, List, Optional, Dict, Tuple
+from models import CorrosionModel, adaptive_time_grid
 from measurements import *
+from figure_cache import CachedFigure, figure_cache, plot_fingerprint
 
-def generate_plot(
+# Traces with more points are rendered with WebGL
+WEBGL_THRESHOLD = 5000
+# The assumed pixel width of plots without a fixed width, which bounds the points drawn per measurement series
+DEFAULT_PLOT_WIDTH = 1200
+
+def build_plot(
     models: List[CorrosionModel],
     current_model: Optional[CorrosionModel],
     time_range: float,
     measurements: Optional[List[Measurement]] = None,  # Expecting a list of Measurement instances
     resolution: Optional[int] = 400,
     height: Optional[int] = 700,
-    width: Optional[int] = None
+    width: Optional[int] = None,
+    tolerance: Optional[float] = 1e-3,
+    log_time: bool = False,
+    zoom: Optional[Tuple[float, float]] = None
 ):
     """
     Generates and returns a Plotly figure with subplots for different y-axis labels (units) for mass loss over time.
@@ -24,19 +33,32 @@ def generate_plot(
         current_model (Optional[CorrosionModel]): The currently selected model to plot.
         time_range (float): The time range (years) for which to evaluate material loss.
         measurements (Optional[List[Measurement]]): Optional list of Measurement instances to be plotted.
-        resolution (Optional[int]): The number of points used to plot the curve. Higher values give smoother plots. Defaults to 400.
+        resolution (Optional[int]): The number of points used to plot the curve if `tolerance` is None. Defaults to 400.
         height (Optional[int]): Custom height of the plot. Defaults to 700.
         width (Optional[int]): Custom width of the plot. Defaults to None (auto).
+        tolerance (Optional[float]): The allowed deviation of the plotted curves relative to their range. The curves are
+            sampled adaptively, with points only where they bend. None samples `resolution` equally spaced points.
+            Defaults to 1e-3.
+        log_time (bool): Start the adaptive sampling from a log-spaced grid, which suits long horizons. Defaults to False.
+        zoom (Optional[Tuple[float, float]]): The visible time range in years. Measurements are downsampled within
+            this range only, so zooming in shows their detail. Defaults to None (the whole plot).
 
     Returns:
         plotly.graph_objects.Figure: The generated plot with multiple subplots when axis labels differ.
     """
-    t = np.linspace(0, time_range, resolution)
+    def evaluate_curve(model: CorrosionModel):
+        """Samples the material loss curve of a model, adaptively unless a tolerance of None is given."""
+        if tolerance is None:
+            t = np.linspace(0, time_range, resolution)
+            return (t, *model.evaluate_material_loss(t))
+        t, loss = adaptive_time_grid(lambda time: model.evaluate_material_loss(time)[0], time_range, tolerance,
+                                     spacing='log' if log_time else 'linear')
+        return t, loss, model.TIME_AXIS_LABEL, model.LOSS_AXIS_LABEL
 
     # Dictionary to store the data based on unique axis labels
     axis_mapping: Dict[str, Dict[str, list]] = {}
 
-    def add_to_axis_mapping(x_data, y_data, x_label, y_label, label, plot_type='lines'):
+    def add_to_axis_mapping(x_data, y_data, x_label, y_label, label, plot_type='lines', **trace_options):
         """Helper function to store traces (lines or markers) in axis mapping based on axis labels."""
         key = f"{x_label}_{y_label}"
         if key not in axis_mapping:
@@ -46,46 +68,36 @@ def generate_plot(
                 "traces": []
             }
         mode = 'lines' if plot_type == 'lines' else 'markers'
-        axis_mapping[key]["traces"].append(go.Scatter(x=x_data, y=y_data, mode=mode, name=label))
+        # Render large traces with WebGL, which stays responsive for hundreds of thousands of points
+        trace_type = go.Scattergl if len(x_data) > WEBGL_THRESHOLD else go.Scatter
+        axis_mapping[key]["traces"].append(trace_type(x=x_data, y=y_data, mode=mode, name=label, **trace_options))
 
     # Plot the current model's data if available
     if current_model:
-        current_model_loss, x_axis_label, y_axis_label = current_model.evaluate_material_loss(t)
+        t, current_model_loss, x_axis_label, y_axis_label = evaluate_curve(current_model)
         add_to_axis_mapping(t, current_model_loss, x_axis_label, y_axis_label, f"{current_model.model_name} (live)")
 
     # Add additional models to the axis mapping
     for i, model in enumerate(models, start=1):
-        model_loss, model_x_axis_label, model_y_axis_label = model.evaluate_material_loss(t)
+        t, model_loss, model_x_axis_label, model_y_axis_label = evaluate_curve(model)
         add_to_axis_mapping(t, model_loss, model_x_axis_label, model_y_axis_label, f"{model.model_name} ({i})")
 
-    # Process each Measurement instance
+    # Process each Measurement instance; its series are converted once and passed to Plotly without copying.
+    # Series with more points than the plot has pixels are drawn downsampled within the visible time range,
+    # so the plot is rebuilt with the zoomed range to show more detail.
+    max_points = width or DEFAULT_PLOT_WIDTH
     if measurements:
         for measurement in measurements:
-            measurement_data = measurement.get_measurement_data_for_plot()
-            if measurement_data:
-                for data in measurement_data:
-                    # Adjust the measurement name by splitting on '_', taking the last part, and appending '(Exp.)'
-                    measurement_name = data['name'].split('_')[-2] + data['name'].split('_')[-1] + " (Exp.)"
-
-                    # Retrieve the axis labels
-                    measurement_x_axis_label = data.get('x_axis_label', 'Time [hours]')
-                    measurement_y_axis_label = data.get('y_axis_label', 'Mass loss [mg]')
-                    measurement_data_matrix = data['data']
-
-                    # Convert time from hours to years if needed
-                    if measurement_x_axis_label == 'Time [hours]':
-                        measurement_data_matrix[:, 0] = measurement_data_matrix[:, 0] / 8760  # Convert hours to years
-                        measurement_x_axis_label = 'Time [years]'  # Update the x-axis label
-
-                    # Add the measurement to the axis mapping
-                    add_to_axis_mapping(
-                        measurement_data_matrix[:, 0],  # X values (time, now in years if converted)
-                        measurement_data_matrix[:, 1],  # Y values (mass loss)
-                        measurement_x_axis_label,
-                        measurement_y_axis_label,
-                        measurement_name,
-                        plot_type='markers'
-                    )
+            for series in measurement.series:
+                time_values, loss_values = series.downsample(max_points, zoom)
+                add_to_axis_mapping(
+                    time_values,  # X values (time in years)
+                    loss_values,  # Y values (mass loss)
+                    series.x_axis_label,
+                    series.y_axis_label,
+                    series.display_name,
+                    plot_type='markers'
+                )
 
     # Create subplots based on the number of unique axis pairs
     num_subplots = len(axis_mapping)
@@ -105,6 +117,8 @@ def generate_plot(
 
     # Set the common x-axis title
     fig.update_xaxes(title_text=x_axis_label, row=1, col=1)
+    if zoom is not None:
+        fig.update_xaxes(range=list(zoom))
 
     # Update the layout for the entire figure
     fig.update_layout(
@@ -124,6 +138,38 @@ def generate_plot(
     return fig
 
 
+def cached_plot(
+    models: List[CorrosionModel],
+    current_model: Optional[CorrosionModel],
+    time_range: float,
+    measurements: Optional[List[Measurement]] = None,
+    resolution: Optional[int] = 400,
+    height: Optional[int] = 700,
+    width: Optional[int] = None,
+    tolerance: Optional[float] = 1e-3,
+    log_time: bool = False,
+    zoom: Optional[Tuple[float, float]] = None
+) -> CachedFigure:
+    """
+    Returns the entry of the process-wide figure cache holding the figure of `build_plot` for the given inputs.
+
+    The cache is keyed by a fingerprint of the models with their parameters, the measurements, the time range
+    and the plot options, so repeated requests within a rerun and across sessions are built only once.
+    The figure of the entry is shared and must not be modified.
+    """
+    options = dict(time_range=time_range, resolution=resolution, height=height, width=width,
+                   tolerance=tolerance, log_time=log_time, zoom=zoom)
+    fingerprint = plot_fingerprint(models, current_model, measurements, **options)
+    return figure_cache.get_or_create(
+        fingerprint, lambda: build_plot(models, current_model, measurements=measurements, **options)
+    )
+
+
+def generate_plot(*args: Any, **kwargs: Any) -> go.Figure:
+    """Returns the cached figure of `build_plot` for the given inputs; see `cached_plot` for the arguments."""
+    return cached_plot(*args, **kwargs).figure
+
+
 
 def display_plot_html(fig):
     """
@@ -132,7 +178,8 @@ def display_plot_html(fig):
     Args:
         fig (plotly.graph_objects.Figure): The figure to be displayed.
     """
-    plot_html = fig.to_html(full_html=False, include_plotlyjs='cdn')
+    cached = figure_cache.find(fig)
+    plot_html = cached.html if cached else fig.to_html(full_html=False, include_plotlyjs='cdn')
     components.html(
         f"""
         <div style="background-color: white; padding: 10px; border-radius: 10px;">